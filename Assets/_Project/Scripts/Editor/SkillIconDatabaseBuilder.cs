@@ -62,6 +62,7 @@ public static class SkillIconDatabaseBuilder
         }
 
         database.allIcons = entries.ToArray();
+        database.tagIndex = SkillIconDatabase.BuildTagIndex(database.allIcons);
         EditorUtility.SetDirty(database);
         AssetDatabase.SaveAssets();
 
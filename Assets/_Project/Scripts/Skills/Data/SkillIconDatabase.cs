@@ -9,10 +9,28 @@ using UnityEngine;
 [CreateAssetMenu(fileName = "SkillIconDatabase", menuName = "Skills/Skill Icon Database")]
 public class SkillIconDatabase : ScriptableObject
 {
+    /// <summary>
+    /// One search term and the indices (into allIcons) of the entries whose
+    /// ID, display name or tags contain it as a word.
+    /// </summary>
+    [System.Serializable]
+    public class TermEntry
+    {
+        public string term;
+        public int[] icons;
+    }
+
+    // Must match TERM_SEPARATORS in ci/convert_svg_icons.py
+    private static readonly char[] TermSeparators = { ' ', '/', '-' };
+
     [Tooltip("All available skill icon entries")]
     public SkillIconEntry[] allIcons;
 
+    [Tooltip("Search terms sorted ordinally, generated alongside allIcons")]
+    public TermEntry[] tagIndex;
+
     private Dictionary<string, SkillIconEntry> idLookup;
+    private string[] termKeys;
 
     private static SkillIconDatabase instance;
 
@@ -48,7 +66,10 @@ public class SkillIconDatabase : ScriptableObject
     }
 
     /// <summary>
-    /// Returns all icons whose ID or tags contain the search term (case-insensitive).
+    /// Returns all icons matching the search term (case-insensitive). A single
+    /// word matches icons with an ID, name or tag word starting with it, found
+    /// by binary search in tagIndex; a term with separators matches icons whose
+    /// ID, name or a tag contains it.
     /// </summary>
     public List<SkillIconEntry> Search(string searchTerm)
     {
@@ -56,6 +77,34 @@ public class SkillIconDatabase : ScriptableObject
         if (allIcons == null || string.IsNullOrEmpty(searchTerm)) return results;
 
         string lower = searchTerm.ToLowerInvariant();
+
+        // A single word is looked up in the sorted word table: the terms it
+        // prefixes form one contiguous run starting at its insertion point
+        if (tagIndex != null && tagIndex.Length > 0 && lower.IndexOfAny(TermSeparators) < 0)
+        {
+            EnsureTermKeys();
+            int first = System.Array.BinarySearch(termKeys, lower, System.StringComparer.Ordinal);
+            if (first < 0) first = ~first;
+
+            var indices = new List<int>();
+            for (int i = first; i < termKeys.Length
+                 && termKeys[i].StartsWith(lower, System.StringComparison.Ordinal); i++)
+            {
+                if (tagIndex[i].icons != null)
+                    indices.AddRange(tagIndex[i].icons);
+            }
+
+            indices.Sort();
+            int last = -1;
+            foreach (int index in indices)
+            {
+                if (index != last && index < allIcons.Length && allIcons[index] != null)
+                    results.Add(allIcons[index]);
+                last = index;
+            }
+            return results;
+        }
+
         foreach (var entry in allIcons)
         {
             if (entry == null) continue;
@@ -88,6 +137,62 @@ public class SkillIconDatabase : ScriptableObject
         return results;
     }
 
+    /// <summary>
+    /// Builds the word table for Search() from a list of entries. Same words
+    /// and order as the CI generator, so both produce identical assets.
+    /// </summary>
+    public static TermEntry[] BuildTagIndex(SkillIconEntry[] entries)
+    {
+        var index = new SortedDictionary<string, List<int>>(System.StringComparer.Ordinal);
+        for (int i = 0; i < entries.Length; i++)
+        {
+            var entry = entries[i];
+            if (entry == null) continue;
+
+            var words = new HashSet<string>();
+            AddWords(words, entry.iconId);
+            AddWords(words, entry.displayName);
+            if (entry.tags != null)
+            {
+                foreach (var tag in entry.tags)
+                    AddWords(words, tag);
+            }
+
+            foreach (var word in words)
+            {
+                if (!index.TryGetValue(word, out var list))
+                    index[word] = list = new List<int>();
+                list.Add(i);
+            }
+        }
+
+        var result = new TermEntry[index.Count];
+        int n = 0;
+        foreach (var pair in index)
+            result[n++] = new TermEntry { term = pair.Key, icons = pair.Value.ToArray() };
+        return result;
+    }
+
+    private static void AddWords(HashSet<string> words, string field)
+    {
+        if (string.IsNullOrEmpty(field)) return;
+
+        foreach (var word in field.ToLowerInvariant().Split(TermSeparators))
+        {
+            if (word.Length > 0)
+                words.Add(word);
+        }
+    }
+
+    private void EnsureTermKeys()
+    {
+        if (termKeys != null) return;
+
+        termKeys = new string[tagIndex.Length];
+        for (int i = 0; i < tagIndex.Length; i++)
+            termKeys[i] = tagIndex[i].term ?? string.Empty;
+    }
+
     private void EnsureLookup()
     {
         if (idLookup != null) return;
@@ -111,5 +216,6 @@ public class SkillIconDatabase : ScriptableObject
     {
         // Force rebuild on load/reimport
         idLookup = null;
+        termKeys = null;
     }
 }
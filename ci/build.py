@@ -6,15 +6,40 @@ Usage:
     python ci/build.py                    # Development build
     python ci/build.py --release          # Release build
     python ci/build.py --output Builds/X  # Custom output path
+    python ci/build.py --matrix ci/build_matrix.json --jobs 2
+                                          # Several variants concurrently
+
+Matrix file format (JSON list, one object per variant):
+
+    [
+      {"name": "dev", "output": "Builds/dev/ProjectNameHere.exe"},
+      {"name": "release", "release": true,
+       "output": "Builds/release/ProjectNameHere.exe",
+       "execute_method": "ProjectName.Editor.BuildScript.BatchBuild",
+       "args": ["-someFlag", "value"]}
+    ]
+
+Unity locks a project while it is open, so concurrent variants each run in
+their own project slot: slot 0 is the real project, further slots are
+mirrored copies under Builds/.matrix/. All slots are synced once, before any
+Unity process starts: syncing later would copy the real project's Library
+while slot 0's build is still writing it.
 
 Requires Unity 6000.3.x installed via Unity Hub.
 """
 
 import argparse
+import json
 import os
+import queue
+import shutil
 import subprocess
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+
+from build_report import parse_build_report, print_report
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
@@ -27,6 +52,17 @@ UNITY_PATHS = [
                  "6000.3.4f1", "Editor", "Unity.exe"),
 ]
 
+DEFAULT_EXECUTE_METHOD = "ProjectName.Editor.BuildScript.BatchBuild"
+BUILD_TIMEOUT = 600
+
+# Directories mirrored into matrix project slots. Library/ is copied too so a
+# slot does not start with a full reimport; Temp/ and Logs/ are per-instance.
+SLOT_DIRS = ["Assets", "Packages", "ProjectSettings", "Library"]
+MATRIX_DIR = os.path.join(PROJECT_ROOT, "Builds", ".matrix")
+
+# Serialises console output from concurrent variants
+_print_lock = threading.Lock()
+
 
 def find_unity():
     """Find the Unity Editor executable."""
@@ -42,6 +78,236 @@ def find_unity():
     return None
 
 
+def build_command(unity_path, project_path, output_path, log_path,
+                  release=False, execute_method=DEFAULT_EXECUTE_METHOD,
+                  extra_args=()):
+    """Assemble the Unity batchmode command line for one build."""
+    cmd = [
+        unity_path,
+        "-batchmode",
+        "-nographics",
+        "-projectPath", project_path,
+        "-executeMethod", execute_method,
+        "-buildPath", output_path,
+        "-logFile", log_path,
+        "-quit",
+    ]
+
+    if not release:
+        cmd.append("-development")
+
+    cmd.extend(extra_args)
+    return cmd
+
+
+def output_size(output_path):
+    """Size in bytes of a player build: the executable plus its _Data folder."""
+    total = os.path.getsize(output_path)
+    data_dir = os.path.splitext(output_path)[0] + "_Data"
+    for dirpath, _, filenames in os.walk(data_dir):
+        for fname in filenames:
+            try:
+                total += os.path.getsize(os.path.join(dirpath, fname))
+            except OSError:
+                pass
+    return total
+
+
+def sync_tree(src, dst):
+    """Mirror src into dst, copying only files whose size or mtime changed."""
+    if not os.path.isdir(src):
+        return
+    for dirpath, dirnames, filenames in os.walk(src):
+        rel_dir = os.path.relpath(dirpath, src)
+        dst_dir = os.path.join(dst, rel_dir)
+        os.makedirs(dst_dir, exist_ok=True)
+
+        # Drop anything in the copy that no longer exists in the source
+        wanted = set(dirnames) | set(filenames)
+        for name in os.listdir(dst_dir):
+            if name in wanted:
+                continue
+            stale = os.path.join(dst_dir, name)
+            if os.path.isdir(stale) and not os.path.islink(stale):
+                shutil.rmtree(stale)
+            else:
+                os.remove(stale)
+
+        for fname in filenames:
+            src_file = os.path.join(dirpath, fname)
+            dst_file = os.path.join(dst_dir, fname)
+            try:
+                s = os.stat(src_file)
+                d = os.stat(dst_file)
+                if s.st_size == d.st_size and int(s.st_mtime) == int(d.st_mtime):
+                    continue
+            except FileNotFoundError:
+                pass
+            shutil.copy2(src_file, dst_file)
+
+
+def slot_path(slot):
+    """Project path of a matrix slot."""
+    if slot == 0:
+        return PROJECT_ROOT
+    return os.path.join(MATRIX_DIR, f"slot{slot}")
+
+
+def prepare_slot(slot):
+    """Sync a mirrored slot from the real project; return its path.
+
+    Only call this while no Unity process has the real project open.
+    """
+    slot_root = slot_path(slot)
+    if slot != 0:
+        for name in SLOT_DIRS:
+            sync_tree(os.path.join(PROJECT_ROOT, name),
+                      os.path.join(slot_root, name))
+    return slot_root
+
+
+def run_build(cmd, output_path, log_path, timeout=BUILD_TIMEOUT):
+    """Run one Unity build and return a result dict (status, size, duration).
+
+    reason says why a build did not pass: "exit_code", "no_output",
+    "timeout" or "no_unity" ("" when it passed).
+    """
+    start = time.time()
+    result = {"output": output_path, "log": log_path,
+              "status": "FAIL", "reason": "", "size": None, "duration": 0.0,
+              "message": ""}
+
+    try:
+        proc = subprocess.run(cmd, timeout=timeout)
+        result["duration"] = time.time() - start
+
+        if proc.returncode != 0:
+            result["reason"] = "exit_code"
+            result["message"] = f"exit code {proc.returncode}"
+        elif not os.path.isfile(output_path):
+            result["reason"] = "no_output"
+            result["message"] = f"output not found at {output_path}"
+        else:
+            result["status"] = "PASS"
+            result["size"] = output_size(output_path)
+            if os.path.isfile(log_path):
+                result["report"] = parse_build_report(log_path)
+
+    except subprocess.TimeoutExpired:
+        result["duration"] = time.time() - start
+        result["status"] = "TIMEOUT"
+        result["reason"] = "timeout"
+        result["message"] = f"exceeded {timeout // 60} min"
+    except FileNotFoundError:
+        result["reason"] = "no_unity"
+        result["message"] = f"Unity executable not found at {cmd[0]}"
+
+    return result
+
+
+def load_matrix(path):
+    """Load and validate a matrix file into a list of variant dicts."""
+    with open(path, "r", encoding="utf-8") as f:
+        variants = json.load(f)
+
+    if not isinstance(variants, list) or not variants:
+        raise ValueError("matrix must be a non-empty JSON list")
+
+    names = set()
+    for i, variant in enumerate(variants):
+        if not isinstance(variant, dict):
+            raise ValueError(f"variant #{i} is not an object")
+        name = variant.setdefault("name", f"variant{i}")
+        if name in names:
+            raise ValueError(f"duplicate variant name: {name}")
+        names.add(name)
+        variant.setdefault("release", False)
+        variant.setdefault("execute_method", DEFAULT_EXECUTE_METHOD)
+        variant.setdefault("args", [])
+        output = variant.get("output") or os.path.join(
+            "Builds", name, "ProjectNameHere.exe")
+        variant["output"] = os.path.abspath(os.path.join(PROJECT_ROOT, output))
+
+    return variants
+
+
+def run_matrix(unity_path, variants, jobs):
+    """Build all variants with at most `jobs` concurrent Unity processes."""
+    jobs = max(1, min(jobs, len(variants)))
+    log_dir = os.path.join(PROJECT_ROOT, "Builds", "logs")
+    os.makedirs(log_dir, exist_ok=True)
+
+    # Each worker checks out a project slot for the duration of one build,
+    # so no two Unity instances ever open the same project directory.
+    slots = queue.Queue()
+    for slot in range(jobs):
+        prepare_slot(slot)
+        slots.put(slot)
+
+    def build_variant(variant):
+        name = variant["name"]
+        slot = slots.get()
+        try:
+            project_path = slot_path(slot)
+            output_path = variant["output"]
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            log_path = os.path.join(log_dir, f"{name}.log")
+
+            cmd = build_command(unity_path, project_path, output_path,
+                                log_path, release=variant["release"],
+                                execute_method=variant["execute_method"],
+                                extra_args=variant["args"])
+            with _print_lock:
+                build_type = "Release" if variant["release"] else "Development"
+                print(f"  [{name}] starting {build_type} build (slot {slot})")
+
+            result = run_build(cmd, output_path, log_path)
+        finally:
+            slots.put(slot)
+
+        result["name"] = name
+        result["release"] = variant["release"]
+        with _print_lock:
+            print(f"  [{name}] {result['status']} ({result['duration']:.0f}s)"
+                  + (f" — {result['message']}" if result["message"] else ""))
+        return result
+
+    print(f"\nBuilding {len(variants)} variant(s), {jobs} at a time...")
+    start = time.time()
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        results = list(pool.map(build_variant, variants))
+    elapsed = time.time() - start
+
+    print_matrix_summary(results, elapsed)
+
+    summary_path = os.path.join(PROJECT_ROOT, "Builds", "matrix-summary.json")
+    with open(summary_path, "w", encoding="utf-8") as f:
+        json.dump({"elapsed": round(elapsed, 1), "variants": results},
+                  f, indent=2)
+    print(f"Summary written to {summary_path}")
+
+    return 0 if all(r["status"] == "PASS" for r in results) else 1
+
+
+def print_matrix_summary(results, elapsed):
+    print()
+    print("=" * 60)
+    print("Build Matrix Summary")
+    print("=" * 60)
+    for r in results:
+        size = f"{r['size'] / (1024 * 1024):8.1f} MB" if r["size"] else " " * 11
+        print(f"  {r['status']:7s} {r['name']:20s} {size} "
+              f"{r['duration']:6.0f}s")
+        if r["status"] != "PASS":
+            print(f"          log: {r['log']}")
+
+    serial = sum(r["duration"] for r in results)
+    passed = sum(1 for r in results if r["status"] == "PASS")
+    print()
+    print(f"Total: {len(results)} variants, {passed} passed "
+          f"({elapsed:.0f}s wall, {serial:.0f}s if run serially)")
+
+
 def main():
     parser = argparse.ArgumentParser(description="Build ProjectNameHere")
     parser.add_argument("--release", action="store_true",
@@ -50,6 +316,11 @@ def main():
                         help="Output path (default: Builds/ProjectNameHere.exe)")
     parser.add_argument("--unity", default=None,
                         help="Path to Unity Editor executable")
+    parser.add_argument("--matrix", default=None,
+                        help="JSON file listing build variants to run")
+    parser.add_argument("--jobs", type=int, default=2,
+                        help="Max concurrent Unity processes in matrix mode "
+                             "(default: 2)")
     args = parser.parse_args()
 
     unity_path = args.unity or find_unity()
@@ -61,6 +332,14 @@ def main():
     print(f"Unity: {unity_path}")
     print(f"Project: {PROJECT_ROOT}")
 
+    if args.matrix:
+        try:
+            variants = load_matrix(args.matrix)
+        except (OSError, ValueError) as e:
+            print(f"ERROR: Cannot load matrix {args.matrix}: {e}")
+            return 1
+        return run_matrix(unity_path, variants, args.jobs)
+
     # Build output
     output_path = args.output or os.path.join(PROJECT_ROOT, "Builds",
                                                "ProjectNameHere.exe")
@@ -74,49 +353,34 @@ def main():
     log_path = os.path.join(PROJECT_ROOT, "Builds", "build.log")
     os.makedirs(os.path.dirname(log_path), exist_ok=True)
 
-    cmd = [
-        unity_path,
-        "-batchmode",
-        "-nographics",
-        "-projectPath", PROJECT_ROOT,
-        "-executeMethod", "ProjectName.Editor.BuildScript.BatchBuild",
-        "-buildPath", output_path,
-        "-logFile", log_path,
-        "-quit",
-    ]
-
-    if not args.release:
-        cmd.append("-development")
+    cmd = build_command(unity_path, PROJECT_ROOT, output_path, log_path,
+                        release=args.release)
 
     print(f"\nStarting build...")
-    start = time.time()
-
-    try:
-        result = subprocess.run(cmd, timeout=600)
-        elapsed = time.time() - start
+    result = run_build(cmd, output_path, log_path)
+    elapsed = result["duration"]
 
-        if result.returncode == 0:
-            if os.path.isfile(output_path):
-                size_mb = os.path.getsize(output_path) / (1024 * 1024)
-                print(f"\nBuild succeeded: {size_mb:.1f} MB ({elapsed:.0f}s)")
-            else:
-                print(f"\nBuild process completed ({elapsed:.0f}s) but output "
-                      f"not found at {output_path}")
-                print(f"Check log: {log_path}")
-                return 1
-        else:
-            print(f"\nBuild FAILED (exit code {result.returncode}, {elapsed:.0f}s)")
-            print(f"Check log: {log_path}")
-            return 1
+    if result["status"] == "PASS":
+        size_mb = result["size"] / (1024 * 1024)
+        print(f"\nBuild succeeded: {size_mb:.1f} MB ({elapsed:.0f}s)")
+        if result.get("report"):
+            print()
+            print_report(result["report"])
+            print("\nRun ci/build_report.py to diff against the size baseline.")
+        return 0
 
-    except subprocess.TimeoutExpired:
+    if result["reason"] == "timeout":
         print("\nBuild TIMEOUT (10 min)")
-        return 1
-    except FileNotFoundError:
-        print(f"\nERROR: Unity executable not found at {unity_path}")
-        return 1
-
-    return 0
+    elif result["reason"] == "no_unity":
+        print(f"\nERROR: {result['message']}")
+    elif result["reason"] == "no_output":
+        print(f"\nBuild process completed ({elapsed:.0f}s) but output "
+              f"not found at {output_path}")
+        print(f"Check log: {log_path}")
+    else:
+        print(f"\nBuild FAILED ({result['message']}, {elapsed:.0f}s)")
+        print(f"Check log: {log_path}")
+    return 1
 
 
 if __name__ == "__main__":
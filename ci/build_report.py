@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Parse the "Build Report" section of a Unity build log into a size breakdown.
+
+Usage:
+    python ci/build_report.py                          # Report Builds/build.log
+    python ci/build_report.py --log Builds/logs/dev.log
+    python ci/build_report.py --save-baseline          # Store as new baseline
+    python ci/build_report.py --threshold Textures=5 --threshold Total=2
+
+Unity writes the section to the editor log after every player build:
+
+    Build Report
+    Uncompressed usage by category (Percentages based on user generated assets only):
+    Textures               12.3 mb     45.2%
+    ...
+    Total User Assets      27.2 mb     100.0%
+    Complete build size    110.5 mb
+    Used Assets and files from the Resources folder, sorted by uncompressed size:
+     4.0 mb     14.7% Assets/_Project/Art/Foo.png
+    -------------------------------------------------------------------------------
+
+The report is compared against a stored baseline; a category fails when it
+grows by more than its percentage threshold AND by more than --min-delta-kb
+(so near-empty categories don't fail on a few bytes).
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+
+DEFAULT_LOG = os.path.join(PROJECT_ROOT, "Builds", "build.log")
+DEFAULT_BASELINE = os.path.join(PROJECT_ROOT, "Builds", "size-baseline.json")
+
+# Allowed growth (percent) per category before the diff fails. "Total" is the
+# complete build size; unlisted categories use DEFAULT_THRESHOLD.
+DEFAULT_THRESHOLD = 10.0
+THRESHOLDS = {
+    "Textures": 5.0,
+    "Total": 5.0,
+}
+MIN_DELTA_KB = 64
+
+GITHUB_ACTIONS = os.environ.get("GITHUB_ACTIONS") == "true"
+
+REPORT_HEADER = "Build Report"
+SIZE = r"(\d+(?:\.\d+)?)\s*(b|kb|mb|gb)"
+CATEGORY_PATTERN = re.compile(
+    r"^\s*([A-Za-z][A-Za-z ]*?)\s+" + SIZE + r"\s+(\d+(?:\.\d+)?)%", re.I)
+COMPLETE_SIZE_PATTERN = re.compile(
+    r"^\s*Complete build size\s+" + SIZE, re.I)
+ASSET_PATTERN = re.compile(
+    r"^\s*" + SIZE + r"\s+(\d+(?:\.\d+)?)%\s+(.+?)\s*$", re.I)
+UNITS = {"b": 1, "kb": 1024, "mb": 1024 ** 2, "gb": 1024 ** 3}
+
+
+def to_bytes(value, unit):
+    return int(float(value) * UNITS[unit.lower()])
+
+
+def format_size(num_bytes):
+    sign = "-" if num_bytes < 0 else ""
+    num_bytes = abs(num_bytes)
+    if num_bytes >= 1024 ** 2:
+        return f"{sign}{num_bytes / 1024 ** 2:.1f} MB"
+    return f"{sign}{num_bytes / 1024:.1f} KB"
+
+
+def parse_build_report(log_path):
+    """Parse the last Build Report section of a Unity log.
+
+    Returns a dict with "categories" (name -> bytes), "total_user_assets",
+    "complete_build_size" and "assets" (list of {path, size}, largest first),
+    or None if the log contains no report.
+    """
+    with open(log_path, "r", encoding="utf-8", errors="replace") as f:
+        lines = f.read().splitlines()
+
+    # A log can hold several builds; the last report is the one we want
+    start = None
+    for i, line in enumerate(lines):
+        if line.strip() == REPORT_HEADER:
+            start = i
+    if start is None:
+        return None
+
+    report = {"categories": {}, "total_user_assets": 0,
+              "complete_build_size": 0, "assets": []}
+    in_assets = False
+
+    for line in lines[start + 1:]:
+        if line.startswith("-----"):
+            break
+
+        if line.strip().startswith("Used Assets"):
+            in_assets = True
+            continue
+
+        if in_assets:
+            match = ASSET_PATTERN.match(line)
+            if match:
+                report["assets"].append({
+                    "path": match.group(4),
+                    "size": to_bytes(match.group(1), match.group(2)),
+                })
+            continue
+
+        match = COMPLETE_SIZE_PATTERN.match(line)
+        if match:
+            report["complete_build_size"] = to_bytes(match.group(1),
+                                                     match.group(2))
+            continue
+
+        match = CATEGORY_PATTERN.match(line)
+        if match:
+            name = match.group(1).strip()
+            size = to_bytes(match.group(2), match.group(3))
+            if name == "Total User Assets":
+                report["total_user_assets"] = size
+            else:
+                report["categories"][name] = size
+
+    report["assets"].sort(key=lambda a: a["size"], reverse=True)
+    return report
+
+
+def _sizes(report):
+    sizes = dict(report["categories"])
+    sizes["Total"] = report["complete_build_size"]
+    return sizes
+
+
+def diff_reports(baseline, current, thresholds=None,
+                 min_delta=MIN_DELTA_KB * 1024):
+    """Compare two reports category by category.
+
+    Returns a list of (name, old, new, delta, pct, limit, failed) rows.
+    """
+    thresholds = {**THRESHOLDS, **(thresholds or {})}
+    old_sizes = _sizes(baseline)
+    new_sizes = _sizes(current)
+    rows = []
+
+    for name in sorted(set(old_sizes) | set(new_sizes)):
+        old = old_sizes.get(name, 0)
+        new = new_sizes.get(name, 0)
+        delta = new - old
+        pct = (delta / old * 100.0) if old else (100.0 if new else 0.0)
+        limit = thresholds.get(name, DEFAULT_THRESHOLD)
+        failed = delta > min_delta and pct > limit
+        rows.append((name, old, new, delta, pct, limit, failed))
+
+    return rows
+
+
+def print_report(report, top=10):
+    print("Size by category:")
+    for name, size in sorted(report["categories"].items(),
+                             key=lambda kv: kv[1], reverse=True):
+        print(f"  {name:20s} {format_size(size):>12s}")
+    print(f"  {'Total User Assets':20s} "
+          f"{format_size(report['total_user_assets']):>12s}")
+    print(f"  {'Complete build size':20s} "
+          f"{format_size(report['complete_build_size']):>12s}")
+
+    if report["assets"]:
+        print(f"\nLargest assets (top {min(top, len(report['assets']))} "
+              f"of {len(report['assets'])}):")
+        for asset in report["assets"][:top]:
+            print(f"  {format_size(asset['size']):>12s}  {asset['path']}")
+
+
+def print_diff(rows):
+    print("\nChange vs baseline:")
+    failed = 0
+    for name, old, new, delta, pct, limit, is_failed in rows:
+        status = "FAIL" if is_failed else "ok"
+        print(f"  {status:4s}  {name:20s} {format_size(old):>12s} -> "
+              f"{format_size(new):>12s}  ({'+' if delta >= 0 else ''}"
+              f"{pct:.1f}%, limit {limit:.0f}%)")
+        if is_failed:
+            failed += 1
+            if GITHUB_ACTIONS:
+                print(f"::error::Build size: {name} grew {format_size(delta)} "
+                      f"({pct:.1f}%, limit {limit:.0f}%)")
+    return failed
+
+
+def parse_thresholds(values):
+    thresholds = {}
+    for value in values or []:
+        name, _, pct = value.partition("=")
+        if not pct:
+            raise ValueError(f"expected CATEGORY=PERCENT, got {value!r}")
+        thresholds[name.strip()] = float(pct)
+    return thresholds
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Size breakdown and baseline diff from a Unity build log")
+    parser.add_argument("--log", default=DEFAULT_LOG,
+                        help="Unity build log (default: Builds/build.log)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE,
+                        help="Baseline JSON (default: Builds/size-baseline.json)")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Write this report as the new baseline")
+    parser.add_argument("--json", default=None,
+                        help="Also write the parsed report to this path")
+    parser.add_argument("--threshold", action="append", metavar="CATEGORY=PCT",
+                        help="Max growth percent for a category (repeatable)")
+    parser.add_argument("--min-delta-kb", type=int, default=MIN_DELTA_KB,
+                        help=f"Ignore growth below this many KB "
+                             f"(default: {MIN_DELTA_KB})")
+    parser.add_argument("--top", type=int, default=10,
+                        help="Number of largest assets to list (default: 10)")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Build Size Report")
+    print("=" * 60)
+
+    try:
+        thresholds = parse_thresholds(args.threshold)
+    except ValueError as e:
+        print(f"ERROR: {e}")
+        return 1
+
+    if not os.path.isfile(args.log):
+        print(f"ERROR: Build log not found: {args.log}")
+        return 1
+
+    report = parse_build_report(args.log)
+    if report is None:
+        print(f"ERROR: No '{REPORT_HEADER}' section in {args.log}")
+        return 1
+
+    print_report(report, args.top)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    failed = 0
+    if os.path.isfile(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        rows = diff_reports(baseline, report, thresholds,
+                            args.min_delta_kb * 1024)
+        failed = print_diff(rows)
+    else:
+        print(f"\nNo baseline at {args.baseline} — skipping diff")
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)),
+                    exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nBaseline saved to {args.baseline}")
+
+    if failed:
+        print(f"\n{failed} categor{'ies' if failed != 1 else 'y'} "
+              "exceeded the growth threshold")
+        return 1 if not args.save_baseline else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""Project-wide call graph of C# methods reachable from Unity hot callbacks.
+
+Each script is summarized on its own: the classes it declares (with base
+class), its methods, and every call site inside them with the receiver's
+type where the file reveals it (fields, locals and parameters declared as
+`Type name`, `Type.StaticCall()`, `Type.Instance.Call()`,
+`GetComponent<Type>().Call()`). Summaries are cached in Library/CICache by
+content hash, so after an edit only that script is re-parsed.
+
+Resolution then runs over all summaries at once. A call to Type.Name reaches
+Name on Type, its project base classes and its subclasses (overrides); an
+unqualified call reaches the caller's own class chain; a call on a receiver
+of unknown type reaches Name only if exactly one project class defines it.
+Calls into engine or package types fall away.
+
+Run directly to list hot methods by frequency.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+
+from context import CheckContext, cache_path
+from symbol_index import (CLASS_DECL, NON_CLASS_SCOPE, SCRIPTS_ROOT,
+                          iter_scripts, parse_methods, strip_literals)
+
+CACHE_NAME = "call-graph.json"
+CACHE_VERSION = 1
+
+PER_FRAME = 3
+PER_PHYSICS_STEP = 2
+PER_EVENT = 1
+
+FREQUENCY_LABELS = {
+    PER_FRAME: "per frame",
+    PER_PHYSICS_STEP: "per physics step",
+    PER_EVENT: "per event",
+}
+
+# Unity callbacks and how often they run
+HOT_ENTRIES = {
+    "Update": PER_FRAME,
+    "LateUpdate": PER_FRAME,
+    "OnGUI": PER_FRAME,
+    "FixedUpdate": PER_PHYSICS_STEP,
+    "OnTriggerStay": PER_PHYSICS_STEP,
+    "OnTriggerStay2D": PER_PHYSICS_STEP,
+    "OnCollisionStay": PER_PHYSICS_STEP,
+    "OnCollisionStay2D": PER_PHYSICS_STEP,
+    "OnTriggerEnter": PER_EVENT,
+    "OnTriggerEnter2D": PER_EVENT,
+    "OnTriggerExit": PER_EVENT,
+    "OnTriggerExit2D": PER_EVENT,
+    "OnCollisionEnter": PER_EVENT,
+    "OnCollisionEnter2D": PER_EVENT,
+    "OnCollisionExit": PER_EVENT,
+    "OnCollisionExit2D": PER_EVENT,
+}
+
+# Methods subscribed to C# events: "Something += Handler;"
+SUBSCRIPTION_PATTERN = re.compile(r"\+=\s*(\w+)\s*;")
+# Fields, locals and parameters: "EnemyHealth health =", "(EnemyHealth target)"
+VARIABLE_DECL = re.compile(
+    r"\b([A-Z]\w*)(?:\s*<[^<>;(){}]*>)?(?:\s*\[\s*\])?\??\s+([a-z_]\w*)"
+    r"\s*(?=[=;,)])")
+CALL_SITE = re.compile(
+    r"GetComponent\w*\s*<\s*(?P<component>\w+)\s*>\s*\(\s*\)\s*\??\.\s*"
+    r"(?P<component_call>\w+)\s*\("
+    r"|(?:(?P<owner>\w+)\s*\.\s*)?(?P<receiver>\w+)\s*\??\.\s*"
+    r"(?P<call>\w+)\s*(?:<[^<>();]*>)?\s*\("
+    r"|(?<![\w.])(?P<bare>\w+)\s*(?:<[^<>();]*>)?\s*\(")
+SINGLETON_PROPERTIES = {"Instance", "instance", "Current", "Singleton"}
+# Call-shaped keywords and operators that are never project methods
+NOT_CALLS = {"if", "for", "foreach", "while", "switch", "using", "lock",
+             "catch", "return", "new", "nameof", "typeof", "sizeof",
+             "default", "base", "this", "when"}
+
+
+def summarize(source):
+    """Summarize one script for the graph (JSON-serializable).
+
+    {"classes": {name: base}, "handlers": [method names subscribed with +=],
+     "methods": [[name, class, line, [[type or "", callee, bare], ...]]]}
+    """
+    code, _ = strip_literals(source)
+    classes = {}
+    for match in CLASS_DECL.finditer(code):
+        if not NON_CLASS_SCOPE.search(code, match.start(), match.end()):
+            base = match.group("base")
+            classes[match.group("name")] = (base.rsplit(".", 1)[-1]
+                                            if base else None)
+    types = {name: type_name for type_name, name in VARIABLE_DECL.findall(code)}
+
+    methods = []
+    for method in parse_methods(code):
+        calls = set()
+        for match in CALL_SITE.finditer(code, method.start, method.end):
+            if match.group("component"):
+                calls.add((match.group("component"),
+                           match.group("component_call"), 0))
+            elif match.group("call"):
+                receiver = match.group("receiver")
+                owner = match.group("owner")
+                if receiver in ("this", "base"):
+                    type_name = method.class_name
+                elif receiver in SINGLETON_PROPERTIES and owner:
+                    type_name = owner
+                elif receiver in types:
+                    type_name = types[receiver]
+                elif receiver[0].isupper():
+                    # Static call or constant-like member access
+                    type_name = receiver
+                else:
+                    type_name = ""
+                calls.add((type_name, match.group("call"), 0))
+            elif match.group("bare") not in NOT_CALLS:
+                calls.add((method.class_name, match.group("bare"), 1))
+        methods.append([method.name, method.class_name, method.line,
+                        sorted(list(c) for c in calls)])
+
+    return {"classes": classes,
+            "handlers": sorted(set(SUBSCRIPTION_PATTERN.findall(code))),
+            "methods": methods}
+
+
+def load_cache(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get("version") != CACHE_VERSION:
+        return {}
+    return data.get("files", {})
+
+
+def save_cache(path, entries):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"version": CACHE_VERSION, "files": entries}, f,
+                  separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+def load_summaries(root, ctx):
+    """Return {project-relative path: summary}, re-parsing changed files only."""
+    cache_file = cache_path(root, CACHE_NAME)
+    cached = load_cache(cache_file)
+    entries = {}
+    dirty = False
+
+    for path in iter_scripts(os.path.join(root, SCRIPTS_ROOT), ctx):
+        rel_path = os.path.relpath(path, root).replace(os.sep, "/")
+        if "/Editor/" in rel_path:
+            continue
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            continue
+        digest = hashlib.sha1(data).hexdigest()
+
+        entry = cached.get(rel_path)
+        if entry is None or entry["hash"] != digest:
+            source = data.decode("utf-8-sig", errors="replace")
+            entry = {"hash": digest, "summary": summarize(source)}
+            dirty = True
+        entries[rel_path] = entry
+
+    if dirty or len(entries) != len(cached):
+        try:
+            save_cache(cache_file, entries)
+        except OSError:
+            pass
+    return {rel_path: entry["summary"] for rel_path, entry in entries.items()}
+
+
+def build_hot_methods(summaries):
+    """Return {(path, class, method): (rank, entry)} for hot methods.
+
+    entry is "Class.Method" of the most frequent callback reaching it.
+    """
+    bases = {}
+    subclasses = {}
+    # (class, method) -> [path, ...]; partial classes span files
+    defined = {}
+    by_method_name = {}
+    for path, summary in summaries.items():
+        for name, base in summary["classes"].items():
+            bases[name] = base
+            if base:
+                subclasses.setdefault(base, set()).add(name)
+        for name, class_name, _, _ in summary["methods"]:
+            defined.setdefault((class_name, name), []).append(path)
+            by_method_name.setdefault(name, set()).add(class_name)
+
+    def chain_up(class_name):
+        seen = []
+        while class_name and class_name not in seen:
+            seen.append(class_name)
+            class_name = bases.get(class_name)
+        return seen
+
+    def chain_down(class_name):
+        found = []
+        stack = [class_name]
+        while stack:
+            current = stack.pop()
+            for sub in subclasses.get(current, ()):
+                if sub not in found:
+                    found.append(sub)
+                    stack.append(sub)
+        return found
+
+    def resolve(type_name, name, bare):
+        if not type_name:
+            owners = by_method_name.get(name, ())
+            return list(owners) if len(owners) == 1 else []
+        candidates = chain_up(type_name)
+        if not bare:
+            candidates += chain_down(type_name)
+        return [c for c in candidates if (c, name) in defined]
+
+    callees = {}
+    for summary in summaries.values():
+        for name, class_name, _, calls in summary["methods"]:
+            targets = callees.setdefault((class_name, name), set())
+            for type_name, callee, bare in calls:
+                targets.update((c, callee)
+                               for c in resolve(type_name, callee, bare))
+
+    entries = {}
+    for summary in summaries.values():
+        handlers = set(summary["handlers"])
+        for name, class_name, _, _ in summary["methods"]:
+            rank = HOT_ENTRIES.get(name)
+            if rank is None and name in handlers:
+                rank = PER_EVENT
+            if rank is not None:
+                entries[(class_name, name)] = rank
+
+    # Visit the most frequent entries first so each method keeps the
+    # highest rank that reaches it
+    hot = {}
+    for node, rank in sorted(entries.items(), key=lambda kv: -kv[1]):
+        entry = f"{node[0]}.{node[1]}"
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            if current in hot and hot[current][0] >= rank:
+                continue
+            hot[current] = (rank, entry)
+            stack.extend(callees.get(current, ()))
+
+    return {(path, class_name, name): value
+            for (class_name, name), value in hot.items()
+            for path in defined.get((class_name, name), ())}
+
+
+def load_hot_methods(root, ctx):
+    """build_hot_methods() over the cached summaries, once per context."""
+    return ctx.memo("call_graph",
+                    lambda: build_hot_methods(load_summaries(root, ctx)))
+
+
+def hot_methods_in(hot, rel_path):
+    """{(class, method): (rank, entry)} for one file's hot methods."""
+    return {(class_name, name): value
+            for (path, class_name, name), value in hot.items()
+            if path == rel_path}
+
+
+def main():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    root = os.path.dirname(script_dir)
+
+    if not os.path.isdir(os.path.join(root, "Assets")):
+        print(f"ERROR: Cannot find Assets/ directory from {root}")
+        return 1
+
+    print("=" * 60)
+    print("Hot Path Call Graph")
+    print("=" * 60)
+
+    ctx = CheckContext(root)
+    hot = load_hot_methods(root, ctx)
+    for rank in sorted(FREQUENCY_LABELS, reverse=True):
+        nodes = sorted((path, class_name, name, entry)
+                       for (path, class_name, name), (r, entry) in hot.items()
+                       if r == rank)
+        print(f"\n{FREQUENCY_LABELS[rank]} ({len(nodes)} methods):")
+        for path, class_name, name, entry in nodes:
+            via = "" if entry == f"{class_name}.{name}" else f"  <- {entry}"
+            print(f"  {class_name}.{name}{via}  ({path})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+"""Report keyframe bloat in .anim clips and validate sprite-swap references.
+
+Every key costs memory and sampling time at runtime, and clips recorded in
+the Animation window pick up keys that change nothing: constant curves, keys
+on a straight line between their neighbours, sprite keys that repeat the
+previous sprite. For each clip this counts curves and keys, finds the keys
+that could be removed without changing the animation, and estimates what
+that would save.
+
+A key is redundant when the curve between its neighbours is the same
+without it:
+  float/vector curves  the neighbours' line passes through the key's value
+                       and all tangents on the way match the line's slope
+                       (flat or stepped tangents for equal values)
+  sprite curves        the key shows the same sprite as the key before it
+Keys are removed greedily: a run of collinear keys collapses to its ends.
+
+Clips are streamed line by line and each key is analyzed as soon as its
+block ends, so only the last two kept keys of one curve are held in memory
+however large the clip is.
+
+Sprite-swap keys are also resolved: the GUID must be a known asset (the
+GUID index shared with check_guid_references) and, for textures in Assets/,
+the fileID must be one of the sprites in the texture's .meta.
+"""
+
+import math
+import os
+import re
+import sys
+from collections import namedtuple
+
+from check_guid_references import load_guid_index, load_meta_headers
+from context import CheckContext
+from findings import Report, standalone_report
+
+ANIM_EXTENSION = ".anim"
+
+# Top-level curve lists that ship with the clip. m_EditorCurves and
+# m_EulerEditorCurves are editor-only copies and don't count.
+CURVE_SECTIONS = {
+    "m_RotationCurves": 4, "m_CompressedRotationCurves": 4,
+    "m_EulerCurves": 3, "m_PositionCurves": 3, "m_ScaleCurves": 3,
+    "m_FloatCurves": 1, "m_PPtrCurves": 0,
+}
+PPTR_SECTION = "m_PPtrCurves"
+
+# Rough runtime cost per key: a Keyframe is 7 floats (time, value, slopes,
+# weights) per animated component; a sprite key is a time and an index
+KEY_BYTES = 28
+PPTR_KEY_BYTES = 8
+
+# Relative tolerance when comparing values and slopes
+EPSILON = 1e-4
+# Report a clip when at least this many keys are removable
+MIN_REDUNDANT_KEYS = 4
+# fileID of the sprite in a Single-mode texture
+SINGLE_SPRITE_FILE_ID = "21300000"
+
+SECTION_PATTERN = re.compile(r"^  (m_\w+):")
+# A new curve in a section, a float/vector key, a sprite key
+CURVE_START = re.compile(r"^  - ")
+FLOAT_KEY_START = re.compile(r"^      - serializedVersion: \d+")
+PPTR_KEY_START = re.compile(r"^    - time: ")
+# Lines that close a curve's key list
+CURVE_FIELD = re.compile(r"^    (attribute|path): ?(.*)")
+CURVE_TAIL = re.compile(r"^      m_(PreInfinity|PostInfinity|RotationOrder):")
+
+KEY_FIELDS = re.compile(
+    r"^ +-? ?(time|value|inSlope|outSlope|weightedMode): (.*)", re.M)
+VECTOR_COMPONENT = re.compile(r"([xyzw]): ([^,}]+)")
+SPRITE_VALUE = re.compile(
+    r"value: \{fileID: (-?\d+),\s+guid: ([0-9a-f]{32})")
+# Sprite fileIDs in a texture .meta. Current metas list them as
+#   internalID: 1234567890          (spriteSheet.sprites entries)
+#   - first:\n      213: 21300000    (internalIDToNameTable)
+# and metas from older Unity versions only as keys of
+#   fileIDToRecycleName:\n    21300000: EmojiOne_0
+META_SPRITE_ID = re.compile(r"^\s+(?:internalID|213): (-?\d+)", re.M)
+META_RECYCLE_NAMES = re.compile(r"^  fileIDToRecycleName:\n((?:    .*\n)*)",
+                                re.M)
+META_RECYCLE_ID = re.compile(r"^\s+(-?\d+): ", re.M)
+
+# values/in_slopes/out_slopes: one float per component (sprite keys keep
+# (fileID, guid) as their single value)
+Key = namedtuple("Key", "line time values in_slopes out_slopes weighted size")
+CurveStats = namedtuple("CurveStats", "section attribute keys redundant "
+                                      "redundant_bytes constant")
+SpriteRef = namedtuple("SpriteRef", "line file_id guid")
+
+
+def parse_number(text):
+    text = text.strip()
+    if text in ("Infinity", "-Infinity", "NaN"):
+        return float(text.lower().replace("infinity", "inf"))
+    try:
+        return float(text)
+    except ValueError:
+        return 0.0
+
+
+def parse_components(text):
+    """'{x: 1, y: 2, z: 3}' -> (1.0, 2.0, 3.0); '0.5' -> (0.5,)."""
+    text = text.strip()
+    if text.startswith("{"):
+        return tuple(parse_number(v) for _, v in
+                     VECTOR_COMPONENT.findall(text))
+    return (parse_number(text),)
+
+
+def parse_key(section, line, block):
+    """Key from the YAML lines of one keyframe, or None if unreadable."""
+    text = "".join(block)
+    size = len(text.encode("utf-8"))
+    if section == PPTR_SECTION:
+        sprite = SPRITE_VALUE.search(text)
+        value = (sprite.group(1), sprite.group(2)) if sprite else text
+        time = KEY_FIELDS.search(text)
+        return Key(line, parse_number(time.group(2)) if time else 0.0,
+                   (value,), (), (), False, size)
+
+    fields = dict(KEY_FIELDS.findall(text))
+    if "time" not in fields or "value" not in fields:
+        return None
+    values = parse_components(fields["value"])
+    return Key(line, parse_number(fields["time"]), values,
+               parse_components(fields.get("inSlope", "0")),
+               parse_components(fields.get("outSlope", "0")),
+               fields.get("weightedMode", "0").strip() != "0", size)
+
+
+def close(a, b):
+    if math.isinf(a) or math.isinf(b):
+        return a == b
+    return abs(a - b) <= EPSILON * max(1.0, abs(a), abs(b))
+
+
+def is_flat(slope):
+    return slope == 0 or math.isinf(slope)
+
+
+def is_redundant(prev, key, nxt):
+    """True if key can be dropped from the curve prev -> key -> nxt."""
+    if prev.in_slopes == () or key.in_slopes == ():
+        # Sprite keys: same sprite as the last one shown
+        return key.values == prev.values
+    if prev.weighted or key.weighted or nxt.weighted:
+        return False
+    span = nxt.time - prev.time
+    if span <= 0:
+        return False
+    for c in range(len(key.values)):
+        try:
+            p, k, n = prev.values[c], key.values[c], nxt.values[c]
+            slopes = (prev.out_slopes[c], key.in_slopes[c],
+                      key.out_slopes[c], nxt.in_slopes[c])
+        except IndexError:
+            return False
+        if close(p, k) and close(k, n) and all(map(is_flat, slopes)):
+            continue
+        slope = (n - p) / span
+        expected = p + slope * (key.time - prev.time)
+        if not close(expected, k) or not all(close(s, slope)
+                                             for s in slopes):
+            return False
+    return True
+
+
+def is_constant_key(first, key):
+    return (key.values == first.values
+            and all(map(is_flat, key.in_slopes + key.out_slopes)))
+
+
+def iter_key_blocks(lines):
+    """Yield (event, section, line, data) from a clip's lines, streaming.
+
+    Events, in file order:
+      "key"    data is the list of lines of one keyframe
+      "field"  data is (name, value) of a curve's attribute or path
+      "end"    the current curve is complete
+      "rate"   data is m_SampleRate
+    """
+    section = None
+    block = None
+    block_line = 0
+    in_curve = False
+    for line_num, line in enumerate(lines, 1):
+        top = SECTION_PATTERN.match(line)
+        if top:
+            if block is not None:
+                yield "key", section, block_line, block
+                block = None
+            if in_curve:
+                yield "end", section, line_num, None
+                in_curve = False
+            name = top.group(1)
+            section = name if name in CURVE_SECTIONS else None
+            if name == "m_SampleRate":
+                yield "rate", None, line_num, line.split(":", 1)[1].strip()
+            continue
+        if section is None:
+            continue
+
+        if CURVE_START.match(line):
+            if block is not None:
+                yield "key", section, block_line, block
+                block = None
+            if in_curve:
+                yield "end", section, line_num, None
+            in_curve = True
+        starts_key = (PPTR_KEY_START if section == PPTR_SECTION
+                      else FLOAT_KEY_START).match(line)
+        if starts_key:
+            if block is not None:
+                yield "key", section, block_line, block
+            block = [line]
+            block_line = line_num
+            continue
+        field = CURVE_FIELD.match(line)
+        if field or CURVE_TAIL.match(line):
+            if block is not None:
+                yield "key", section, block_line, block
+                block = None
+            if field:
+                yield "field", section, line_num, field.groups()
+            continue
+        if block is not None:
+            block.append(line)
+
+    if block is not None:
+        yield "key", section, block_line, block
+    if in_curve:
+        yield "end", section, 0, None
+
+
+def analyze_clip(path):
+    """Return (curves, sprite refs, sample rate) for one .anim file.
+
+    curves: [CurveStats]; sprite refs: [SpriteRef] for sprite-swap keys.
+    """
+    curves = []
+    sprites = []
+    rate = None
+    state = {}
+
+    def finish():
+        if state.get("keys"):
+            curves.append(CurveStats(
+                state["section"], state.get("attribute", ""),
+                state["keys"], state["redundant"], state["bytes"],
+                state["keys"] > 1 and state["constant"]))
+        state.clear()
+
+    try:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            for event, section, line, data in iter_key_blocks(f):
+                if event == "rate":
+                    rate = data
+                elif event == "field":
+                    # attribute/path follow the keys of the curve they
+                    # name; vector curves only have a path
+                    if state and not state.get("attribute"):
+                        state["attribute"] = data[1]
+                elif event == "end":
+                    finish()
+                elif event == "key":
+                    key = parse_key(section, line, data)
+                    if key is None:
+                        continue
+                    if not state:
+                        state.update(section=section, keys=0, redundant=0,
+                                     bytes=0, constant=True, first=key,
+                                     kept=None, candidate=None)
+                    if section == PPTR_SECTION and \
+                            isinstance(key.values[0], tuple):
+                        sprites.append(SpriteRef(line, *key.values[0]))
+                    state["keys"] += 1
+                    state["constant"] &= is_constant_key(state["first"], key)
+                    kept, candidate = state["kept"], state["candidate"]
+                    if candidate is not None and kept is not None and \
+                            is_redundant(kept, candidate, key):
+                        state["redundant"] += 1
+                        state["bytes"] += key_bytes(section, candidate)
+                    elif candidate is not None:
+                        state["kept"] = candidate
+                    state["candidate"] = key
+    except OSError:
+        return [], [], None
+    finish()
+    return curves, sprites, rate
+
+
+def key_bytes(section, key):
+    if section == PPTR_SECTION:
+        return PPTR_KEY_BYTES
+    return KEY_BYTES * CURVE_SECTIONS[section]
+
+
+def iter_clips(assets_dir, ctx, paths=None):
+    if paths is not None:
+        for path in paths:
+            if path.endswith(ANIM_EXTENSION) and os.path.isfile(path):
+                yield path
+        return
+    for dirpath, _, filenames in ctx.walk(assets_dir):
+        for fname in filenames:
+            if fname.endswith(ANIM_EXTENSION):
+                yield os.path.join(dirpath, fname)
+
+
+def load_sprite_ids(meta_path, cache):
+    """Set of sprite fileIDs a texture .meta defines (memoized in cache)."""
+    ids = cache.get(meta_path)
+    if ids is None:
+        try:
+            with open(meta_path, encoding="utf-8", errors="replace") as f:
+                text = f.read()
+        except OSError:
+            text = ""
+        ids = set(META_SPRITE_ID.findall(text))
+        for block in META_RECYCLE_NAMES.findall(text):
+            ids.update(META_RECYCLE_ID.findall(block))
+        ids.add(SINGLE_SPRITE_FILE_ID)
+        cache[meta_path] = ids
+    return ids
+
+
+def format_kb(num_bytes):
+    return f"{num_bytes / 1024:,.1f} KB"
+
+
+def check_animation_clips(root, report=None, ctx=None, paths=None):
+    report = report if report is not None else Report()
+    ctx = ctx or CheckContext(root)
+    assets_dir = os.path.join(root, "Assets")
+
+    if not os.path.isdir(assets_dir):
+        print("ERROR: Assets/ directory not found")
+        return 1
+
+    clips = []
+    for path in iter_clips(assets_dir, ctx, paths):
+        rel_path = os.path.relpath(path, root).replace(os.sep, "/")
+        clips.append((rel_path, *analyze_clip(path)))
+
+    known_guids, has_package_cache = load_guid_index(root, ctx)
+    missing = known_guids.missing(ref.guid for _, _, sprites, _ in clips
+                                  for ref in sprites)
+    # GUID -> texture .meta, for the sprite fileID check
+    meta_by_guid = {guid: meta for meta, (guid, _) in
+                    load_meta_headers(assets_dir, ctx).items() if guid}
+    sprite_ids = {}
+
+    errors = 0
+    total_keys = total_redundant = total_bytes = 0
+    bloated = []
+    for rel_path, curves, sprites, rate in clips:
+        for ref in sprites:
+            if ref.guid in missing:
+                if has_package_cache:
+                    report.error(rel_path, f"Sprite key references missing "
+                                 f"asset {ref.guid}", ref.line,
+                                 rule="ANIM_MISSING_SPRITE")
+                    errors += 1
+                else:
+                    report.warning(rel_path, f"Unresolvable sprite GUID "
+                                   f"(package?): {ref.guid}", ref.line,
+                                   rule="UNRESOLVED_GUID")
+                continue
+            meta = meta_by_guid.get(ref.guid)
+            if meta and ref.file_id not in load_sprite_ids(meta, sprite_ids):
+                texture = os.path.relpath(meta[:-5], root).replace(os.sep,
+                                                                   "/")
+                report.error(rel_path, f"Sprite key references fileID "
+                             f"{ref.file_id}, which {texture} does not "
+                             f"define", ref.line, rule="ANIM_MISSING_SPRITE")
+                errors += 1
+
+        keys = sum(c.keys for c in curves)
+        redundant = sum(c.redundant for c in curves)
+        saved = sum(c.redundant_bytes for c in curves)
+        constant = sum(1 for c in curves if c.constant)
+        total_keys += keys
+        total_redundant += redundant
+        total_bytes += saved
+        if redundant >= MIN_REDUNDANT_KEYS:
+            bloated.append((saved, rel_path, len(curves), keys, redundant,
+                            constant, rate))
+            detail = f", {constant} constant curve(s)" if constant else ""
+            report.warning(rel_path, f"{redundant} of {keys} keys are "
+                           f"redundant{detail} (~{format_kb(saved)})",
+                           rule="ANIM_REDUNDANT_KEYS")
+
+    print(f"  Analyzed {len(clips)} clips, {total_keys} keys")
+
+    if bloated:
+        bloated.sort(key=lambda b: (-b[0], b[1]))
+        print(f"\nLargest savings (top {min(10, len(bloated))}):")
+        print(f"  {'Saved':>10s} {'Curves':>6s} {'Keys':>6s} {'Redund':>6s} "
+              f"{'Const':>5s} {'Rate':>4s}  Clip")
+        for saved, rel_path, n_curves, keys, redundant, constant, rate in \
+                bloated[:10]:
+            print(f"  {format_kb(saved):>10s} {n_curves:6d} {keys:6d} "
+                  f"{redundant:6d} {constant:5d} {rate or '?':>4s}  "
+                  f"{rel_path}")
+
+    if total_redundant:
+        print(f"\n{total_redundant} of {total_keys} keys removable by key "
+              f"reduction, ~{format_kb(total_bytes)} of clip data "
+              f"(warnings only)")
+    else:
+        print("\nNo redundant keys found")
+    if errors:
+        print(f"{errors} unresolved sprite key(s)")
+    return 1 if errors else 0
+
+
+def main():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    root = os.path.dirname(script_dir)
+
+    if not os.path.isdir(os.path.join(root, "Assets")):
+        print(f"ERROR: Cannot find Assets/ directory from {root}")
+        return 1
+
+    print("=" * 60)
+    print("Animation Clip Analysis")
+    print("=" * 60)
+
+    return check_animation_clips(root, standalone_report())
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,7 +5,9 @@ Validates rules from STANDARDS.md without requiring Unity or MSBuild.
 
 Checks:
   - Deprecated API usage (FindObjectOfType, rb.velocity, tag ==)
-  - GetComponent in Update/FixedUpdate/LateUpdate loops
+  - Performance on hot paths (methods reachable from Update & co.):
+    GetComponent/Find, allocations, LINQ, strings, Camera.main,
+    SendMessage, Debug.Log, uncached WaitForSeconds in coroutine loops
   - Public fields on MonoBehaviours (should use [SerializeField] private)
   - Missing explicit private keyword on fields
 """
@@ -14,28 +16,33 @@ import os
 import re
 import sys
 
+from context import CheckContext
+from findings import GITHUB_ACTIONS, Report, standalone_report
+from call_graph import load_hot_methods
+from perf_rules import check_performance
+
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
-SCRIPTS_DIR = os.path.join(PROJECT_ROOT, "Assets", "_Project", "Scripts")
-
-GITHUB_ACTIONS = os.environ.get("GITHUB_ACTIONS") == "true"
 
 
 class StyleViolation:
-    def __init__(self, file, line_num, rule, message):
+    def __init__(self, file, line_num, rule, message, rank=0):
         self.file = file
         self.line_num = line_num
         self.rule = rule
         self.message = message
+        # Call frequency for PERF_* rules (higher runs more often)
+        self.rank = rank
 
     def __str__(self):
         rel = os.path.relpath(self.file, PROJECT_ROOT)
         return f"  [{self.rule}] {rel}:{self.line_num}: {self.message}"
 
 
-def find_cs_files(root):
+def find_cs_files(root, ctx=None):
     """Find all .cs files under the given root, excluding Editor folders."""
-    for dirpath, dirnames, filenames in os.walk(root):
+    walk = ctx.walk if ctx else os.walk
+    for dirpath, dirnames, filenames in walk(root):
         # Skip Editor folders
         dirnames[:] = [d for d in dirnames if d != "Editor"]
         for f in filenames:
@@ -97,60 +104,17 @@ def check_deprecated_apis(filepath, lines):
     return violations
 
 
-# Patterns for Update-family methods
-UPDATE_METHOD_PATTERN = re.compile(
-    r"(void\s+(?:Update|FixedUpdate|LateUpdate)\s*\()"
-)
-GETCOMPONENT_PATTERN = re.compile(r"GetComponent\s*<")
-FIND_IN_UPDATE_PATTERN = re.compile(
-    r"(Find\s*\(|FindGameObjectWithTag|FindWithTag|FindAnyObjectByType|FindObjectsByType)"
-)
-
-
-def check_update_loops(filepath, lines):
-    """Check for GetComponent/Find calls inside Update loops."""
-    violations = []
-    in_update = False
-    brace_depth = 0
-    update_start_depth = 0
-
-    for i, line in enumerate(lines, 1):
-        if COMMENT_PATTERN.match(line):
-            continue
-
-        # Detect Update method entry
-        if UPDATE_METHOD_PATTERN.search(line):
-            in_update = True
-            update_start_depth = brace_depth
-
-        if in_update:
-            brace_depth += line.count("{") - line.count("}")
-
-            if GETCOMPONENT_PATTERN.search(line):
-                violations.append(
-                    StyleViolation(
-                        filepath,
-                        i,
-                        "PERF_UPDATE",
-                        "GetComponent<T>() in Update loop — cache in Awake/Start instead",
-                    )
-                )
-
-            if FIND_IN_UPDATE_PATTERN.search(line):
-                violations.append(
-                    StyleViolation(
-                        filepath,
-                        i,
-                        "PERF_UPDATE",
-                        "Find() call in Update loop — cache reference in Awake/Start",
-                    )
-                )
-
-            # Exit Update method when braces close
-            if brace_depth <= update_start_depth and "{" not in line:
-                in_update = False
+def check_update_loops(filepath, lines, hot=None):
+    """Check methods reachable from Update and other hot callbacks.
 
-    return violations
+    hot is this file's slice of the project call graph (see call_graph);
+    without it only calls within the file are followed. See perf_rules for
+    the rules: GetComponent/Find, per-call allocations, LINQ, string
+    building, Camera.main, SendMessage and Debug.Log on hot paths, plus
+    uncached yield instructions in coroutine loops.
+    """
+    return [StyleViolation(filepath, f.line, f.rule, f.message, f.rank)
+            for f in check_performance("".join(lines), hot)]
 
 
 # Pattern for public fields on MonoBehaviours
@@ -242,19 +206,31 @@ def check_public_fields(filepath, lines):
     return violations
 
 
-def main():
-    print("=" * 60)
-    print("Code Style Check")
-    print("=" * 60)
+def check_code_style(root, report=None, ctx=None, paths=None):
+    report = report if report is not None else Report()
+    ctx = ctx or CheckContext(root)
+    scripts_dir = os.path.join(root, "Assets", "_Project", "Scripts")
 
-    if not os.path.isdir(SCRIPTS_DIR):
-        print(f"Scripts directory not found: {SCRIPTS_DIR}")
+    if not os.path.isdir(scripts_dir):
+        print(f"Scripts directory not found: {scripts_dir}")
         return 1
 
     all_violations = []
     file_count = 0
 
-    for filepath in find_cs_files(SCRIPTS_DIR):
+    # Hot methods across all scripts, grouped per file
+    hot_by_file = {}
+    for (rel_path, class_name, name), value in \
+            load_hot_methods(root, ctx).items():
+        hot_by_file.setdefault(rel_path, {})[(class_name, name)] = value
+
+    if paths is None:
+        files = find_cs_files(scripts_dir, ctx)
+    else:
+        files = [p for p in paths if p.endswith(".cs") and os.path.isfile(p)
+                 and "Editor" not in p.replace("\\", "/").split("/")]
+
+    for filepath in files:
         file_count += 1
         try:
             with open(filepath, "r", encoding="utf-8-sig") as f:
@@ -263,31 +239,33 @@ def main():
             continue
 
         all_violations.extend(check_deprecated_apis(filepath, lines))
-        all_violations.extend(check_update_loops(filepath, lines))
+        rel_path = os.path.relpath(filepath, root).replace(os.sep, "/")
+        all_violations.extend(check_update_loops(
+            filepath, lines, hot_by_file.get(rel_path, {})))
         all_violations.extend(check_public_fields(filepath, lines))
 
     print(f"Scanned {file_count} C# files\n")
 
-    if not all_violations:
-        print("All code style checks OK")
-        return 0
-
-    # Group by rule
+    # Group by rule, keeping only what the report records (duplicates and
+    # baselined findings come back as None). The grouped listing below is
+    # the local output; the annotation is only echoed on Actions.
     by_rule = {}
     for v in all_violations:
-        by_rule.setdefault(v.rule, []).append(v)
+        if report.add("warning", os.path.relpath(v.file, root), v.message,
+                      v.line_num, rule=v.rule, echo=GITHUB_ACTIONS):
+            by_rule.setdefault(v.rule, []).append(v)
+
+    if not by_rule:
+        print("All code style checks OK")
+        return 0
 
     warning_count = 0
     for rule, violations in sorted(by_rule.items()):
         print(f"\n{rule} ({len(violations)} issue{'s' if len(violations) != 1 else ''}):")
-        for v in violations:
+        # Most frequently called first (PERF_* rules); stable otherwise
+        for v in sorted(violations, key=lambda v: -v.rank):
             print(str(v))
             warning_count += 1
-            if GITHUB_ACTIONS:
-                rel = os.path.relpath(v.file, PROJECT_ROOT)
-                print(
-                    f"::warning file={rel},line={v.line_num}::[{v.rule}] {v.message}"
-                )
 
     print(f"\nStyle warnings: {warning_count}")
 
@@ -296,5 +274,13 @@ def main():
     return 0
 
 
+def main():
+    print("=" * 60)
+    print("Code Style Check")
+    print("=" * 60)
+
+    return check_code_style(PROJECT_ROOT, standalone_report())
+
+
 if __name__ == "__main__":
     sys.exit(main())
@@ -0,0 +1,490 @@
+#!/usr/bin/env python3
+"""Find duplicate and near-duplicate images under Assets/.
+
+Copies of the same texture waste build size and VRAM, and each copy has its
+own GUID, so prefabs and animations end up pointing at different files for
+the same pixels. The search narrows the field cheaply before doing real work:
+
+  1. exact: images are grouped by (file size, width, height) from stat() and
+     the image index (header reads only); only files sharing a group are
+     content-hashed (SHA-1)
+  2. near: images with the same dimensions get a perceptual difference hash
+     (dHash) and mean color computed on a process pool. A folder of
+     VARIANT_FOLDER_MIN or more images that all share one size (ULPC's
+     per-color copies of a sheet, animation frames) is a variant folder:
+     its images are variations of each other, not copies, so only its
+     first image stands in for it. Pairs within
+     NEAR_DISTANCE bits and COLOR_TOLERANCE per channel are candidates, and
+     only candidates are decoded side by side to confirm that their pixels
+     match (a coarse hash can't tell two hairstyles on a sprite sheet apart)
+
+Hashes and pair verdicts are cached in Library/CICache keyed by each file's
+(mtime, size), so a rerun only looks at images that changed, and a tree
+with no changes at all reuses the previous near-duplicate clusters as is.
+The near pass needs Pillow and is skipped (with a note) without it.
+
+Each cluster keeps the copy with the most references; the others are
+reported as warnings with the bytes they waste and the files that reference
+their GUIDs, which are the references to re-point before deleting a copy.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from collections import defaultdict, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from check_guid_references import load_meta_headers
+from context import CheckContext, cache_path
+from findings import Report, standalone_report
+from image_index import load_image_index
+from serialized_scan import load_serialized_scans
+
+CACHE_NAME = "image-hashes.json"
+CACHE_VERSION = 1
+
+# dHash grid: HASH_SIZE x HASH_SIZE brightness comparisons -> 256-bit hash
+HASH_SIZE = 16
+# Max differing hash bits (of HASH_SIZE ** 2) for a near-duplicate
+NEAR_DISTANCE = 8
+# Max difference of any mean RGBA channel (0-255); dHash ignores hue, so
+# this keeps palette swaps of the same sprite apart
+COLOR_TOLERANCE = 4
+# Hash and color only nominate pairs; a pair is a near-duplicate when at
+# most NEAR_PIXELS of the visible pixels differ by more than PIXEL_TOLERANCE
+# in some channel (re-encodes and touch-ups pass, other sprites don't)
+PIXEL_TOLERANCE = 32
+NEAR_PIXELS = 0.01
+
+# A folder with this many images, all of one size, is a variant folder
+VARIANT_FOLDER_MIN = 8
+
+HASH_WORKERS = min(8, os.cpu_count() or 1)
+# Below this many images a process pool costs more than it saves
+MIN_POOL_JOBS = 64
+READ_CHUNK = 1 << 20
+
+# kind: "exact" or "near"; paths: project-relative, kept copy first
+Cluster = namedtuple("Cluster", "kind paths wasted")
+
+
+def load_cache(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}, None
+    if data.get("version") != CACHE_VERSION:
+        return {}, None
+    return data.get("images", {}), data.get("near")
+
+
+def save_cache(path, entries, near):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"version": CACHE_VERSION, "images": entries,
+                   "near": near}, f, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+def have_pillow():
+    try:
+        import PIL.Image  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def content_hash(path):
+    """SHA-1 of a file's bytes, or None if it can't be read."""
+    digest = hashlib.sha1()
+    try:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(READ_CHUNK), b""):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def perceptual_hash(path):
+    """Return (dHash hex, color) of an image, or None.
+
+    color is [R, G, B, A]: the alpha-weighted mean color of the visible
+    pixels plus the mean alpha, so a recolored sprite with a small visible
+    area still differs clearly. Transparent pixels are flattened onto black
+    for the dHash, so sprites hash by their visible pixels.
+
+    Runs in a worker process.
+    """
+    from PIL import Image, ImageStat
+
+    try:
+        with Image.open(path) as img:
+            rgba = img.convert("RGBA")
+    except (OSError, ValueError, Image.DecompressionBombError):
+        return None
+    flat = Image.alpha_composite(
+        Image.new("RGBA", rgba.size, (0, 0, 0, 255)), rgba).convert("RGB")
+    small = flat.convert("L").resize((HASH_SIZE + 1, HASH_SIZE),
+                                     Image.BOX).tobytes()
+    bits = 0
+    for row in range(HASH_SIZE):
+        start = row * (HASH_SIZE + 1)
+        for col in range(start, start + HASH_SIZE):
+            bits = (bits << 1) | (small[col] < small[col + 1])
+
+    alpha_sum = ImageStat.Stat(rgba.getchannel("A")).sum[0]
+    color = [round(s * 255 / alpha_sum) if alpha_sum else 0
+             for s in ImageStat.Stat(flat).sum]
+    color.append(round(alpha_sum / (rgba.width * rgba.height)))
+    return f"{bits:0{HASH_SIZE * HASH_SIZE // 4}x}", color
+
+
+def hash_all(func, paths):
+    """Map func over paths, on a process pool when there are enough."""
+    if len(paths) < MIN_POOL_JOBS or HASH_WORKERS < 2:
+        return [func(p) for p in paths]
+    with ProcessPoolExecutor(max_workers=HASH_WORKERS) as pool:
+        return list(pool.map(func, paths, chunksize=32))
+
+
+def candidate_groups(files, index, key):
+    """Group project-relative paths by key(size, info); drop singletons."""
+    groups = defaultdict(list)
+    for rel_path, (_, size) in files.items():
+        groups[key(size, index[rel_path])].append(rel_path)
+    return [sorted(g) for g in groups.values() if len(g) > 1]
+
+
+def update_hashes(root, entries, paths, field, func):
+    """Fill entries[path][field] for paths that don't have it yet.
+
+    Returns True if anything was computed.
+    """
+    todo = [p for p in paths if entries[p][field] is None]
+    if not todo:
+        return False
+    results = hash_all(func, [os.path.join(root, p) for p in todo])
+    for rel_path, result in zip(todo, results):
+        # "" marks an unreadable file so it isn't retried every run
+        entries[rel_path][field] = result if result is not None else ""
+    return True
+
+
+def hamming(a, b):
+    return bin(int(a, 16) ^ int(b, 16)).count("1")
+
+
+def near_candidates(hashes):
+    """Yield (a, b) path pairs whose colors and dHashes are close.
+
+    hashes: {path: (dHash hex, color)}. Paths are swept in order of their
+    color sum: a pair within COLOR_TOLERANCE on every channel is within
+    4 * COLOR_TOLERANCE on the sum, so each path is only compared with the
+    few that follow it that closely.
+    """
+    order = sorted(hashes, key=lambda p: sum(hashes[p][1]))
+    sums = [sum(hashes[p][1]) for p in order]
+    for i, a in enumerate(order):
+        hash_a, color_a = hashes[a]
+        for j in range(i + 1, len(order)):
+            if sums[j] - sums[i] > 4 * COLOR_TOLERANCE:
+                break
+            b = order[j]
+            hash_b, color_b = hashes[b]
+            if (max(abs(x - y) for x, y in zip(color_a, color_b))
+                    <= COLOR_TOLERANCE
+                    and hamming(hash_a, hash_b) <= NEAR_DISTANCE):
+                yield (a, b) if a < b else (b, a)
+
+
+def pixel_difference(pair):
+    """Fraction of visible pixels that differ noticeably between two images.
+
+    A pixel differs when any RGBA channel is off by more than
+    PIXEL_TOLERANCE; visible means opaque in either image. Returns None if
+    either image can't be read or their sizes differ. Runs in a worker
+    process.
+    """
+    from PIL import Image, ImageChops
+
+    images = []
+    for path in pair:
+        try:
+            with Image.open(path) as img:
+                images.append(img.convert("RGBA"))
+        except (OSError, ValueError, Image.DecompressionBombError):
+            return None
+    first, second = images
+    if first.size != second.size:
+        return None
+
+    worst = None
+    for channel in ImageChops.difference(first, second).split():
+        worst = channel if worst is None else ImageChops.lighter(worst,
+                                                                 channel)
+    changed = sum(worst.histogram()[PIXEL_TOLERANCE + 1:])
+    visible = ImageChops.lighter(first.getchannel("A"),
+                                 second.getchannel("A")).histogram()
+    total = first.width * first.height - visible[0]
+    return changed / total if total else 0.0
+
+
+def confirm_pairs(root, entries, pairs):
+    """Return the candidate pairs whose pixels really match.
+
+    Verdicts are cached on the first path's entry together with the second
+    path's stamp, so they are recomputed only when either file changes.
+    """
+    todo = []
+    confirmed = []
+    for a, b in pairs:
+        verdict = entries[a].get("pairs", {}).get(b)
+        if verdict is None or verdict[:2] != entries[b]["stamp"]:
+            todo.append((a, b))
+        elif verdict[2] is not None and verdict[2] <= NEAR_PIXELS:
+            confirmed.append((a, b))
+    if not todo:
+        return confirmed
+
+    results = hash_all(pixel_difference,
+                       [(os.path.join(root, a), os.path.join(root, b))
+                        for a, b in todo])
+    for (a, b), fraction in zip(todo, results):
+        entries[a].setdefault("pairs", {})[b] = \
+            entries[b]["stamp"] + [fraction]
+        if fraction is not None and fraction <= NEAR_PIXELS:
+            confirmed.append((a, b))
+    return confirmed
+
+
+def connected_groups(pairs):
+    """Union-find over pairs; returns the groups of two or more."""
+    parent = {}
+
+    def find(x):
+        parent.setdefault(x, x)
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for a, b in pairs:
+        ra, rb = find(a), find(b)
+        if ra != rb:
+            parent[max(ra, rb)] = min(ra, rb)
+    groups = defaultdict(list)
+    for x in parent:
+        groups[find(x)].append(x)
+    return [sorted(g) for g in groups.values() if len(g) > 1]
+
+
+def variant_extras(index, paths):
+    """Paths in variant folders other than each folder's first image."""
+    folders = defaultdict(list)
+    for rel_path in paths:
+        folders[rel_path.rpartition("/")[0]].append(rel_path)
+    extras = set()
+    for members in folders.values():
+        if (len(members) >= VARIANT_FOLDER_MIN
+                and len({(index[p].width, index[p].height)
+                         for p in members}) == 1):
+            extras.update(sorted(members)[1:])
+    return extras
+
+
+def compare_near(root, index, files, entries, exact):
+    """Near-duplicate clusters among files, hashing what isn't cached."""
+    skipped = {p for g in exact for p in sorted(g)[1:]}
+    skipped |= variant_extras(index, files)
+    same_dims = candidate_groups(
+        {p: s for p, s in files.items() if p not in skipped},
+        index, lambda size, info: (info.width, info.height))
+    update_hashes(root, entries, [p for g in same_dims for p in g],
+                  "dhash", perceptual_hash)
+    candidates = []
+    for group in same_dims:
+        hashes = {p: entries[p]["dhash"] for p in group
+                  if entries[p]["dhash"]}
+        candidates.extend(near_candidates(hashes))
+    return connected_groups(confirm_pairs(root, entries, candidates))
+
+
+def find_duplicates(root, ctx, near=True):
+    """Return (exact clusters, near clusters, {path: size}) for Assets/.
+
+    Cluster paths are unordered here; see order_cluster().
+    """
+    index = load_image_index(root, ctx)
+    cache_file = cache_path(root, CACHE_NAME)
+    cached, cached_near = load_cache(cache_file)
+
+    files = {}
+    entries = {}
+    for rel_path in index:
+        try:
+            st = os.stat(os.path.join(root, rel_path))
+        except OSError:
+            continue
+        stamp = [st.st_mtime_ns, st.st_size]
+        files[rel_path] = stamp
+        entry = cached.get(rel_path)
+        if entry is None or entry["stamp"] != stamp:
+            entry = {"stamp": stamp, "sha1": None, "dhash": None}
+        entries[rel_path] = entry
+
+    # Stage 1: identical bytes need identical size and dimensions
+    same_size = candidate_groups(
+        files, index, lambda size, info: (size, info.width, info.height))
+    dirty = update_hashes(root, entries, [p for g in same_size for p in g],
+                          "sha1", content_hash)
+    exact = []
+    for group in same_size:
+        by_digest = defaultdict(list)
+        for rel_path in group:
+            if entries[rel_path]["sha1"]:
+                by_digest[entries[rel_path]["sha1"]].append(rel_path)
+        exact.extend(g for g in by_digest.values() if len(g) > 1)
+
+    # Stage 2: one representative per exact cluster, compared within its
+    # dimensions only. The clusters depend on nothing but the files' stamps,
+    # so an unchanged tree reuses the last result without comparing at all.
+    near_clusters = []
+    near_result = cached_near
+    if near:
+        tree_key = hashlib.sha1(json.dumps(
+            sorted(files.items())).encode("utf-8")).hexdigest()
+        if cached_near and cached_near["tree"] == tree_key:
+            near_clusters = cached_near["clusters"]
+        else:
+            near_clusters = compare_near(root, index, files, entries, exact)
+            near_result = {"tree": tree_key, "clusters": near_clusters}
+            dirty = True
+
+    if dirty or len(entries) != len(cached):
+        try:
+            save_cache(cache_file, entries, near_result)
+        except OSError:
+            pass
+    sizes = {p: stamp[1] for p, stamp in files.items()}
+    return exact, near_clusters, sizes
+
+
+def reference_index(root, ctx):
+    """Return {guid: [project-relative files referencing it]}."""
+    referrers = defaultdict(set)
+    for path, scan in load_serialized_scans(root, ctx).items():
+        rel_path = os.path.relpath(path, root).replace(os.sep, "/")
+        for _, guid in scan.guids:
+            referrers[guid].add(rel_path)
+    return {guid: sorted(files) for guid, files in referrers.items()}
+
+
+def image_guid(root, rel_path, headers):
+    meta_path = os.path.join(root, *rel_path.split("/")) + ".meta"
+    guid, _ = headers.get(meta_path, (None, None))
+    return guid
+
+
+def order_cluster(paths, refs):
+    """Kept copy first: most referenced, then shortest and first by name."""
+    return sorted(paths, key=lambda p: (-len(refs[p]), len(p), p))
+
+
+def format_kb(size):
+    return f"{size / 1024:,.1f} KB"
+
+
+def describe_refs(guid, files):
+    if guid is None:
+        return "no .meta GUID"
+    if not files:
+        return f"GUID {guid} unreferenced"
+    shown = ", ".join(files[:3])
+    more = f" and {len(files) - 3} more" if len(files) > 3 else ""
+    return f"GUID {guid} referenced by {shown}{more}"
+
+
+def check_duplicate_images(root, report=None, ctx=None, paths=None,
+                           near=None):
+    report = report if report is not None else Report()
+    ctx = ctx or CheckContext(root)
+    assets_dir = os.path.join(root, "Assets")
+
+    if not os.path.isdir(assets_dir):
+        print("ERROR: Assets/ directory not found")
+        return 1
+
+    if near is None:
+        near = have_pillow()
+    exact, near_groups, sizes = find_duplicates(root, ctx, near)
+    print(f"  Compared {len(sizes)} images")
+    if not near:
+        print("  Near-duplicate pass skipped (install Pillow to enable)")
+
+    headers = load_meta_headers(assets_dir, ctx)
+    referrers = reference_index(root, ctx)
+    clusters = []
+    for kind, groups in (("exact", exact), ("near", near_groups)):
+        for group in groups:
+            guids = {p: image_guid(root, p, headers) for p in group}
+            refs = {p: referrers.get(guids[p], []) for p in group}
+            ordered = order_cluster(group, refs)
+            kept = ordered[0]
+            wasted = sum(sizes[p] for p in ordered[1:])
+            clusters.append(Cluster(kind, ordered, wasted))
+            for rel_path in ordered[1:]:
+                what = "Identical to" if kind == "exact" else \
+                    "Near-duplicate of"
+                report.warning(
+                    rel_path,
+                    f"{what} {kept} ({format_kb(sizes[rel_path])} wasted; "
+                    f"{describe_refs(guids[rel_path], refs[rel_path])})",
+                    rule=("DUPLICATE_IMAGE" if kind == "exact"
+                          else "NEAR_DUPLICATE_IMAGE"))
+
+    if not clusters:
+        print("No duplicate images found")
+        return 0
+
+    clusters.sort(key=lambda c: (-c.wasted, c.paths))
+    print(f"\nLargest clusters (top {min(10, len(clusters))}):")
+    for cluster in clusters[:10]:
+        print(f"  {format_kb(cluster.wasted):>12s}  {cluster.kind:5s}  "
+              f"{len(cluster.paths)} copies of {cluster.paths[0]}")
+
+    total = sum(c.wasted for c in clusters)
+    n_exact = sum(1 for c in clusters if c.kind == "exact")
+    print(f"\n{n_exact} exact and {len(clusters) - n_exact} near-duplicate "
+          f"cluster(s), {total / (1024 * 1024):,.2f} MB wasted "
+          f"(warnings only)")
+    return 0
+
+
+def main():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    root = os.path.dirname(script_dir)
+
+    parser = argparse.ArgumentParser(
+        description="Find duplicate and near-duplicate images in Assets/")
+    parser.add_argument("--exact", action="store_true",
+                        help="Skip the perceptual (near-duplicate) pass")
+    args = parser.parse_args()
+
+    if not os.path.isdir(os.path.join(root, "Assets")):
+        print(f"ERROR: Cannot find Assets/ directory from {root}")
+        return 1
+
+    print("=" * 60)
+    print("Duplicate Image Detection")
+    print("=" * 60)
+
+    return check_duplicate_images(root, standalone_report(),
+                                  near=False if args.exact else None)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
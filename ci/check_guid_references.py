@@ -1,11 +1,22 @@
 #!/usr/bin/env python3
-"""Check for broken GUID references in Unity asset files."""
+"""Check for broken GUID references in Unity asset files.
 
+Known GUIDs are held in a compact GuidSet (guid_store.py). Library/PackageCache
+is indexed once per set of installed packages and kept in Library/CICache,
+memory-mapped on later runs. All references are then resolved with one bulk
+missing() query.
+"""
+
+import glob
+import hashlib
 import os
 import re
 import sys
 
-GITHUB_ACTIONS = os.environ.get("GITHUB_ACTIONS") == "true"
+from context import CheckContext, cache_path
+from findings import Report, standalone_report
+from guid_store import GuidSet
+from serialized_scan import get_scan, load_serialized_scans
 
 # GUIDs to skip: all-zero and Unity built-in prefix
 SKIP_GUID_PREFIXES = ("0000000000000000",)
@@ -19,89 +30,219 @@ SCANNABLE_EXTENSIONS = {".prefab", ".unity", ".asset", ".controller",
 # Only validate references inside _Project to avoid third-party false positives
 SCAN_ROOT = os.path.join("Assets", "_Project")
 
-GUID_REF_PATTERN = re.compile(r"guid:\s*([0-9a-f]{32})")
 META_GUID_PATTERN = re.compile(r"^guid:\s*([0-9a-f]{32})", re.MULTILINE)
 
 
-def annotation(level, file, line, msg):
-    if GITHUB_ACTIONS:
-        print(f"::{level} file={file},line={line}::{msg}")
-    else:
-        tag = "ERROR" if level == "error" else "WARN"
-        print(f"  [{tag}] {file}:{line}: {msg}")
+# Unity .meta header:
+#   line 1: fileFormatVersion: 2
+#   line 2: guid: <32hex>
+META_VERSION_LINE = re.compile(r"fileFormatVersion: \d+\s*$")
+META_GUID_LINE = re.compile(r"guid: ([0-9a-f]{32})\s*$")
+
+
+def parse_meta_header(line1, line2):
+    """Return (guid, problem) for the first two lines of a .meta file.
 
+    guid is None unless line 2 is a valid GUID line; problem is None for a
+    well-formed header, else (line, message).
+    """
+    match = META_GUID_LINE.match(line2)
+    guid = match.group(1) if match else None
+    if not META_VERSION_LINE.match(line1):
+        return guid, (1, "Malformed .meta header: expected fileFormatVersion")
+    if guid is None:
+        return None, (2, "Malformed .meta header: expected guid: <32 hex>")
+    return guid, None
 
-def build_guid_index(search_dir):
-    """Build a set of all known GUIDs from .meta files."""
-    guids = set()
-    for dirpath, dirnames, filenames in os.walk(search_dir):
+
+def read_meta_header(filepath):
+    """Read only the first two lines of a .meta file; see parse_meta_header()."""
+    try:
+        # utf-8-sig: some package metas carry a BOM, which Unity accepts
+        with open(filepath, "r", encoding="utf-8-sig", errors="replace") as f:
+            line1 = f.readline()
+            line2 = f.readline()
+    except OSError as e:
+        return None, (None, f"Unreadable .meta: {e.strerror}")
+    return parse_meta_header(line1, line2)
+
+
+def iter_meta_headers(search_dir, ctx=None):
+    """Yield (path, (guid, problem)) for every .meta under search_dir."""
+    paths = []
+    walk = ctx.walk if ctx else os.walk
+    for dirpath, dirnames, filenames in walk(search_dir):
         # Skip non-asset directories
         dirnames[:] = [d for d in dirnames
                        if d not in {"Library", "Temp", "obj", ".git"}]
-        for fname in filenames:
-            if not fname.endswith(".meta"):
-                continue
-            filepath = os.path.join(dirpath, fname)
-            try:
-                with open(filepath, "r", encoding="utf-8", errors="replace") as f:
-                    # GUID is always on line 2 of Unity .meta files:
-                    #   line 1: fileFormatVersion: 2
-                    #   line 2: guid: <32hex>
-                    f.readline()  # skip first line
-                    line2 = f.readline()
-                if line2.startswith("guid: ") and len(line2) >= 38:
-                    guids.add(line2[6:38])
-            except OSError:
-                pass
-    return guids
-
-
-def scan_file_for_guids(filepath, known_guids):
-    """Scan a single file for GUID references and return broken ones."""
-    broken = []
+        paths.extend(os.path.join(dirpath, fname) for fname in filenames
+                     if fname.endswith(".meta"))
+
+    if ctx is None or not ctx.batched_reads:
+        for path in paths:
+            yield path, read_meta_header(path)
+        return
+
+    # One batched read (e.g. git cat-file) instead of an open per file
+    for path, data in ctx.read_many(paths):
+        if data is None:
+            yield path, (None, (None, "Unreadable .meta"))
+            continue
+        lines = data[:512].decode("utf-8-sig", errors="replace") \
+            .splitlines(keepends=True) + ["", ""]
+        yield path, parse_meta_header(lines[0], lines[1])
+
+
+def scan_meta_headers(search_dir, ctx=None):
+    """Map every .meta path under search_dir to its (guid, problem) header."""
+    return dict(iter_meta_headers(search_dir, ctx))
+
+
+def load_meta_headers(search_dir, ctx):
+    """scan_meta_headers() memoized on the context, so each .meta is opened
+    once per run whether the GUID index or the meta content check asks first.
+    """
+    return ctx.memo(("meta_headers", search_dir),
+                    lambda: scan_meta_headers(search_dir, ctx))
+
+
+def patch_meta_headers(ctx, changed, removed):
+    """Update memoized headers in place after .meta files changed on disk."""
+    for key in ctx.memo_keys():
+        if not (isinstance(key, tuple) and key[0] == "meta_headers"):
+            continue
+        headers = ctx.peek(key)
+        prefix = os.path.join(key[1], "")
+        for path in changed:
+            if path.startswith(prefix):
+                headers[path] = read_meta_header(path)
+        for path in removed:
+            headers.pop(path, None)
+    ctx.invalidate("guid_index")
+
+
+def build_guid_index(search_dir, ctx=None):
+    """Build a GuidSet of all known GUIDs from .meta files."""
+    if ctx is None:
+        headers = scan_meta_headers(search_dir)
+    else:
+        headers = load_meta_headers(search_dir, ctx)
+    return GuidSet.from_hex(guid for guid, _ in headers.values() if guid)
+
+
+def load_package_cache_index(package_cache, ctx):
+    """GuidSet of Library/PackageCache, cached per set of installed packages.
+
+    Package folders are named name@version (or @hash) and replaced rather
+    than edited, so their names and mtimes key the cache. The headers are
+    streamed, not kept: nothing else needs them.
+    """
+    dirnames, _ = ctx.listdir(package_cache)
+    stamp = []
+    for name in sorted(dirnames):
+        try:
+            mtime = os.stat(os.path.join(package_cache, name)).st_mtime_ns
+        except OSError:
+            continue
+        stamp.append(f"{name}:{mtime}")
+    key = hashlib.sha1("\n".join(stamp).encode("utf-8")).hexdigest()[:12]
+    cache_file = cache_path(ctx.root, f"package-guids-{key}.bin")
     try:
-        with open(filepath, "r", encoding="utf-8", errors="replace") as f:
-            for line_num, line in enumerate(f, 1):
-                for match in GUID_REF_PATTERN.finditer(line):
-                    guid = match.group(1)
-                    if guid == NULL_GUID:
-                        continue
-                    if any(guid.startswith(p) for p in SKIP_GUID_PREFIXES):
-                        continue
-                    if guid not in known_guids:
-                        broken.append((line_num, guid))
+        return GuidSet.load(cache_file)
+    except (OSError, ValueError):
+        pass
+
+    index = GuidSet.from_hex(guid for _, (guid, _) in
+                             iter_meta_headers(package_cache, ctx) if guid)
+    for stale in glob.glob(cache_path(ctx.root, "package-guids-*.bin")):
+        try:
+            os.remove(stale)
+        except OSError:
+            pass
+    try:
+        index.save(cache_file)
     except OSError:
         pass
+    return index
+
+
+def find_broken_guids(guid_refs, missing):
+    """Return the (line, guid) references whose GUID is in missing.
+
+    missing comes from one GuidSet.missing() query over all references.
+    """
+    broken = []
+    for line_num, guid in guid_refs:
+        if guid == NULL_GUID:
+            continue
+        if guid.startswith(SKIP_GUID_PREFIXES):
+            continue
+        if guid in missing:
+            broken.append((line_num, guid))
     return broken
 
 
-def check_guid_references(root):
+def iter_scannable(scan_dir, ctx, paths=None):
+    """Yield asset files under scan_dir that may hold GUID references.
+
+    With paths (watch mode), only those files are considered.
+    """
+    if paths is None:
+        paths = (os.path.join(dirpath, fname)
+                 for dirpath, _, filenames in ctx.walk(scan_dir)
+                 for fname in filenames)
+    else:
+        prefix = os.path.join(scan_dir, "")
+        paths = (p for p in paths
+                 if p.startswith(prefix) and os.path.isfile(p))
+
+    for path in paths:
+        if os.path.splitext(path)[1].lower() in SCANNABLE_EXTENSIONS:
+            yield path
+
+
+def load_guid_index(root, ctx):
+    """Index Assets/, Packages/ and (if present) Library/PackageCache/.
+
+    Returns (known_guids, has_package_cache), memoized on the context.
+    """
+    def build():
+        known_guids = build_guid_index(os.path.join(root, "Assets"), ctx)
+
+        # Also index Packages/ if it exists
+        packages_dir = os.path.join(root, "Packages")
+        if ctx.isdir(packages_dir):
+            known_guids |= build_guid_index(packages_dir, ctx)
+
+        # Index Library/PackageCache/ for installed package GUIDs (URP, TMP,
+        # etc.). This directory exists locally but not on CI (gitignored).
+        package_cache = os.path.join(root, "Library", "PackageCache")
+        has_package_cache = ctx.isdir(package_cache)
+        if has_package_cache:
+            known_guids |= load_package_cache_index(package_cache, ctx)
+        return known_guids, has_package_cache
+
+    return ctx.memo("guid_index", build)
+
+
+def check_guid_references(root, report=None, ctx=None, paths=None):
+    report = report if report is not None else Report()
+    ctx = ctx or CheckContext(root)
     assets_dir = os.path.join(root, "Assets")
     scan_dir = os.path.join(root, SCAN_ROOT)
 
-    if not os.path.isdir(assets_dir):
+    if not ctx.isdir(assets_dir):
         print("ERROR: Assets/ directory not found")
         return 1
 
-    if not os.path.isdir(scan_dir):
+    if not ctx.isdir(scan_dir):
         print(f"ERROR: {SCAN_ROOT}/ directory not found")
         return 1
 
     # Phase 1: Build GUID index from ALL meta files (including Packages)
     print("Building GUID index...")
-    known_guids = build_guid_index(assets_dir)
-
-    # Also index Packages/ if it exists
-    packages_dir = os.path.join(root, "Packages")
-    if os.path.isdir(packages_dir):
-        known_guids |= build_guid_index(packages_dir)
-
-    # Index Library/PackageCache/ for installed package GUIDs (URP, TMP, etc.)
-    # This directory exists locally but not on CI (it's gitignored).
-    package_cache = os.path.join(root, "Library", "PackageCache")
-    has_package_cache = os.path.isdir(package_cache)
+    known_guids, has_package_cache = load_guid_index(root, ctx)
     if has_package_cache:
-        known_guids |= build_guid_index(package_cache)
         print(f"  Indexed {len(known_guids)} GUIDs (including package cache)")
     else:
         print(f"  Indexed {len(known_guids)} GUIDs (no package cache — "
@@ -113,30 +254,37 @@ def check_guid_references(root):
     warnings = 0
     files_scanned = 0
 
-    for dirpath, dirnames, filenames in os.walk(scan_dir):
-        for fname in filenames:
-            ext = os.path.splitext(fname)[1].lower()
-            if ext not in SCANNABLE_EXTENSIONS:
-                continue
-
-            filepath = os.path.join(dirpath, fname)
-            rel_path = os.path.relpath(filepath, root).replace("\\", "/")
-            files_scanned += 1
-
-            broken = scan_file_for_guids(filepath, known_guids)
-            for line_num, guid in broken:
-                if has_package_cache:
-                    # We have full GUID coverage — this is a real broken ref
-                    annotation("error", rel_path, line_num,
-                               f"Broken GUID reference: {guid}")
-                    errors += 1
-                else:
-                    # No package cache — can't tell if it's a package GUID
-                    # Only error if the GUID was once in our Assets/ (deleted asset)
-                    # Otherwise warn (likely a package GUID we can't resolve)
-                    annotation("warning", rel_path, line_num,
-                               f"Unresolvable GUID (package?): {guid}")
-                    warnings += 1
+    # The file reads are shared with the layer/tag check's serialized pass;
+    # watch mode reuses the patched scans without a full rebuild
+    if paths is None:
+        scans = load_serialized_scans(root, ctx)
+    else:
+        scans = ctx.peek("serialized_scans") or {}
+
+    refs_by_file = [(filepath, get_scan(scans, filepath).guids)
+                    for filepath in iter_scannable(scan_dir, ctx, paths)]
+    missing = known_guids.missing(guid for _, refs in refs_by_file
+                                  for _, guid in refs)
+
+    for filepath, refs in refs_by_file:
+        rel_path = os.path.relpath(filepath, root).replace("\\", "/")
+        files_scanned += 1
+
+        broken = find_broken_guids(refs, missing)
+        for line_num, guid in broken:
+            if has_package_cache:
+                # We have full GUID coverage — this is a real broken ref
+                report.error(rel_path, f"Broken GUID reference: {guid}",
+                             line_num, rule="BROKEN_GUID")
+                errors += 1
+            else:
+                # No package cache — can't tell if it's a package GUID
+                # Only error if the GUID was once in our Assets/ (deleted asset)
+                # Otherwise warn (likely a package GUID we can't resolve)
+                report.warning(rel_path,
+                               f"Unresolvable GUID (package?): {guid}",
+                               line_num, rule="UNRESOLVED_GUID")
+                warnings += 1
 
     print(f"  Scanned {files_scanned} asset files")
 
@@ -164,7 +312,7 @@ def main():
     print("GUID Reference Check")
     print("=" * 60)
 
-    return check_guid_references(root)
+    return check_guid_references(root, standalone_report())
 
 
 if __name__ == "__main__":
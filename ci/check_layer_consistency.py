@@ -1,37 +1,50 @@
 #!/usr/bin/env python3
-"""Check that layer, sorting layer, and tag references in C# match TagManager."""
+"""Check that layer, sorting layer, and tag references match TagManager.
+
+C# scripts are checked for string literals (NameToLayer, GetMask,
+sortingLayerName, CompareTag). Scenes, prefabs and animations are checked
+for the serialized m_Layer indices, m_TagString names and m_SortingLayerID
+unique IDs, which silently point at nothing once a layer is deleted. The
+serialized values come from the pass shared with the GUID check.
+"""
 
 import os
 import re
 import sys
+from collections import namedtuple
 
-GITHUB_ACTIONS = os.environ.get("GITHUB_ACTIONS") == "true"
+from context import CheckContext
+from findings import Report, standalone_report
+from serialized_scan import (SERIALIZED_ROOTS, get_scan, iter_serialized,
+                             load_serialized_scans)
 
 # Unity built-in tags that are always available (not in TagManager.asset tags list)
 BUILTIN_TAGS = {"Untagged", "Respawn", "Finish", "EditorOnly", "MainCamera",
                 "Player", "GameController", "Enemy"}
 
-# Patterns to find layer/tag/sorting layer references in C#
-LAYER_NAME_TO_LAYER = re.compile(
-    r'LayerMask\.NameToLayer\(\s*"([^"]+)"\s*\)')
-LAYER_GET_MASK = re.compile(
-    r'LayerMask\.GetMask\(\s*"([^"]+)"(?:\s*,\s*"([^"]+)")*\s*\)')
-LAYER_GET_MASK_ALL = re.compile(r'"([^"]+)"')
-SORTING_LAYER_ASSIGN = re.compile(
-    r'sortingLayerName\s*=\s*"([^"]+)"')
-COMPARE_TAG = re.compile(
-    r'CompareTag\(\s*"([^"]+)"\s*\)')
+# One pass per file: a single alternation with a named group per reference
+# kind. \s spans newlines, so GetMask calls split across lines still match.
+REFERENCE_PATTERN = re.compile(
+    r'LayerMask\.NameToLayer\(\s*"(?P<layer>[^"]+)"\s*\)'
+    r'|LayerMask\.GetMask\(\s*(?P<mask>"[^"]*"(?:\s*,\s*"[^"]*")*)\s*\)'
+    r'|sortingLayerName\s*=\s*"(?P<sorting>[^"]+)"'
+    r'|CompareTag\(\s*"(?P<tag>[^"]+)"\s*\)')
+MASK_NAME = re.compile(r'"([^"]+)"')
 
-# For detecting editor scripts (warnings only)
-EDITOR_PATH_SEGMENTS = {"Editor", "editor"}
+# Files containing none of these can't match REFERENCE_PATTERN; skipping
+# them with a substring test is far cheaper than running the regex
+PREFILTER = ("LayerMask", "CompareTag", "sortingLayerName")
 
+# Serialized files whose layer/tag/sorting-layer fields are validated
+LAYER_DATA_EXTENSIONS = {".unity", ".prefab", ".anim"}
 
-def annotation(level, file, line, msg):
-    if GITHUB_ACTIONS:
-        print(f"::{level} file={file},line={line}::{msg}")
-    else:
-        tag = "ERROR" if level == "error" else "WARN"
-        print(f"  [{tag}] {file}:{line}: {msg}")
+# layers/sorting_layers/tags: names; layer_indices: indices with a name;
+# sorting_layer_ids: uniqueIDs as unsigned 32-bit ints
+TagManager = namedtuple(
+    "TagManager", "layers sorting_layers tags layer_indices sorting_layer_ids")
+
+# For detecting editor scripts (warnings only)
+EDITOR_PATH_SEGMENTS = {"Editor", "editor"}
 
 
 def parse_tag_manager(root):
@@ -39,13 +52,16 @@ def parse_tag_manager(root):
     tm_path = os.path.join(root, "ProjectSettings", "TagManager.asset")
     if not os.path.exists(tm_path):
         print("ERROR: ProjectSettings/TagManager.asset not found")
-        return None, None, None
+        return None
 
     with open(tm_path, "r", encoding="utf-8", errors="replace") as f:
         content = f.read()
 
     # Parse physics layers (lines under "layers:" until next key)
     layers = set()
+    layer_indices = set()
+    layer_index = 0
+    sorting_layer_ids = set()
     in_layers = False
     in_sorting = False
     sorting_layers = set()
@@ -90,19 +106,26 @@ def parse_tag_manager(root):
                 tags.add(tag_val)
 
         if in_layers:
-            if stripped.startswith("- "):
-                layer_name = stripped[2:].strip()
+            if stripped.startswith("-"):
+                # Unused slots are "- " entries; the index still counts
+                layer_name = stripped[1:].strip()
                 if layer_name:
                     layers.add(layer_name)
-            elif not stripped.startswith("-"):
+                    layer_indices.add(layer_index)
+                layer_index += 1
+            else:
                 in_layers = False
 
         if in_sorting:
             name_match = re.match(r"-\s*name:\s*(.+)", stripped)
             if name_match:
                 sorting_layers.add(name_match.group(1).strip())
+            id_match = re.match(r"uniqueID:\s*(-?\d+)", stripped)
+            if id_match:
+                sorting_layer_ids.add(int(id_match.group(1)) & 0xFFFFFFFF)
 
-    return layers, sorting_layers, tags
+    return TagManager(layers, sorting_layers, tags, layer_indices,
+                      sorting_layer_ids)
 
 
 def is_editor_script(filepath):
@@ -111,7 +134,61 @@ def is_editor_script(filepath):
     return bool(EDITOR_PATH_SEGMENTS.intersection(parts))
 
 
-def scan_scripts(root, layers, sorting_layers, tags):
+def iter_scripts(scripts_dir, ctx, paths=None):
+    """Yield .cs files under scripts_dir, or only those listed in paths."""
+    if paths is not None:
+        for path in paths:
+            if path.endswith(".cs") and os.path.isfile(path):
+                yield path
+        return
+
+    for dirpath, dirnames, filenames in ctx.walk(scripts_dir):
+        dirnames[:] = [d for d in dirnames if d not in {".git", "obj"}]
+        for fname in filenames:
+            if fname.endswith(".cs"):
+                yield os.path.join(dirpath, fname)
+
+
+def iter_unknown_references(content, layers, sorting_layers, tags):
+    """Yield (line, rule, message) for each undefined name in C# source.
+
+    Line numbers are counted only up to each match, carried forward from the
+    previous one, so files are never split into lines.
+    """
+    line_num = 1
+    pos = 0
+
+    def line_at(offset):
+        nonlocal line_num, pos
+        line_num += content.count("\n", pos, offset)
+        pos = offset
+        return line_num
+
+    for match in REFERENCE_PATTERN.finditer(content):
+        kind = match.lastgroup
+        if kind == "mask":
+            for inner in MASK_NAME.finditer(content, match.start("mask"),
+                                            match.end("mask")):
+                name = inner.group(1)
+                if name not in layers:
+                    yield (line_at(inner.start()), "UNKNOWN_LAYER",
+                           f'Layer "{name}" not defined in TagManager')
+            continue
+
+        name = match.group(kind)
+        if kind == "layer" and name not in layers:
+            yield (line_at(match.start()), "UNKNOWN_LAYER",
+                   f'Layer "{name}" not defined in TagManager')
+        elif kind == "sorting" and name not in sorting_layers:
+            yield (line_at(match.start()), "UNKNOWN_SORTING_LAYER",
+                   f'Sorting layer "{name}" not defined in TagManager')
+        elif kind == "tag" and name not in tags:
+            yield (line_at(match.start()), "UNKNOWN_TAG",
+                   f'Tag "{name}" not defined in TagManager')
+
+
+def scan_scripts(root, layers, sorting_layers, tags, report, ctx,
+                 paths=None):
     """Scan C# scripts for layer/tag references and cross-check."""
     scripts_dir = os.path.join(root, "Assets", "_Project", "Scripts")
     if not os.path.isdir(scripts_dir):
@@ -124,82 +201,102 @@ def scan_scripts(root, layers, sorting_layers, tags):
 
     all_tags = tags | BUILTIN_TAGS
 
-    for dirpath, dirnames, filenames in os.walk(scripts_dir):
-        dirnames[:] = [d for d in dirnames if d not in {".git", "obj"}]
+    for filepath in iter_scripts(scripts_dir, ctx, paths):
+        rel_path = os.path.relpath(filepath, root).replace("\\", "/")
+        is_editor = is_editor_script(rel_path)
+        level = "warning" if is_editor else "error"
+        files_scanned += 1
 
-        for fname in filenames:
-            if not fname.endswith(".cs"):
-                continue
-
-            filepath = os.path.join(dirpath, fname)
-            rel_path = os.path.relpath(filepath, root).replace("\\", "/")
-            is_editor = is_editor_script(rel_path)
-            level = "warning" if is_editor else "error"
-            files_scanned += 1
-
-            try:
-                with open(filepath, "r", encoding="utf-8", errors="replace") as f:
-                    lines = f.readlines()
-            except OSError:
-                continue
-
-            for line_num, line in enumerate(lines, 1):
-                # Check LayerMask.NameToLayer
-                for match in LAYER_NAME_TO_LAYER.finditer(line):
-                    name = match.group(1)
-                    if name not in layers:
-                        annotation(level, rel_path, line_num,
-                                   f'Layer "{name}" not defined in TagManager')
-                        if is_editor:
-                            warnings += 1
-                        else:
-                            errors += 1
-
-                # Check LayerMask.GetMask — extract all quoted strings in the call
-                for outer_match in LAYER_GET_MASK.finditer(line):
-                    full_call = line[outer_match.start():outer_match.end()]
-                    for inner in LAYER_GET_MASK_ALL.finditer(full_call):
-                        name = inner.group(1)
-                        if name not in layers:
-                            annotation(level, rel_path, line_num,
-                                       f'Layer "{name}" not defined in TagManager')
-                            if is_editor:
-                                warnings += 1
-                            else:
-                                errors += 1
-
-                # Check sorting layer assignments
-                for match in SORTING_LAYER_ASSIGN.finditer(line):
-                    name = match.group(1)
-                    if name not in sorting_layers:
-                        annotation(level, rel_path, line_num,
-                                   f'Sorting layer "{name}" not defined in TagManager')
-                        if is_editor:
-                            warnings += 1
-                        else:
-                            errors += 1
-
-                # Check CompareTag
-                for match in COMPARE_TAG.finditer(line):
-                    name = match.group(1)
-                    if name not in all_tags:
-                        annotation(level, rel_path, line_num,
-                                   f'Tag "{name}" not defined in TagManager')
-                        if is_editor:
-                            warnings += 1
-                        else:
-                            errors += 1
+        try:
+            with open(filepath, "r", encoding="utf-8", errors="replace") as f:
+                content = f.read()
+        except OSError:
+            continue
+
+        if not any(marker in content for marker in PREFILTER):
+            continue
+
+        for line_num, rule, message in iter_unknown_references(
+                content, layers, sorting_layers, all_tags):
+            report.add(level, rel_path, message, line_num, rule=rule)
+            if is_editor:
+                warnings += 1
+            else:
+                errors += 1
 
     print(f"  Scanned {files_scanned} C# files")
     return errors, warnings
 
 
-def check_layer_consistency(root):
+def iter_layer_data(root, ctx, paths=None):
+    """Yield scenes, prefabs and animations under SERIALIZED_ROOTS."""
+    if paths is None:
+        files = iter_serialized(root, ctx)
+    else:
+        prefixes = tuple(os.path.join(root, r, "") for r in SERIALIZED_ROOTS)
+        files = (p for p in paths
+                 if p.startswith(prefixes) and os.path.isfile(p))
+    for path in files:
+        if os.path.splitext(path)[1].lower() in LAYER_DATA_EXTENSIONS:
+            yield path
+
+
+def iter_unknown_serialized(fields, tag_manager, tags):
+    """Yield (line, rule, message) for serialized values TagManager lacks."""
+    for line_num, name, value in fields:
+        if name == "m_TagString":
+            if value and value not in tags:
+                yield (line_num, "UNKNOWN_TAG",
+                       f'Tag "{value}" not defined in TagManager')
+            continue
+        try:
+            number = int(value)
+        except ValueError:
+            continue
+        if name == "m_Layer" and number not in tag_manager.layer_indices:
+            yield (line_num, "UNKNOWN_LAYER",
+                   f"Layer index {number} has no name in TagManager")
+        elif (name == "m_SortingLayerID" and
+              number & 0xFFFFFFFF not in tag_manager.sorting_layer_ids):
+            yield (line_num, "UNKNOWN_SORTING_LAYER",
+                   f"Sorting layer ID {number} not defined in TagManager")
+
+
+def scan_serialized_data(root, tag_manager, report, ctx, paths=None):
+    """Cross-check m_Layer/m_TagString/m_SortingLayerID in YAML assets."""
+    if paths is None:
+        scans = load_serialized_scans(root, ctx)
+    else:
+        scans = ctx.peek("serialized_scans") or {}
+
+    errors = 0
+    files_scanned = 0
+    all_tags = tag_manager.tags | BUILTIN_TAGS
+
+    for filepath in iter_layer_data(root, ctx, paths):
+        files_scanned += 1
+        fields = get_scan(scans, filepath).fields
+        if not fields:
+            continue
+        rel_path = os.path.relpath(filepath, root).replace("\\", "/")
+        for line_num, rule, message in iter_unknown_serialized(
+                fields, tag_manager, all_tags):
+            report.error(rel_path, message, line_num, rule=rule)
+            errors += 1
+
+    print(f"  Scanned {files_scanned} scene/prefab/animation files")
+    return errors
+
+
+def check_layer_consistency(root, report=None, ctx=None, paths=None):
+    report = report if report is not None else Report()
+    ctx = ctx or CheckContext(root)
     print("Parsing TagManager.asset...")
-    layers, sorting_layers, tags = parse_tag_manager(root)
+    tag_manager = ctx.memo("tag_manager", lambda: parse_tag_manager(root))
 
-    if layers is None:
+    if tag_manager is None:
         return 1
+    layers, sorting_layers, tags = tag_manager[:3]
 
     print(f"  Physics layers: {sorted(layers)}")
     print(f"  Sorting layers: {sorted(sorting_layers)}")
@@ -207,7 +304,11 @@ def check_layer_consistency(root):
     print(f"  Built-in tags: {sorted(BUILTIN_TAGS)}")
 
     print("\nScanning C# scripts...")
-    errors, warnings = scan_scripts(root, layers, sorting_layers, tags)
+    errors, warnings = scan_scripts(root, layers, sorting_layers, tags,
+                                    report, ctx, paths)
+
+    print("\nScanning scenes, prefabs and animations...")
+    errors += scan_serialized_data(root, tag_manager, report, ctx, paths)
 
     if errors:
         print(f"\n{errors} error(s), {warnings} warning(s)")
@@ -231,7 +332,7 @@ def main():
     print("Layer / Tag Consistency Check")
     print("=" * 60)
 
-    return check_layer_consistency(root)
+    return check_layer_consistency(root, standalone_report())
 
 
 if __name__ == "__main__":
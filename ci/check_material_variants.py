@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""Report shader keyword combinations used by materials.
+
+Every distinct set of keywords enabled on materials of one shader is a
+separate shader variant that has to be compiled into the build and loaded
+(often with a hitch) the first time it renders. This groups all .mat files
+by shader and reports, per shader, how many distinct keyword combinations
+the materials ask for and which materials are the only users of theirs:
+changing or merging those materials removes a variant outright.
+
+For shaders in Assets/ the .shader source is read as well, so the report
+can estimate the compiled variant count: every option of each
+`#pragma multi_compile` is always built, while `#pragma shader_feature`
+keywords only produce the combinations materials actually use. Identical
+pragma lines are counted once, so a multi-pass shader is estimated per pass.
+
+Materials are streamed up to m_SavedProperties: the shader and keyword
+fields sit above it, and the property lists below can be long. Both the
+current m_ValidKeywords/m_InvalidKeywords lists and the older space-separated
+m_ShaderKeywords field are read. Invalid keywords (not declared by the
+shader any more) are reported too: they compile to nothing, but keep stale
+data in the material.
+"""
+
+import argparse
+import os
+import re
+import sys
+from collections import Counter, defaultdict, namedtuple
+
+from check_guid_references import load_meta_headers
+from context import CheckContext
+from findings import Report, standalone_report
+
+MATERIAL_EXTENSION = ".mat"
+SHADER_EXTENSION = ".shader"
+
+# Built-in shaders have no asset of their own; known ones by fileID
+BUILTIN_SHADER_GUID = "0000000000000000f000000000000000"
+BUILTIN_SHADERS = {"45": "Standard (Specular setup)", "46": "Standard"}
+
+SHADER_FIELD = re.compile(
+    r"^  m_Shader: \{fileID: (-?\d+)(?:, guid: ([0-9a-f]{32}))?")
+LEGACY_KEYWORDS = re.compile(r"^  m_ShaderKeywords: ?(.*)")
+KEYWORD_LIST = re.compile(r"^  (m_ValidKeywords|m_InvalidKeywords):(.*)")
+LIST_ITEM = re.compile(r"^  - (\S+)")
+PROPERTIES_START = "  m_SavedProperties:"
+
+SHADER_NAME = re.compile(r'^\s*Shader\s+"([^"]+)"', re.M)
+KEYWORD_PRAGMA = re.compile(
+    r"^\s*#pragma\s+(multi_compile|shader_feature)(?:_local)?"
+    r"(?:_vertex|_fragment|_geometry|_hull|_domain|_raytracing)?"
+    r"[ \t]+([^\r\n]+)", re.M)
+# Placeholder for "no keyword" in a pragma's option list
+NO_KEYWORD = re.compile(r"^_+$")
+
+TOP_SHADERS = 10
+
+# keywords/invalid: frozensets; line: where the keywords are declared
+Material = namedtuple("Material", "path shader keywords invalid line")
+# multi/features: [options tuple] per distinct pragma line
+ShaderInfo = namedtuple("ShaderInfo", "name multi features")
+
+
+def read_material(path):
+    """Return (shader key, keywords, invalid keywords, line) or None.
+
+    The shader key is its GUID, or "builtin:<fileID>" for built-in shaders.
+    """
+    shader = None
+    valid = set()
+    invalid = set()
+    line = None
+    target = None
+    try:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            for line_num, text in enumerate(f, 1):
+                if text.startswith(PROPERTIES_START):
+                    break
+                match = SHADER_FIELD.match(text)
+                if match:
+                    file_id, guid = match.groups()
+                    shader = guid if guid and guid != BUILTIN_SHADER_GUID \
+                        else f"builtin:{file_id}"
+                    continue
+                match = LEGACY_KEYWORDS.match(text)
+                if match:
+                    valid.update(match.group(1).split())
+                    line = line or line_num
+                    target = None
+                    continue
+                match = KEYWORD_LIST.match(text)
+                if match:
+                    target = valid if match.group(1) == "m_ValidKeywords" \
+                        else invalid
+                    line = line or line_num
+                    continue
+                match = LIST_ITEM.match(text) if target is not None else None
+                if match:
+                    target.add(match.group(1))
+                else:
+                    target = None
+    except OSError:
+        return None
+    if shader is None:
+        return None
+    return shader, frozenset(valid), frozenset(invalid), line
+
+
+def read_shader(path):
+    """ShaderInfo of a .shader source file, or None if unreadable."""
+    try:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            source = f.read()
+    except OSError:
+        return None
+    name = SHADER_NAME.search(source)
+    pragmas = {"multi_compile": [], "shader_feature": []}
+    seen = set()
+    for kind, options in KEYWORD_PRAGMA.findall(source):
+        options = tuple(options.split("//")[0].split())
+        if not options or (kind, options) in seen:
+            continue
+        seen.add((kind, options))
+        if len(options) == 1 and not NO_KEYWORD.match(options[0]):
+            # A lone keyword means "off or on"
+            options = ("_",) + options
+        pragmas[kind].append(options)
+    return ShaderInfo(name.group(1) if name else os.path.basename(path),
+                      pragmas["multi_compile"], pragmas["shader_feature"])
+
+
+def estimate_variants(info, combos):
+    """Compiled variants of a shader given the keyword sets in use.
+
+    multi_compile options multiply; shader_feature sets contribute only the
+    combinations found in combos (the all-off one at least).
+    """
+    total = 1
+    for options in info.multi:
+        total *= len(options)
+    feature_sets = [set(o) for o in info.features]
+    used = {tuple(next((k for k in keywords if k in options), None)
+                  for options in feature_sets)
+            for keywords in combos}
+    return total * max(1, len(used))
+
+
+def iter_materials(assets_dir, ctx):
+    for dirpath, _, filenames in ctx.walk(assets_dir):
+        for fname in filenames:
+            if fname.endswith(MATERIAL_EXTENSION):
+                yield os.path.join(dirpath, fname)
+
+
+def load_shaders(assets_dir, ctx, guids):
+    """Return {guid: ShaderInfo} for the .shader files among guids."""
+    shaders = {}
+    for meta_path, (guid, _) in load_meta_headers(assets_dir, ctx).items():
+        if guid in guids and meta_path.endswith(SHADER_EXTENSION + ".meta"):
+            info = read_shader(meta_path[:-5])
+            if info:
+                shaders[guid] = info
+    return shaders
+
+
+def format_keywords(keywords):
+    return " ".join(sorted(keywords)) or "(none)"
+
+
+def check_material_variants(root, report=None, ctx=None, paths=None,
+                            top=TOP_SHADERS):
+    report = report if report is not None else Report()
+    ctx = ctx or CheckContext(root)
+    assets_dir = os.path.join(root, "Assets")
+
+    if not os.path.isdir(assets_dir):
+        print("ERROR: Assets/ directory not found")
+        return 1
+
+    by_shader = defaultdict(list)
+    for path in iter_materials(assets_dir, ctx):
+        parsed = read_material(path)
+        if parsed is None:
+            continue
+        shader, keywords, invalid, line = parsed
+        rel_path = os.path.relpath(path, root).replace(os.sep, "/")
+        by_shader[shader].append(Material(rel_path, shader, keywords,
+                                          invalid, line))
+    shaders = load_shaders(assets_dir, ctx, set(by_shader))
+
+    # Watch mode re-reports only the changed materials, but the grouping
+    # always needs every material of the shader
+    wanted = None
+    if paths is not None:
+        wanted = {os.path.relpath(p, root).replace(os.sep, "/")
+                  for p in paths}
+
+    rows = []
+    for shader, materials in by_shader.items():
+        info = shaders.get(shader)
+        if info:
+            name = info.name
+        elif shader.startswith("builtin:"):
+            file_id = shader.split(":", 1)[1]
+            name = f"{BUILTIN_SHADERS.get(file_id, 'fileID ' + file_id)} " \
+                   "(built-in)"
+        else:
+            name = f"guid {shader}"
+        combos = Counter(m.keywords for m in materials)
+        variants = estimate_variants(info, combos) if info else None
+        rows.append((variants or len(combos), name, len(materials),
+                     len(combos), variants))
+
+        for m in materials:
+            if wanted is not None and m.path not in wanted:
+                continue
+            if m.invalid:
+                report.warning(m.path, f"Keywords not declared by {name}: "
+                               f"{format_keywords(m.invalid)}", m.line,
+                               rule="MATERIAL_INVALID_KEYWORDS")
+            if len(combos) > 1 and combos[m.keywords] == 1:
+                report.add("notice", m.path,
+                           f"Only material of {name} with keywords "
+                           f"{format_keywords(m.keywords)} (adds a variant)",
+                           m.line, rule="MATERIAL_UNIQUE_VARIANT")
+
+    total_materials = sum(len(m) for m in by_shader.values())
+    print(f"  Analyzed {total_materials} materials using "
+          f"{len(by_shader)} shaders")
+    if not rows:
+        return 0
+
+    rows.sort(key=lambda r: (-r[0], r[1]))
+    print(f"\nShaders by variant count (top {min(top, len(rows))}):")
+    print(f"  {'Variants':>8s} {'Combos':>6s} {'Mats':>5s}  Shader")
+    for _, name, n_materials, n_combos, variants in rows[:top]:
+        estimate = f"{variants:8d}" if variants else f"{'?':>8s}"
+        print(f"  {estimate} {n_combos:6d} {n_materials:5d}  {name}")
+    print("\n  Variants: estimated compiled variants (source in Assets/ "
+          "only); Combos: distinct keyword sets on materials")
+
+    total_combos = sum(r[3] for r in rows)
+    print(f"\n{total_combos} distinct material keyword combination(s) "
+          f"across {len(rows)} shader(s) (informational)")
+    return 0
+
+
+def main():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    root = os.path.dirname(script_dir)
+
+    parser = argparse.ArgumentParser(
+        description="Report shader keyword combinations used by materials")
+    parser.add_argument("--top", type=int, default=TOP_SHADERS,
+                        help=f"Shaders to list (default: {TOP_SHADERS})")
+    args = parser.parse_args()
+
+    if not os.path.isdir(os.path.join(root, "Assets")):
+        print(f"ERROR: Cannot find Assets/ directory from {root}")
+        return 1
+
+    print("=" * 60)
+    print("Material Keyword Variants")
+    print("=" * 60)
+
+    return check_material_variants(root, standalone_report(), top=args.top)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Check .meta headers: well-formed fileFormatVersion/guid lines, unique GUIDs.
+
+Copy-pasted folders keep their .meta files, so two assets end up sharing a
+GUID; Unity then silently assigns a new one to one of them on import and
+every reference to it re-links. Only the two header lines of each .meta are
+read, and the read is shared with the GUID reference check's index.
+"""
+
+import os
+import sys
+
+from check_guid_references import load_meta_headers
+from context import CheckContext
+from findings import Report, standalone_report
+
+# Project-owned trees; Library/PackageCache is not ours to fix
+META_ROOTS = ("Assets", "Packages")
+
+
+def check_meta_content(root, report=None, ctx=None, paths=None):
+    report = report if report is not None else Report()
+    ctx = ctx or CheckContext(root)
+
+    if not ctx.isdir(os.path.join(root, "Assets")):
+        print("ERROR: Assets/ directory not found")
+        return 1
+
+    headers = {}
+    for name in META_ROOTS:
+        search_dir = os.path.join(root, name)
+        if ctx.isdir(search_dir):
+            headers.update(load_meta_headers(search_dir, ctx))
+
+    # GUID -> first path seen; sorted so "first" is stable across runs
+    first_seen = {}
+    malformed = 0
+    duplicates = 0
+
+    for path in sorted(headers):
+        guid, problem = headers[path]
+
+        if problem:
+            line, message = problem
+            report.error(os.path.relpath(path, root), message, line=line,
+                         rule="MALFORMED_META")
+            malformed += 1
+
+        if guid is None:
+            continue
+        other = first_seen.setdefault(guid, path)
+        if other is not path:
+            other_rel = os.path.relpath(other, root).replace(os.sep, "/")
+            report.error(os.path.relpath(path, root),
+                         f"Duplicate GUID {guid} (also used by {other_rel})",
+                         line=2, rule="DUPLICATE_GUID")
+            duplicates += 1
+
+    print(f"  Read {len(headers)} .meta headers, {len(first_seen)} unique GUIDs")
+
+    if not malformed and not duplicates:
+        print("All .meta headers OK")
+    else:
+        print(f"\n{malformed} malformed .meta header(s), "
+              f"{duplicates} duplicate GUID(s)")
+
+    return 1 if malformed or duplicates else 0
+
+
+def main():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    root = os.path.dirname(script_dir)
+
+    if not os.path.isdir(os.path.join(root, "Assets")):
+        print(f"ERROR: Cannot find Assets/ directory from {root}")
+        return 1
+
+    print("=" * 60)
+    print("Meta File Content Check")
+    print("=" * 60)
+
+    return check_meta_content(root, standalone_report())
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,64 +1,69 @@
 #!/usr/bin/env python3
-"""Check that every asset file has a .meta and no orphaned .meta files exist."""
+"""Check that every asset file has a .meta and no orphaned .meta files exist.
+
+Pairing works on each directory listing with set differences (no per-file
+stat calls) and also reports case-only mismatches such as Foo.png vs
+foo.png.meta, which pair up on Windows/macOS but break on Linux CI.
+"""
 
 import os
 import sys
 
+from context import CheckContext
+from findings import Report, standalone_report
+
 SKIP_DIRS = {"Library", "Temp", "obj", "Logs", "Build", "Builds",
              "MemoryCaptures", "UserSettings", ".git", ".vs", ".vscode",
              ".idea", ".gradle", ".beads", ".claude", "ci", ".github"}
 
-GITHUB_ACTIONS = os.environ.get("GITHUB_ACTIONS") == "true"
-
-
-def annotation(level, file, msg):
-    if GITHUB_ACTIONS:
-        print(f"::{level} file={file}::{msg}")
-    else:
-        tag = "ERROR" if level == "error" else "WARN"
-        print(f"  [{tag}] {file}: {msg}")
-
 
-def check_meta_files(root):
+def check_meta_files(root, report=None, ctx=None, paths=None):
+    report = report if report is not None else Report()
+    ctx = ctx or CheckContext(root)
     assets_dir = os.path.join(root, "Assets")
-    if not os.path.isdir(assets_dir):
+    if not ctx.isdir(assets_dir):
         print("ERROR: Assets/ directory not found")
         return 1
 
     missing = []
     orphaned = []
+    mismatched = []
+
+    # With paths (watch mode), re-check just those directories, non-recursively
+    listings = ctx.walk(assets_dir) if paths is None else ctx.listings(paths)
+
+    # Pairing is pure set arithmetic on the listing the walk already returned;
+    # no per-file stat calls.
+    for dirpath, dirnames, filenames in listings:
+        all_dirs = set(dirnames)
 
-    for dirpath, dirnames, filenames in os.walk(assets_dir):
         # Skip excluded directories
         dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
 
         rel_dir = os.path.relpath(dirpath, root)
 
-        # Check that every non-meta file has a .meta
-        for fname in filenames:
-            if fname.endswith(".meta"):
-                continue
-            meta_path = os.path.join(dirpath, fname + ".meta")
-            if not os.path.exists(meta_path):
-                rel = os.path.join(rel_dir, fname)
-                missing.append(rel)
-
-        # Check that every .meta has a corresponding asset
-        for fname in filenames:
-            if not fname.endswith(".meta"):
-                continue
-            asset_name = fname[:-5]  # strip .meta
-            asset_path = os.path.join(dirpath, asset_name)
-            if not os.path.exists(asset_path) and not os.path.isdir(asset_path):
-                rel = os.path.join(rel_dir, fname)
-                orphaned.append(rel)
-
-        # Check that every subdirectory has a .meta
-        for dname in dirnames:
-            meta_path = os.path.join(dirpath, dname + ".meta")
-            if not os.path.exists(meta_path):
-                rel = os.path.join(rel_dir, dname)
-                missing.append(rel)
+        meta_stems = {f[:-5] for f in filenames if f.endswith(".meta")}
+        assets = {f for f in filenames if not f.endswith(".meta")}
+
+        # Every file and (non-skipped) subdirectory needs a .meta; every .meta
+        # needs a file or directory, skipped or not
+        missing_names = (assets | set(dirnames)) - meta_stems
+        orphan_stems = meta_stems - assets - all_dirs
+
+        # Foo.png + foo.png.meta pairs up on Windows/macOS but not on
+        # case-sensitive CI; report it once as a mismatch
+        if missing_names and orphan_stems:
+            by_lower = {stem.lower(): stem for stem in orphan_stems}
+            for name in sorted(missing_names):
+                stem = by_lower.pop(name.lower(), None)
+                if stem is not None:
+                    mismatched.append((os.path.join(rel_dir, name),
+                                       stem + ".meta"))
+                    missing_names.discard(name)
+                    orphan_stems.discard(stem)
+
+        missing.extend(os.path.join(rel_dir, n) for n in missing_names)
+        orphaned.extend(os.path.join(rel_dir, s + ".meta") for s in orphan_stems)
 
     # Report results
     errors = 0
@@ -66,17 +71,26 @@ def check_meta_files(root):
     if missing:
         print(f"\nMissing .meta files ({len(missing)}):")
         for f in sorted(missing):
-            annotation("error", f.replace("\\", "/"), "Missing .meta file")
+            report.error(f, "Missing .meta file", rule="MISSING_META")
+            errors += 1
+
+    if mismatched:
+        print(f"\nCase-mismatched .meta files ({len(mismatched)}):")
+        for f, meta_name in sorted(mismatched):
+            report.error(f, f"Case mismatch with {meta_name} (breaks on "
+                            "case-sensitive filesystems)",
+                         rule="META_CASE_MISMATCH")
             errors += 1
 
     if orphaned:
         print(f"\nOrphaned .meta files ({len(orphaned)}):")
         for f in sorted(orphaned):
-            annotation("warning", f.replace("\\", "/"), "Orphaned .meta (asset deleted but .meta remains)")
+            report.warning(f, "Orphaned .meta (asset deleted but .meta remains)",
+                           rule="ORPHANED_META")
 
-    if not missing and not orphaned:
+    if not missing and not orphaned and not mismatched:
         print("All meta files OK")
-    elif not missing:
+    elif not missing and not mismatched:
         print(f"\nNo missing metas. {len(orphaned)} orphaned meta(s) (warnings only).")
 
     return 1 if errors > 0 else 0
@@ -95,7 +109,7 @@ def main():
     print("Meta File Integrity Check")
     print("=" * 60)
 
-    return check_meta_files(root)
+    return check_meta_files(root, standalone_report())
 
 
 if __name__ == "__main__":
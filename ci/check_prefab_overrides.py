@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""Report prefab instance overrides and nesting depth in scenes and prefabs.
+
+Every PrefabInstance carries its overrides (m_Modifications plus added and
+removed components/GameObjects) in the scene or prefab that holds it, and
+Unity re-applies them on load and on Instantiate. Deeply nested prefabs
+multiply that: each level brings its own instances and overrides along.
+
+For each .unity and .prefab file this resolves every PrefabInstance
+document to its source prefab GUID, counts its overrides, and computes its
+nesting depth: 1 for an instance of a prefab with no nested prefabs, one
+more per level of prefabs inside prefabs. Instances are grouped per file and
+source prefab into hotspots ("Assets/Scenes/X.unity has 4,000 overrides
+across 200 instances of Y.prefab").
+
+Files are streamed line by line and only counts are kept. Source prefabs
+are summarized once per run no matter how many instances point at them
+(memoized on the CheckContext), and a prefab's depth is computed once from
+the summaries of the prefabs nested in it.
+"""
+
+import argparse
+import os
+import re
+import sys
+from collections import defaultdict, namedtuple
+
+from check_guid_references import load_meta_headers
+from context import CheckContext
+from findings import Report, standalone_report
+
+PREFAB_FILE_EXTENSIONS = {".unity", ".prefab"}
+
+# Warn when one file's instances of one prefab carry this many overrides
+HOTSPOT_OVERRIDES = 500
+# Warn about a single instance with this many overrides
+INSTANCE_OVERRIDES = 200
+# Warn about instances nested deeper than this
+MAX_NESTING_DEPTH = 4
+
+TOP_HOTSPOTS = 10
+
+DOCUMENT_START = re.compile(r"^--- !u!(\d+) &")
+PREFAB_INSTANCE_CLASS = "1001"
+SOURCE_PREFAB = re.compile(r"^  m_SourcePrefab: \{fileID: -?\d+, "
+                           r"guid: ([0-9a-f]{32})")
+MODIFICATION_LIST = re.compile(r"^    (m_\w+):")
+LIST_ITEM = "    - "
+# Lists inside m_Modification that count as overrides
+OVERRIDE_LISTS = {"m_Modifications", "m_RemovedComponents",
+                  "m_RemovedGameObjects", "m_AddedGameObjects",
+                  "m_AddedComponents"}
+
+# line: start of the PrefabInstance document
+PrefabInstance = namedtuple("PrefabInstance", "line source overrides")
+# instances: [PrefabInstance]; depth: nesting levels inside this prefab
+PrefabSummary = namedtuple("PrefabSummary", "path instances depth overrides")
+Hotspot = namedtuple("Hotspot", "file source instances overrides depth")
+
+
+def iter_prefab_instances(path):
+    """Yield a PrefabInstance for each PrefabInstance document in path."""
+    current = None
+    in_list = False
+    try:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            for line_num, line in enumerate(f, 1):
+                doc = DOCUMENT_START.match(line)
+                if doc:
+                    if current is not None:
+                        yield PrefabInstance(*current)
+                    in_list = False
+                    current = [line_num, None, 0] \
+                        if doc.group(1) == PREFAB_INSTANCE_CLASS else None
+                    continue
+                if current is None:
+                    continue
+                if line.startswith(LIST_ITEM):
+                    if in_list:
+                        current[2] += 1
+                    continue
+                match = MODIFICATION_LIST.match(line)
+                if match:
+                    in_list = match.group(1) in OVERRIDE_LISTS
+                    continue
+                match = SOURCE_PREFAB.match(line)
+                if match:
+                    current[1] = match.group(1)
+                    in_list = False
+    except OSError:
+        return
+    if current is not None:
+        yield PrefabInstance(*current)
+
+
+def prefab_paths(root, ctx):
+    """{GUID: path} for every .prefab in Assets/, from the .meta headers."""
+    headers = load_meta_headers(os.path.join(root, "Assets"), ctx)
+    return {guid: meta[:-5] for meta, (guid, _) in headers.items()
+            if guid and meta.endswith(".prefab.meta")}
+
+
+def load_prefab_summaries(root, ctx):
+    """Memoized resolver GUID -> PrefabSummary (None for unknown GUIDs).
+
+    Each prefab file is read at most once per CheckContext; depths of
+    nested prefabs are resolved recursively through the same cache.
+    """
+    def build():
+        paths = prefab_paths(root, ctx)
+        cache = {}
+        resolving = set()
+
+        def summarize(guid):
+            if guid in cache:
+                return cache[guid]
+            path = paths.get(guid)
+            if path is None or guid in resolving:
+                # Unknown (package) prefab, or a reference cycle
+                return None
+            resolving.add(guid)
+            instances = list(iter_prefab_instances(path))
+            depth = 0
+            overrides = 0
+            for inst in instances:
+                nested = summarize(inst.source) if inst.source else None
+                depth = max(depth, 1 + (nested.depth if nested else 0))
+                overrides += inst.overrides + (nested.overrides
+                                               if nested else 0)
+            resolving.discard(guid)
+            cache[guid] = PrefabSummary(path, instances, depth, overrides)
+            return cache[guid]
+
+        return summarize
+
+    return ctx.memo("prefab_summaries", build)
+
+
+def iter_prefab_files(assets_dir, ctx, paths=None):
+    if paths is not None:
+        for path in paths:
+            if (os.path.splitext(path)[1] in PREFAB_FILE_EXTENSIONS
+                    and os.path.isfile(path)):
+                yield path
+        return
+    for dirpath, _, filenames in ctx.walk(assets_dir):
+        for fname in filenames:
+            if os.path.splitext(fname)[1] in PREFAB_FILE_EXTENSIONS:
+                yield os.path.join(dirpath, fname)
+
+
+def check_prefab_overrides(root, report=None, ctx=None, paths=None,
+                           top=TOP_HOTSPOTS):
+    report = report if report is not None else Report()
+    ctx = ctx or CheckContext(root)
+    assets_dir = os.path.join(root, "Assets")
+
+    if not os.path.isdir(assets_dir):
+        print("ERROR: Assets/ directory not found")
+        return 1
+
+    summarize = load_prefab_summaries(root, ctx)
+    headers = load_meta_headers(assets_dir, ctx)
+
+    def rel(path):
+        return os.path.relpath(path, root).replace(os.sep, "/")
+
+    def source_name(guid):
+        summary = summarize(guid) if guid else None
+        return rel(summary.path) if summary else f"prefab {guid}"
+
+    files = 0
+    total_instances = total_overrides = 0
+    hotspots = []
+    for path in iter_prefab_files(assets_dir, ctx, paths):
+        rel_path = rel(path)
+        # A prefab's instances come from its (memoized) summary, so each
+        # prefab file is parsed once however it is reached
+        guid = headers.get(path + ".meta", (None, None))[0] \
+            if path.endswith(".prefab") else None
+        summary = summarize(guid) if guid else None
+        groups = defaultdict(list)
+        for inst in (summary.instances if summary is not None
+                     else iter_prefab_instances(path)):
+            groups[inst.source].append(inst)
+        if not groups:
+            continue
+        files += 1
+
+        for source, instances in groups.items():
+            summary = summarize(source) if source else None
+            depth = 1 + (summary.depth if summary else 0)
+            overrides = sum(i.overrides for i in instances)
+            total_instances += len(instances)
+            total_overrides += overrides
+            hotspots.append(Hotspot(rel_path, source, len(instances),
+                                    overrides, depth))
+            name = source_name(source)
+
+            for inst in instances:
+                if inst.overrides >= INSTANCE_OVERRIDES:
+                    report.warning(rel_path, f"Instance of {name} has "
+                                   f"{inst.overrides} overrides", inst.line,
+                                   rule="PREFAB_INSTANCE_OVERRIDES")
+            if overrides >= HOTSPOT_OVERRIDES and len(instances) > 1:
+                report.warning(rel_path, f"{overrides:,} overrides across "
+                               f"{len(instances)} instances of {name}",
+                               instances[0].line,
+                               rule="PREFAB_OVERRIDE_HOTSPOT")
+            if depth > MAX_NESTING_DEPTH:
+                report.warning(rel_path, f"Instance of {name} is nested "
+                               f"{depth} levels deep (limit "
+                               f"{MAX_NESTING_DEPTH})", instances[0].line,
+                               rule="PREFAB_NESTING_DEPTH")
+
+    print(f"  {total_instances} prefab instance(s) in {files} file(s), "
+          f"{total_overrides:,} override(s)")
+    if not hotspots:
+        return 0
+
+    hotspots.sort(key=lambda h: (-h.overrides, h.file, h.source or ""))
+    print(f"\nOverride hotspots (top {min(top, len(hotspots))}):")
+    print(f"  {'Overrides':>9s} {'Inst':>5s} {'Depth':>5s}  File <- prefab")
+    for h in hotspots[:top]:
+        print(f"  {h.overrides:9,d} {h.instances:5d} {h.depth:5d}  "
+              f"{h.file} <- {source_name(h.source)}")
+
+    deepest = max(hotspots, key=lambda h: h.depth)
+    print(f"\nDeepest nesting: {deepest.depth} level(s) "
+          f"({deepest.file} <- {source_name(deepest.source)})")
+    return 0
+
+
+def main():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    root = os.path.dirname(script_dir)
+
+    parser = argparse.ArgumentParser(
+        description="Report prefab instance overrides and nesting depth")
+    parser.add_argument("--top", type=int, default=TOP_HOTSPOTS,
+                        help=f"Hotspots to list (default: {TOP_HOTSPOTS})")
+    args = parser.parse_args()
+
+    if not os.path.isdir(os.path.join(root, "Assets")):
+        print(f"ERROR: Cannot find Assets/ directory from {root}")
+        return 1
+
+    print("=" * 60)
+    print("Prefab Overrides")
+    print("=" * 60)
+
+    return check_prefab_overrides(root, standalone_report(), top=args.top)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
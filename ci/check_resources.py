@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+"""Audit what Resources/ puts into the build against what code loads.
+
+Everything inside a Resources folder ships, and is listed in the resource
+index read at startup, whether or not anything loads it. Its dependencies
+ship with it. This check follows the GUID references from every asset in
+Assets/_Project/Resources to the full set of assets it pulls into the build,
+and totals the bytes by asset type. Textures are counted at their estimated
+runtime size from the import settings, everything else at its size on disk.
+
+It then collects the `Resources.Load`/`LoadAll`/`LoadAsync` calls in the
+runtime C# code (Editor folders excluded) and matches their string paths
+against the contents of every Resources folder in Assets/:
+
+    Load("Jobs/Mage")            the asset at that path, whatever its type
+    LoadAll<SkillData>("Skills") assets of that type in and below Skills/
+    Load($"Equipment/{id}")      assets of that type whose path starts with
+                                 the literal prefix, "Equipment/"
+    Load("Equipment/" + id)      the same
+
+Type filters use the file extension for Unity types (Texture2D, GameObject,
+AudioClip, ...) and the script class, including subclasses, for
+ScriptableObjects. Assets whose script is outside Assets/ (package types)
+match any script type.
+
+Findings, for assets under Assets/_Project/Resources:
+    RESOURCES_UNLOADED         nothing loads it by path and no loaded asset
+                               references it (warning)
+    RESOURCES_DEPENDENCY_ONLY  only reached through loaded assets; it ships
+                               anyway and does not need to be in Resources
+                               (notice)
+    RESOURCES_OVERSIZED        it and its dependencies exceed
+                               OVERSIZED_BYTES (warning)
+and RESOURCES_LOAD_MISSING for a literal Load path that matches nothing.
+
+Paths built any other way (string constants, variables) are not seen, so
+assets loaded that way are reported as unloaded; add them to the baseline.
+"""
+
+import argparse
+import os
+import re
+import sys
+from collections import defaultdict, namedtuple
+
+from check_guid_references import load_meta_headers
+from check_texture_import import (TEXTURE_EXTENSIONS, estimate_bytes,
+                                  format_kb, load_texture_settings)
+from context import CheckContext
+from findings import Report, standalone_report
+from image_index import load_image_index
+from serialized_scan import SERIALIZED_EXTENSIONS, get_scan, \
+    load_serialized_scans
+from symbol_index import load_symbol_index, main_class, strip_literals
+
+RESOURCES_DIR = os.path.join("Assets", "_Project", "Resources")
+RESOURCES_FOLDER = "Resources"
+SCRIPTS_ROOT = os.path.join("Assets", "_Project")
+
+# One Resources asset plus its dependencies above this is flagged
+OVERSIZED_BYTES = 1024 * 1024
+
+# Matched on strip_literals() output: the path is a "#<n>" placeholder
+LOAD_CALL = re.compile(
+    r"\bResources\.(Load|LoadAll|LoadAsync)\s*(?:<\s*([\w.]+)\s*>)?"
+    r"\s*\(\s*(\$?)\"#(\d+)\"\s*(\+)?")
+
+AUDIO_EXTENSIONS = {".wav", ".mp3", ".ogg", ".aif", ".aiff"}
+TEXT_EXTENSIONS = {".txt", ".json", ".bytes", ".csv", ".xml", ".html"}
+
+# Unity types a load can ask for, by the extensions that import as them
+UNITY_TYPE_EXTENSIONS = {
+    "Texture": TEXTURE_EXTENSIONS,
+    "Texture2D": TEXTURE_EXTENSIONS,
+    "Sprite": TEXTURE_EXTENSIONS,
+    "GameObject": {".prefab"},
+    "Material": {".mat"},
+    "Shader": {".shader"},
+    "AudioClip": AUDIO_EXTENSIONS,
+    "TextAsset": TEXT_EXTENSIONS,
+    "AnimationClip": {".anim"},
+    "RuntimeAnimatorController": {".controller", ".overrideController"},
+    "Font": {".ttf", ".otf"},
+    "Mesh": {".fbx", ".obj", ".asset"},
+}
+# Types every asset satisfies
+ANY_TYPES = {None, "Object", "UnityEngine.Object"}
+
+TYPE_LABELS = [
+    (TEXTURE_EXTENSIONS, "Texture"),
+    ({".prefab"}, "Prefab"),
+    ({".asset"}, "Asset"),
+    ({".mat"}, "Material"),
+    ({".shader"}, "Shader"),
+    (AUDIO_EXTENSIONS, "Audio"),
+    ({".anim", ".controller", ".overrideController"}, "Animation"),
+    ({".ttf", ".otf"}, "Font"),
+    ({".fbx", ".obj"}, "Model"),
+    (TEXT_EXTENSIONS, "Text"),
+]
+
+# kind: "exact", "folder" (LoadAll) or "prefix" (built at runtime)
+Load = namedtuple("Load", "file line kind type path")
+
+
+def type_label(path):
+    ext = os.path.splitext(path)[1].lower()
+    for extensions, label in TYPE_LABELS:
+        if ext in extensions:
+            return label
+    return ext.lstrip(".") or "other"
+
+
+def format_mb(num_bytes):
+    return f"{num_bytes / (1024 * 1024):,.1f} MB"
+
+
+def find_loads(root, ctx):
+    """Return [Load] for every Resources load with a string literal path."""
+    loads = []
+    scripts_dir = os.path.join(root, SCRIPTS_ROOT)
+    for dirpath, dirnames, filenames in ctx.walk(scripts_dir):
+        dirnames[:] = [d for d in dirnames if d != "Editor"]
+        for fname in filenames:
+            if not fname.endswith(".cs"):
+                continue
+            path = os.path.join(dirpath, fname)
+            try:
+                with open(path, encoding="utf-8-sig", errors="replace") as f:
+                    source = f.read()
+            except OSError:
+                continue
+            rel_path = os.path.relpath(path, root).replace(os.sep, "/")
+            code, strings = strip_literals(source)
+            for match in LOAD_CALL.finditer(code):
+                method, type_name, interpolated, index, concat = \
+                    match.groups()
+                text = strings[int(index)]
+                if interpolated and "{" in text:
+                    kind, text = "prefix", text.split("{", 1)[0]
+                elif concat:
+                    kind = "prefix"
+                else:
+                    kind = "folder" if method == "LoadAll" else "exact"
+                line = code.count("\n", 0, match.start()) + 1
+                loads.append(Load(rel_path, line, kind, type_name,
+                                  text.strip("/") if kind != "prefix"
+                                  else text.lstrip("/")))
+    return loads
+
+
+def iter_resources(root, ctx):
+    """Yield (abs path, Resources-relative key without extension)."""
+    assets_dir = os.path.join(root, "Assets")
+    for dirpath, dirnames, _ in ctx.walk(assets_dir):
+        dirnames[:] = [d for d in dirnames if d != "Editor"]
+        if os.path.basename(dirpath) != RESOURCES_FOLDER:
+            continue
+        for sub, _, filenames in ctx.walk(dirpath):
+            for fname in filenames:
+                if fname.endswith(".meta"):
+                    continue
+                path = os.path.join(sub, fname)
+                key = os.path.splitext(os.path.relpath(path, dirpath))[0]
+                yield path, key.replace(os.sep, "/")
+
+
+def script_classes(root, ctx):
+    """{script guid: set of the class name and its base class names}."""
+    symbols = load_symbol_index(root, ctx)
+    bases = {}
+    for script in symbols.values():
+        for info in script.classes:
+            bases.setdefault(info.name, info.base)
+    lineage = {}
+    for guid, script in symbols.items():
+        info = main_class(script)
+        if info is None:
+            continue
+        names = set()
+        name = info.name
+        while name and name not in names:
+            names.add(name)
+            name = (bases.get(name) or "").rsplit(".", 1)[-1] or None
+        lineage[guid] = names
+    return lineage
+
+
+def matches_type(type_name, path, scans, lineage):
+    """Whether a LoadAll<type_name> would return the asset at path."""
+    if type_name in ANY_TYPES:
+        return True
+    type_name = type_name.rsplit(".", 1)[-1]
+    ext = os.path.splitext(path)[1].lower()
+    if type_name in UNITY_TYPE_EXTENSIONS:
+        return ext in UNITY_TYPE_EXTENSIONS[type_name]
+    if ext == ".prefab":
+        # Component types load through the prefab that carries them
+        return True
+    if ext != ".asset":
+        return False
+    scan = get_scan(scans, path)
+    if not scan.scripts:
+        return False
+    classes = lineage.get(scan.scripts[0][1])
+    return classes is None or type_name in classes
+
+
+def resolve_load(load, resources, scans, lineage):
+    """Return the Resources asset paths a load can return."""
+    found = []
+    for path, key in resources:
+        if load.kind == "exact":
+            hit = key == load.path
+        elif load.kind == "folder":
+            hit = not load.path or key.startswith(load.path + "/")
+        else:
+            hit = key.startswith(load.path)
+        if not hit:
+            continue
+        if load.kind != "exact" and not matches_type(
+                load.type, path, scans, lineage):
+            continue
+        found.append(path)
+    return found
+
+
+def check_resources(root, report=None, ctx=None, paths=None):
+    report = report if report is not None else Report()
+    ctx = ctx or CheckContext(root)
+    assets_dir = os.path.join(root, "Assets")
+    audit_dir = os.path.join(root, RESOURCES_DIR)
+
+    if not os.path.isdir(assets_dir):
+        print("ERROR: Assets/ directory not found")
+        return 1
+    if not ctx.isdir(audit_dir):
+        print(f"  No {RESOURCES_DIR} directory, nothing to audit")
+        return 0
+
+    prefix = len(os.path.join(root, ""))
+
+    def rel(path):
+        return path[prefix:].replace(os.sep, "/")
+
+    guid_paths = {guid: meta[:-5] for meta, (guid, _)
+                  in load_meta_headers(assets_dir, ctx).items() if guid}
+    scans = load_serialized_scans(root, ctx)
+    images = load_image_index(root, ctx)
+    deps_cache = {}
+    size_cache = {}
+
+    def dependencies(path):
+        """Asset paths path references directly (scripts excluded)."""
+        if path not in deps_cache:
+            deps = set()
+            if os.path.splitext(path)[1] in SERIALIZED_EXTENSIONS:
+                for _, guid in get_scan(scans, path).guids:
+                    target = guid_paths.get(guid)
+                    if target and target != path and \
+                            not target.endswith(".cs") and \
+                            os.path.isfile(target):
+                        deps.add(target)
+            deps_cache[path] = deps
+        return deps_cache[path]
+
+    def closure(path):
+        seen = {path}
+        stack = [path]
+        while stack:
+            for dep in dependencies(stack.pop()):
+                if dep not in seen:
+                    seen.add(dep)
+                    stack.append(dep)
+        return seen
+
+    def size_of(path):
+        if path not in size_cache:
+            size = 0
+            ext = os.path.splitext(path)[1].lower()
+            settings = load_texture_settings(path + ".meta", ctx) \
+                if ext in TEXTURE_EXTENSIONS else None
+            info = images.get(rel(path)) if settings else None
+            if settings:
+                size = estimate_bytes(settings, settings["max_size"],
+                                      (info.width, info.height)
+                                      if info else None)
+            else:
+                try:
+                    size = os.path.getsize(path)
+                except OSError:
+                    pass
+            size_cache[path] = size
+        return size_cache[path]
+
+    resources = list(iter_resources(root, ctx))
+    audited = [path for path, _ in resources
+               if path.startswith(os.path.join(audit_dir, ""))]
+    lineage = script_classes(root, ctx)
+
+    loaded = set()
+    for load in find_loads(root, ctx):
+        found = resolve_load(load, resources, scans, lineage)
+        loaded.update(found)
+        if not found and load.kind == "exact":
+            report.warning(load.file, f'Resources.Load path "{load.path}" '
+                           "matches no asset in a Resources folder",
+                           load.line, rule="RESOURCES_LOAD_MISSING")
+
+    reached = set()
+    for path in loaded:
+        reached |= closure(path) - {path}
+
+    shipped = set()
+    for path in audited:
+        deps = closure(path)
+        shipped |= deps
+        total = sum(size_of(p) for p in deps)
+        rel_path = rel(path)
+        if total >= OVERSIZED_BYTES:
+            report.warning(rel_path, f"Pulls {format_kb(total)} into the "
+                           f"build ({len(deps)} asset(s), limit "
+                           f"{format_kb(OVERSIZED_BYTES)})",
+                           rule="RESOURCES_OVERSIZED")
+        if path in loaded:
+            continue
+        if path in reached:
+            report.add("notice", rel_path, "Only referenced by other "
+                       "Resources content; it does not need to be in "
+                       "Resources", rule="RESOURCES_DEPENDENCY_ONLY")
+        else:
+            report.warning(rel_path, "Not loaded by any Resources.Load path "
+                           "in code and not referenced by loaded content",
+                           rule="RESOURCES_UNLOADED")
+
+    by_type = defaultdict(lambda: [0, 0])
+    for path in shipped:
+        row = by_type[type_label(path)]
+        row[0] += 1
+        row[1] += size_of(path)
+    total = sum(row[1] for row in by_type.values())
+    print(f"  {len(audited)} asset(s) in {RESOURCES_DIR.replace(os.sep, '/')}"
+          f" ship {len(shipped)} asset(s), {format_mb(total)}")
+    print(f"  {len(loaded & set(audited))} loaded by code, "
+          f"{len(set(audited) & reached - loaded)} only as dependencies")
+
+    if by_type:
+        print(f"\n  {'Type':<12s} {'Assets':>6s} {'Size':>11s}")
+        for label, (count, size) in sorted(by_type.items(),
+                                           key=lambda r: -r[1][1]):
+            print(f"  {label:<12s} {count:6d} {format_mb(size):>11s}")
+    return 0
+
+
+def main():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    root = os.path.dirname(script_dir)
+
+    argparse.ArgumentParser(
+        description="Audit Resources/ contents against Resources.Load "
+                    "calls").parse_args()
+
+    if not os.path.isdir(os.path.join(root, "Assets")):
+        print(f"ERROR: Cannot find Assets/ directory from {root}")
+        return 1
+
+    print("=" * 60)
+    print("Resources Footprint")
+    print("=" * 60)
+
+    return check_resources(root, standalone_report())
+
+
+if __name__ == "__main__":
+    sys.exit(main())
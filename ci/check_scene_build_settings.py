@@ -5,7 +5,7 @@ import os
 import re
 import sys
 
-GITHUB_ACTIONS = os.environ.get("GITHUB_ACTIONS") == "true"
+from findings import Report, standalone_report
 
 SCENE_ENTRY_PATTERN = re.compile(
     r"path:\s*(.+\.unity)\s*\n\s*guid:\s*([0-9a-f]{32})",
@@ -13,15 +13,9 @@ SCENE_ENTRY_PATTERN = re.compile(
 META_GUID_PATTERN = re.compile(r"^guid:\s*([0-9a-f]{32})", re.MULTILINE)
 
 
-def annotation(level, file, msg):
-    if GITHUB_ACTIONS:
-        print(f"::{level} file={file}::{msg}")
-    else:
-        tag = "ERROR" if level == "error" else "WARN"
-        print(f"  [{tag}] {file}: {msg}")
-
-
-def check_scene_build_settings(root):
+def check_scene_build_settings(root, report=None, ctx=None,
+                               paths=None):
+    report = report if report is not None else Report()
     settings_path = os.path.join(root, "ProjectSettings", "EditorBuildSettings.asset")
     if not os.path.exists(settings_path):
         print("ERROR: ProjectSettings/EditorBuildSettings.asset not found")
@@ -63,15 +57,17 @@ def check_scene_build_settings(root):
 
         # Check scene file exists
         if not os.path.exists(full_path):
-            annotation("error", settings_rel,
-                       f'Build scene not found on disk: {scene_path}')
+            report.error(settings_rel,
+                         f'Build scene not found on disk: {scene_path}',
+                         rule="SCENE_MISSING")
             errors += 1
             continue
 
         # Check .meta exists
         if not os.path.exists(meta_path):
-            annotation("error", settings_rel,
-                       f'Scene .meta file missing: {scene_path}.meta')
+            report.error(settings_rel,
+                         f'Scene .meta file missing: {scene_path}.meta',
+                         rule="SCENE_META_MISSING")
             errors += 1
             continue
 
@@ -81,14 +77,16 @@ def check_scene_build_settings(root):
 
         match = META_GUID_PATTERN.search(meta_content)
         if not match:
-            annotation("error", settings_rel,
-                       f'Cannot read GUID from {scene_path}.meta')
+            report.error(settings_rel,
+                         f'Cannot read GUID from {scene_path}.meta',
+                         rule="SCENE_GUID_UNREADABLE")
             errors += 1
         elif match.group(1) != expected_guid:
-            annotation("error", settings_rel,
-                       f'GUID mismatch for {scene_path}: '
-                       f'build settings has {expected_guid}, '
-                       f'.meta has {match.group(1)}')
+            report.error(settings_rel,
+                         f'GUID mismatch for {scene_path}: '
+                         f'build settings has {expected_guid}, '
+                         f'.meta has {match.group(1)}',
+                         rule="SCENE_GUID_MISMATCH")
             errors += 1
         else:
             print(f"    GUID OK: {expected_guid}")
@@ -113,7 +111,7 @@ def main():
     print("Build Scene Validation")
     print("=" * 60)
 
-    return check_scene_build_settings(root)
+    return check_scene_build_settings(root, standalone_report())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""Cross-check scripts attached in scenes/prefabs against the C# symbol index.
+
+  - SCRIPT_CLASS_MISMATCH: an attached script's file declares no class named
+    like the file, so Unity shows "The associated script can not be loaded"
+  - STALE_SERIALIZED_FIELD: serialized data for a field the class no longer
+    has (renamed without [FormerlySerializedAs], or deleted); the value is
+    silently dropped on the next save
+  - UNUSED_MONOBEHAVIOUR: a concrete MonoBehaviour no scene or prefab uses
+    and no code attaches with AddComponent<T>/typeof(T)
+
+Both sides come from caches shared with other checks: m_Script blocks from
+the serialized pass, classes and fields from symbol_index.
+"""
+
+import os
+import sys
+
+from context import CheckContext
+from findings import Report, standalone_report
+from serialized_scan import load_serialized_scans
+from symbol_index import load_symbol_index, main_class
+
+# Files whose m_Script references count as "using" a MonoBehaviour
+USAGE_EXTENSIONS = {".unity", ".prefab"}
+
+# Unity base types whose own serialized fields live in m_ keys we skip
+UNITY_ROOTS = {"MonoBehaviour", "ScriptableObject", "StateMachineBehaviour"}
+
+
+def classes_by_name(index):
+    return {info.name: info
+            for symbols in index.values() for info in symbols.classes}
+
+
+def serialized_fields(info, by_name):
+    """Fields and aliases of a class including inherited ones.
+
+    Returns None when the chain reaches a base we have no source for (a
+    package or engine type other than UNITY_ROOTS): its fields are unknown.
+    """
+    fields = set()
+    seen = set()
+    while info is not None and info.name not in seen:
+        seen.add(info.name)
+        fields.update(info.fields)
+        fields.update(info.aliases)
+        if info.base is None or info.base in UNITY_ROOTS:
+            return fields
+        info = by_name.get(info.base)
+    return None
+
+
+def inherits(info, root_name, by_name):
+    seen = set()
+    while info is not None and info.name not in seen:
+        seen.add(info.name)
+        if info.base == root_name:
+            return True
+        info = by_name.get(info.base)
+    return False
+
+
+def check_script_references(root, report=None, ctx=None, paths=None):
+    """Always checks everything: usage is a whole-project property, and both
+    inputs are memoized, so a re-run in watch mode is cheap."""
+    report = report if report is not None else Report()
+    ctx = ctx or CheckContext(root)
+
+    if not os.path.isdir(os.path.join(root, "Assets")):
+        print("ERROR: Assets/ directory not found")
+        return 1
+
+    index = load_symbol_index(root, ctx)
+    scans = load_serialized_scans(root, ctx)
+    by_name = classes_by_name(index)
+    print(f"  Indexed {len(index)} scripts, {len(by_name)} classes")
+
+    errors = 0
+    warnings = 0
+    used = set()
+    attached = 0
+
+    for path in sorted(scans):
+        scripts = scans[path].scripts
+        if not scripts:
+            continue
+        rel_path = os.path.relpath(path, root).replace(os.sep, "/")
+        is_usage = os.path.splitext(path)[1].lower() in USAGE_EXTENSIONS
+        reported = set()
+
+        for line_num, guid, keys in scripts:
+            symbols = index.get(guid)
+            if symbols is None:
+                # Package/third-party script, or missing (GUID check's job)
+                continue
+            attached += 1
+            if is_usage:
+                used.add(guid)
+
+            info = main_class(symbols)
+            if info is None:
+                if guid not in reported:
+                    reported.add(guid)
+                    stem = os.path.splitext(os.path.basename(symbols.path))[0]
+                    report.error(rel_path,
+                                 f"{symbols.path} declares no class named "
+                                 f"{stem}; Unity cannot load the script",
+                                 line_num, rule="SCRIPT_CLASS_MISMATCH")
+                    errors += 1
+                continue
+
+            fields = serialized_fields(info, by_name)
+            if fields is None:
+                continue
+            for key_line, key in keys:
+                if key not in fields:
+                    report.warning(rel_path,
+                                   f'Serialized field "{key}" no longer '
+                                   f"exists on {info.name}", key_line,
+                                   rule="STALE_SERIALIZED_FIELD")
+                    warnings += 1
+
+    print(f"  Checked {attached} attached project scripts")
+
+    attached_by_code = {name.rsplit(".", 1)[-1] for symbols in index.values()
+                        for name in symbols.type_refs}
+    base_names = {info.base for info in by_name.values()}
+    unused = []
+    for guid, symbols in index.items():
+        if guid in used or "/Editor/" in symbols.path:
+            continue
+        info = main_class(symbols)
+        if (info is None or info.abstract or info.name in attached_by_code
+                or info.name in base_names
+                or not inherits(info, "MonoBehaviour", by_name)):
+            continue
+        unused.append((symbols.path, info))
+
+    for rel_path, info in sorted(unused):
+        report.warning(rel_path, f"MonoBehaviour {info.name} is not used by "
+                                 "any scene or prefab", info.line,
+                       rule="UNUSED_MONOBEHAVIOUR")
+        warnings += 1
+
+    if errors:
+        print(f"\n{errors} script reference error(s), {warnings} warning(s)")
+    elif warnings:
+        print(f"\nNo errors. {warnings} warning(s).")
+    else:
+        print("\nAll script references OK")
+
+    return 1 if errors else 0
+
+
+def main():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    root = os.path.dirname(script_dir)
+
+    if not os.path.isdir(os.path.join(root, "Assets")):
+        print(f"ERROR: Cannot find Assets/ directory from {root}")
+        return 1
+
+    print("=" * 60)
+    print("Script Reference Check")
+    print("=" * 60)
+
+    return check_script_references(root, standalone_report())
+
+
+if __name__ == "__main__":
+    sys.exit(main())
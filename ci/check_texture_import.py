@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""Audit texture import settings in .meta files against per-folder policies.
+
+Wrong TextureImporter settings (mipmaps on UI sprites, Read/Write enabled,
+oversized max size, uncompressed formats) inflate build size and VRAM.
+Each texture's .meta is streamed only up to its spriteSheet: block, and a
+single regex pulls out the handful of keys the policies look at, so the
+whole icon library is audited in a couple of seconds.
+
+Findings are warnings with an estimated memory cost per violation. PNG and
+JPEG costs use the real dimensions from image_index (header reads only);
+other formats fall back to a square at the effective max size.
+"""
+
+import fnmatch
+import os
+import re
+import sys
+
+from context import CheckContext
+from findings import Report, standalone_report
+from image_index import IMAGE_EXTENSIONS, load_image_index, read_image_header
+
+TEXTURE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".tga", ".psd", ".bmp",
+                      ".gif", ".tif", ".tiff", ".exr", ".hdr"}
+
+# Policies by project-relative glob; the first match wins, so list the most
+# specific folders first. Keys (all optional):
+#   sprite      textureType must be Sprite (2D and UI)
+#   mipmaps     whether mipmaps may be generated
+#   max_size    upper bound for the effective max texture size
+#   readable    whether Read/Write may be enabled
+#   compressed  whether the texture must use a compressed format
+#   dimensions  exact source size (width, height) the art must be authored at
+POLICIES = [
+    ("Assets/_Project/Art/UI/Icons/Skills/**",
+     {"sprite": True, "mipmaps": False, "max_size": 128, "readable": False,
+      "compressed": True, "dimensions": (128, 128)}),
+    ("Assets/_Project/Art/UI/**",
+     {"sprite": True, "mipmaps": False, "readable": False}),
+    ("Assets/_Project/Art/Sprites/**",
+     {"sprite": True, "mipmaps": False, "max_size": 2048,
+      "readable": False}),
+    ("Assets/_Project/**",
+     {"readable": False, "max_size": 2048}),
+]
+
+TEXTURE_TYPE_SPRITE = "8"
+# Platform whose override (if any) decides the shipped settings
+BUILD_PLATFORM = "Standalone"
+
+# Only the keys the policies need; buildTarget/overridden delimit the
+# per-platform blocks under platformSettings:
+IMPORTER_KEYS = re.compile(
+    rb"^ {2,4}(enableMipMap|isReadable|maxTextureSize|textureType|"
+    rb"textureCompression|buildTarget|overridden): *(-?\w*)", re.M)
+SPRITE_SHEET_MARKER = b"\n  spriteSheet:"
+HEAD_CHUNK = 8192
+
+
+def read_texture_settings(meta_path):
+    """Return the effective import settings of a texture .meta, or None.
+
+    Keys: sprite, mipmaps, readable (bools), max_size (int), compressed
+    (bool). Platform overrides for BUILD_PLATFORM win over the defaults.
+    """
+    try:
+        with open(meta_path, "rb") as f:
+            head = f.read(HEAD_CHUNK)
+            # The sprite table that follows can be huge; stop before it
+            while SPRITE_SHEET_MARKER not in head:
+                chunk = f.read(HEAD_CHUNK)
+                if not chunk:
+                    break
+                head += chunk
+    except OSError:
+        return None
+
+    end = head.find(SPRITE_SHEET_MARKER)
+    if end >= 0:
+        head = head[:end]
+    if b"TextureImporter:" not in head:
+        return None
+
+    top = {}
+    platforms = {}
+    current = None
+    for key, value in IMPORTER_KEYS.findall(head):
+        if key == b"buildTarget":
+            current = platforms.setdefault(value.decode(), {})
+        elif current is not None:
+            current[key] = value
+        else:
+            top.setdefault(key, value)
+
+    default = platforms.get("DefaultTexturePlatform", {})
+    platform = platforms.get(BUILD_PLATFORM, {})
+    shipped = platform if platform.get(b"overridden") == b"1" else default
+
+    max_size = shipped.get(b"maxTextureSize") or top.get(b"maxTextureSize")
+    compression = shipped.get(b"textureCompression",
+                              top.get(b"textureCompression", b"1"))
+    return {
+        "sprite": top.get(b"textureType", b"").decode() == TEXTURE_TYPE_SPRITE,
+        "mipmaps": top.get(b"enableMipMap") == b"1",
+        "readable": top.get(b"isReadable") == b"1",
+        "max_size": int(max_size) if max_size else 2048,
+        "compressed": compression != b"0",
+    }
+
+
+def load_texture_settings(meta_path, ctx):
+    """read_texture_settings() memoized per .meta on the context."""
+    settings = ctx.memo("texture_settings", dict)
+    if meta_path not in settings:
+        settings[meta_path] = read_texture_settings(meta_path)
+    return settings[meta_path]
+
+
+def policy_for(rel_path):
+    for pattern, policy in POLICIES:
+        if fnmatch.fnmatchcase(rel_path, pattern):
+            return policy
+    return None
+
+
+def estimate_bytes(settings, size, dims=None):
+    """Rough runtime memory for a texture imported at the given max size.
+
+    dims is the source (width, height); Unity scales the longer side down
+    to size, never up. Without dims a size x size square is assumed.
+    Compressed formats (DXT5/BC7) take ~1 byte per pixel, RGBA32 takes 4,
+    a mip chain adds a third, and Read/Write keeps a CPU-side RGBA32 copy.
+    """
+    if dims:
+        width, height = dims
+        scale = min(1.0, size / max(width, height, 1))
+        pixels = int(width * scale) * int(height * scale)
+    else:
+        pixels = size * size
+    gpu = pixels * (1 if settings["compressed"] else 4)
+    if settings["mipmaps"]:
+        gpu = gpu * 4 // 3
+    cpu = pixels * 4 if settings["readable"] else 0
+    return gpu + cpu
+
+
+def format_kb(num_bytes):
+    return f"{num_bytes / 1024:,.0f} KB"
+
+
+def audit_texture(settings, policy, dims=None):
+    """Yield (rule, message, excess_bytes) for each policy violation.
+
+    The cost of each violation is the memory saved by fixing that setting
+    alone, at the real source dimensions when known, else at the effective
+    max size (an upper bound).
+    """
+    size = settings["max_size"]
+    cost = estimate_bytes(settings, size, dims)
+
+    if policy.get("sprite") and not settings["sprite"]:
+        yield ("TEXTURE_TYPE", "Texture type should be Sprite (2D and UI)", 0)
+
+    if "mipmaps" in policy and settings["mipmaps"] and not policy["mipmaps"]:
+        fixed = estimate_bytes(dict(settings, mipmaps=False), size, dims)
+        yield ("TEXTURE_MIPMAPS", "Mipmaps enabled (policy: off)",
+               cost - fixed)
+
+    limit = policy.get("max_size")
+    if limit and size > limit:
+        fixed = estimate_bytes(settings, limit, dims)
+        yield ("TEXTURE_MAX_SIZE",
+               f"Max size {size} exceeds policy {limit}", cost - fixed)
+
+    if "readable" in policy and settings["readable"] and not policy["readable"]:
+        fixed = estimate_bytes(dict(settings, readable=False), size, dims)
+        yield ("TEXTURE_READABLE", "Read/Write enabled (policy: off)",
+               cost - fixed)
+
+    if policy.get("compressed") and not settings["compressed"]:
+        fixed = estimate_bytes(dict(settings, compressed=True), size, dims)
+        yield ("TEXTURE_COMPRESSION", "Uncompressed format (policy: "
+                                      "compressed)", cost - fixed)
+
+    expected = policy.get("dimensions")
+    if expected and dims and tuple(dims) != tuple(expected):
+        yield ("TEXTURE_DIMENSIONS",
+               f"Source is {dims[0]}x{dims[1]} (policy: "
+               f"{expected[0]}x{expected[1]})", 0)
+
+
+def iter_textures(assets_dir, ctx, paths=None):
+    """Yield texture files that have a .meta next to them."""
+    if paths is not None:
+        for path in paths:
+            if (os.path.splitext(path)[1].lower() in TEXTURE_EXTENSIONS
+                    and os.path.isfile(path + ".meta")):
+                yield path
+        return
+
+    for dirpath, _, filenames in ctx.walk(assets_dir):
+        names = set(filenames)
+        for fname in filenames:
+            if (os.path.splitext(fname)[1].lower() in TEXTURE_EXTENSIONS
+                    and fname + ".meta" in names):
+                yield os.path.join(dirpath, fname)
+
+
+def check_texture_import(root, report=None, ctx=None, paths=None):
+    report = report if report is not None else Report()
+    ctx = ctx or CheckContext(root)
+    assets_dir = os.path.join(root, "Assets")
+
+    if not os.path.isdir(assets_dir):
+        print("ERROR: Assets/ directory not found")
+        return 1
+
+    audited = 0
+    violations = 0
+    total_excess = 0
+    per_texture = []
+    # Watch mode re-reads just the changed headers instead of the index
+    index = load_image_index(root, ctx) if paths is None else None
+
+    for path in iter_textures(assets_dir, ctx, paths):
+        rel_path = os.path.relpath(path, root).replace(os.sep, "/")
+        policy = policy_for(rel_path)
+        if policy is None:
+            continue
+
+        settings = load_texture_settings(path + ".meta", ctx)
+        if settings is None:
+            continue
+        audited += 1
+
+        dims = None
+        if os.path.splitext(path)[1].lower() in IMAGE_EXTENSIONS:
+            info = (index.get(rel_path) if index is not None
+                    else read_image_header(path))
+            if info:
+                dims = (info.width, info.height)
+
+        excess = 0
+        for rule, message, cost in audit_texture(settings, policy, dims):
+            if cost:
+                message += f" — up to {format_kb(cost)}"
+            report.warning(rel_path + ".meta", message, rule=rule)
+            violations += 1
+            excess += cost
+        if excess:
+            per_texture.append((excess, rel_path))
+            total_excess += excess
+
+    print(f"  Audited {audited} textures against {len(POLICIES)} policies")
+
+    if not violations:
+        print("All texture import settings OK")
+        return 0
+
+    per_texture.sort(reverse=True)
+    print(f"\nLargest estimated savings (top {min(10, len(per_texture))}):")
+    for excess, rel_path in per_texture[:10]:
+        print(f"  {format_kb(excess):>12s}  {rel_path}")
+
+    print(f"\n{violations} import setting violation(s) in "
+          f"{len(per_texture)} texture(s), up to "
+          f"{total_excess / (1024 * 1024):,.1f} MB recoverable (warnings only)")
+    return 0
+
+
+def main():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    root = os.path.dirname(script_dir)
+
+    if not os.path.isdir(os.path.join(root, "Assets")):
+        print(f"ERROR: Cannot find Assets/ directory from {root}")
+        return 1
+
+    print("=" * 60)
+    print("Texture Import Settings Audit")
+    print("=" * 60)
+
+    return check_texture_import(root, standalone_report())
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+"""Shared state for CI checks running in one interpreter.
+
+run_all.py creates a single CheckContext and hands it to every check, so work
+one check does (directory listings, the GUID index, the parsed TagManager)
+is reused by the next instead of being rebuilt per check. Checks run
+standalone get a fresh context of their own.
+
+Checks that go through the context for listings and reads (isdir/isfile,
+walk, read_many) can also run against a git revision instead of the working
+tree; see git_tree.GitTreeContext.
+"""
+
+import os
+
+# Persistent caches live in Unity's Library/, which is never committed and
+# is what CI caches between runs anyway
+CACHE_DIR = os.path.join("Library", "CICache")
+
+
+def cache_path(root, name):
+    """Return the path of a persistent cache file, creating its directory."""
+    cache_dir = os.path.join(root, CACHE_DIR)
+    os.makedirs(cache_dir, exist_ok=True)
+    return os.path.join(cache_dir, name)
+
+
+class CheckContext:
+    # True when read_many() is cheaper than opening files one at a time
+    batched_reads = False
+
+    def __init__(self, root):
+        self.root = root
+        # Directory path -> (dirnames, filenames), filled lazily by listdir()
+        self._listings = {}
+        self._memo = {}
+
+    def listdir(self, path):
+        """Return (dirnames, filenames) for path, listing it at most once."""
+        entry = self._listings.get(path)
+        if entry is None:
+            dirnames, filenames = [], []
+            try:
+                with os.scandir(path) as it:
+                    for e in it:
+                        if e.is_dir():
+                            dirnames.append(e.name)
+                        else:
+                            filenames.append(e.name)
+            except OSError:
+                pass
+            entry = self._listings[path] = (dirnames, filenames)
+        return entry
+
+    def walk(self, top):
+        """Drop-in for os.walk(top) backed by the cached listings.
+
+        Like os.walk, callers may prune by assigning to dirnames[:]; pruned
+        directories are never listed.
+        """
+        stack = [top]
+        while stack:
+            dirpath = stack.pop()
+            dirnames, filenames = self.listdir(dirpath)
+            dirnames = list(dirnames)
+            yield dirpath, dirnames, filenames
+            stack.extend(os.path.join(dirpath, d) for d in reversed(dirnames))
+
+    def listings(self, dirs):
+        """Yield (dirpath, dirnames, filenames) for each existing dir, no recursion."""
+        for dirpath in dirs:
+            if self.isdir(dirpath):
+                dirnames, filenames = self.listdir(dirpath)
+                yield dirpath, list(dirnames), filenames
+
+    def isdir(self, path):
+        return os.path.isdir(path)
+
+    def isfile(self, path):
+        return os.path.isfile(path)
+
+    def read_many(self, paths):
+        """Yield (path, bytes or None if unreadable) for each path."""
+        for path in paths:
+            try:
+                with open(path, "rb") as f:
+                    yield path, f.read()
+            except OSError:
+                yield path, None
+
+    def close(self):
+        """Release resources held by the context (none for the filesystem)."""
+
+    def refresh(self, paths):
+        """Drop cached listings that may be stale after paths changed."""
+        stale = {os.path.dirname(p) for p in paths} | set(paths)
+        prefixes = tuple(os.path.join(p, "") for p in paths)
+        for dirpath in list(self._listings):
+            if dirpath in stale or dirpath.startswith(prefixes):
+                del self._listings[dirpath]
+
+    def memo(self, key, factory):
+        """Return the cached value for key, computing it with factory()."""
+        if key not in self._memo:
+            self._memo[key] = factory()
+        return self._memo[key]
+
+    def memo_keys(self):
+        return list(self._memo)
+
+    def peek(self, key):
+        """Return the memoized value for key without computing it."""
+        return self._memo.get(key)
+
+    def invalidate(self, key=None):
+        """Forget a memoized value (or everything, including listings)."""
+        if key is None:
+            self._listings.clear()
+            self._memo.clear()
+        else:
+            self._memo.pop(key, None)
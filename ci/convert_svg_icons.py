@@ -18,6 +18,21 @@ Supports two input modes:
 
 Output: <project>/Assets/_Project/Art/UI/Icons/Skills/<author>/<name>.png
 
+Database stage (after an import, or on its own):
+     python ci/convert_svg_icons.py --database [--referenced-only]
+
+     Writes Resources/SkillIconDatabase.asset from the import manifest: one
+     entry per imported icon Unity has assigned a GUID, in the same order
+     and format as the editor's Tools/Skill Icons/Rebuild Database, plus a
+     search-term -> icon index table so SkillIconDatabase.Search() does not
+     scan every entry. --referenced-only keeps just the icons skill assets
+     use, which is all the player build needs from Resources/.
+
+     The manifest (Library/CICache/skill-icon-manifest.json) caches each
+     sprite GUID by its .meta's mtime and size, so only new or changed icons
+     are re-read. The asset is rendered deterministically and only written
+     when its content changes.
+
 White-on-transparent is essential because Unity Image.color multiplies the
 sprite color, so white icons tint correctly to any color.
 
@@ -27,10 +42,35 @@ Requirements:
 """
 
 import argparse
+import json
+import os
+import re
+import struct
 import sys
 import zipfile
 from pathlib import Path
 
+from context import cache_path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+ICONS_ROOT = Path("Assets/_Project/Art/UI/Icons/Skills")
+DATABASE_PATH = Path("Assets/_Project/Resources/SkillIconDatabase.asset")
+DATABASE_SCRIPT = Path("Assets/_Project/Scripts/Skills/Data/SkillIconDatabase.cs")
+# Where skill assets (SkillData) live; their "iconId:" picks a database entry
+SKILLS_ROOT = Path("Assets/_Project")
+
+MANIFEST_NAME = "skill-icon-manifest.json"
+MANIFEST_VERSION = 1
+
+# fileID of the single Sprite sub-asset of a Sprite-mode texture
+SPRITE_FILE_ID = 21300000
+
+META_GUID_PATTERN = re.compile(r"^guid: ([0-9a-f]{32})\s*$", re.M)
+ICON_ID_PATTERN = re.compile(r"^  iconId: (\S+)[ \t]*$", re.M)
+# Must match SkillIconDatabase.TermSeparators
+TERM_SEPARATORS = re.compile(r"[ /-]")
+NATURAL_CHUNK = re.compile(r"\d+|.", re.S)
+
 
 def resize_png(input_path, output_path: Path, size: int) -> bool:
     """Resize a PNG to the target size, ensuring RGBA mode."""
@@ -183,11 +223,242 @@ def import_from_svg(svg_root: Path, output_root: Path, size: int):
         sys.exit(1)
 
 
+def natural_key(name: str):
+    """Sort key matching Unity's asset ordering: digit runs compare as
+    numbers, everything else by character ("mp-40" < "mp5" < "mp5k")."""
+    return [(48, int(chunk)) if chunk.isdigit() else (ord(chunk),)
+            for chunk in NATURAL_CHUNK.findall(name.lower())]
+
+
+def format_display_name(stem: str) -> str:
+    """"fire-bolt" -> "Fire Bolt", as SkillIconDatabaseBuilder does."""
+    return " ".join(w[:1].upper() + w[1:] for w in stem.split("-"))
+
+
+def generate_tags(icon_id: str, display_name: str) -> list:
+    """Author plus display name words longer than two letters."""
+    tags = []
+    author, slash, _ = icon_id.partition("/")
+    if slash and author:
+        tags.append(author)
+    for word in display_name.split(" "):
+        lower = word.lower()
+        if len(lower) > 2 and lower not in tags:
+            tags.append(lower)
+    return tags
+
+
+def search_terms(entry: dict) -> set:
+    """Lower-case words of an entry's ID, name and tags.
+
+    A search term without separators can only match inside one of these
+    words, which is what lets Search() use the table instead of a scan.
+    """
+    fields = [entry["iconId"], entry["displayName"]] + entry["tags"]
+    return {word for field in fields
+            for word in TERM_SEPARATORS.split(field.lower()) if word}
+
+
+def build_tag_index(entries: list) -> list:
+    """[(term, [entry index, ...])] sorted by term (ordinal)."""
+    index = {}
+    for i, entry in enumerate(entries):
+        for term in search_terms(entry):
+            index.setdefault(term, []).append(i)
+    return sorted(index.items())
+
+
+def read_meta_guid(meta_path: Path):
+    try:
+        with open(meta_path, "r", encoding="utf-8-sig", errors="replace") as f:
+            match = META_GUID_PATTERN.search(f.read(256))
+    except OSError:
+        return None
+    return match.group(1) if match else None
+
+
+def load_manifest(path: str) -> dict:
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get("version") != MANIFEST_VERSION:
+        return {}
+    return data.get("icons", {})
+
+
+def save_manifest(path: str, icons: dict):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"version": MANIFEST_VERSION, "icons": icons}, f,
+                  separators=(",", ":"), sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def update_manifest(project_root: Path):
+    """Return ({icon id: sprite guid}, [icon ids Unity has not imported yet]).
+
+    GUIDs come from each PNG's .meta; unchanged metas are not re-read.
+    """
+    manifest_file = cache_path(str(project_root), MANIFEST_NAME)
+    cached = load_manifest(manifest_file)
+    icons_root = project_root / ICONS_ROOT
+    icons = {}
+    pending = []
+    dirty = False
+
+    for dirpath, dirnames, filenames in os.walk(icons_root):
+        dirnames.sort()
+        for fname in filenames:
+            if not fname.endswith(".png"):
+                continue
+            png_path = Path(dirpath) / fname
+            icon_id = png_path.relative_to(icons_root).with_suffix("").as_posix()
+            meta_path = png_path.with_name(fname + ".meta")
+            try:
+                st = meta_path.stat()
+            except OSError:
+                pending.append(icon_id)
+                continue
+            stamp = [st.st_mtime_ns, st.st_size]
+
+            entry = cached.get(icon_id)
+            if entry is None or entry[:2] != stamp:
+                guid = read_meta_guid(meta_path)
+                if guid is None:
+                    pending.append(icon_id)
+                    continue
+                entry = stamp + [guid]
+                dirty = True
+            icons[icon_id] = entry
+
+    if dirty or len(icons) != len(cached):
+        try:
+            save_manifest(manifest_file, icons)
+        except OSError:
+            pass
+    return {icon_id: entry[2] for icon_id, entry in icons.items()}, sorted(pending)
+
+
+def referenced_icon_ids(project_root: Path) -> set:
+    """Icon IDs assigned to skill assets ("iconId:" in SkillData .assets)."""
+    database = project_root / DATABASE_PATH
+    referenced = set()
+    for dirpath, _, filenames in os.walk(project_root / SKILLS_ROOT):
+        for fname in filenames:
+            if not fname.endswith(".asset"):
+                continue
+            path = Path(dirpath) / fname
+            if path == database:
+                continue
+            try:
+                with open(path, "r", encoding="utf-8", errors="replace") as f:
+                    referenced.update(ICON_ID_PATTERN.findall(f.read()))
+            except OSError:
+                continue
+    return referenced
+
+
+def yaml_scalar(value: str) -> str:
+    """A string as Unity writes it: plain when safe, else single-quoted."""
+    if value and re.fullmatch(r"[A-Za-z0-9_./()][\w ./()+-]*", value) \
+            and not value.endswith(" "):
+        return value
+    return "'" + value.replace("'", "''") + "'"
+
+
+def int_array(values: list) -> str:
+    """Unity's text form of an int[]: little-endian int32s as hex."""
+    return struct.pack(f"<{len(values)}i", *values).hex()
+
+
+def render_database(script_guid: str, entries: list, tag_index: list) -> str:
+    lines = [
+        "%YAML 1.1",
+        "%TAG !u! tag:unity3d.com,2011:",
+        "--- !u!114 &11400000",
+        "MonoBehaviour:",
+        "  m_ObjectHideFlags: 0",
+        "  m_CorrespondingSourceObject: {fileID: 0}",
+        "  m_PrefabInstance: {fileID: 0}",
+        "  m_PrefabAsset: {fileID: 0}",
+        "  m_GameObject: {fileID: 0}",
+        "  m_Enabled: 1",
+        "  m_EditorHideFlags: 0",
+        f"  m_Script: {{fileID: 11500000, guid: {script_guid}, type: 3}}",
+        "  m_Name: SkillIconDatabase",
+        "  m_EditorClassIdentifier: Assembly-CSharp::SkillIconDatabase",
+    ]
+    lines.append("  allIcons:" if entries else "  allIcons: []")
+    for entry in entries:
+        lines.append(f"  - iconId: {yaml_scalar(entry['iconId'])}")
+        lines.append(f"    displayName: {yaml_scalar(entry['displayName'])}")
+        lines.append(f"    sprite: {{fileID: {SPRITE_FILE_ID}, "
+                     f"guid: {entry['guid']}, type: 3}}")
+        if entry["tags"]:
+            lines.append("    tags:")
+            lines.extend(f"    - {yaml_scalar(tag)}" for tag in entry["tags"])
+        else:
+            lines.append("    tags: []")
+    lines.append("  tagIndex:" if tag_index else "  tagIndex: []")
+    for term, indices in tag_index:
+        lines.append(f"  - term: {yaml_scalar(term)}")
+        lines.append(f"    icons: {int_array(indices)}")
+    return "\n".join(lines) + "\n"
+
+
+def generate_database(project_root: Path, referenced_only: bool = False):
+    """Write SkillIconDatabase.asset if its content would change."""
+    script_guid = read_meta_guid(
+        (project_root / DATABASE_SCRIPT).with_name(DATABASE_SCRIPT.name + ".meta"))
+    if script_guid is None:
+        print(f"ERROR: No GUID for {DATABASE_SCRIPT}", file=sys.stderr)
+        sys.exit(1)
+
+    icons, pending = update_manifest(project_root)
+    if pending:
+        print(f"  {len(pending)} icon(s) have no .meta yet (open the project "
+              "in Unity to import them); left out of the database")
+
+    icon_ids = sorted(icons, key=lambda i: natural_key(i + ".png"))
+    if referenced_only:
+        referenced = referenced_icon_ids(project_root)
+        missing = sorted(referenced - set(icon_ids))
+        for icon_id in missing:
+            print(f"  WARNING: skill icon '{icon_id}' has no imported icon")
+        icon_ids = [i for i in icon_ids if i in referenced]
+
+    entries = []
+    for icon_id in icon_ids:
+        display_name = format_display_name(icon_id.rsplit("/", 1)[-1])
+        entries.append({"iconId": icon_id, "displayName": display_name,
+                        "guid": icons[icon_id],
+                        "tags": generate_tags(icon_id, display_name)})
+    tag_index = build_tag_index(entries)
+    content = render_database(script_guid, entries, tag_index).encode("utf-8")
+
+    database = project_root / DATABASE_PATH
+    try:
+        unchanged = database.read_bytes() == content
+    except OSError:
+        unchanged = False
+    print(f"Database: {len(entries)} icons, {len(tag_index)} search terms")
+    if unchanged:
+        print(f"  {DATABASE_PATH} unchanged")
+        return
+    database.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = database.with_name(database.name + ".tmp")
+    tmp_path.write_bytes(content)
+    os.replace(tmp_path, database)
+    print(f"  Wrote {DATABASE_PATH} ({len(content) // 1024} KB)")
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Import game-icons.net icons as white-on-transparent PNGs"
     )
-    group = parser.add_mutually_exclusive_group(required=True)
+    group = parser.add_mutually_exclusive_group()
     group.add_argument(
         "--zip",
         type=Path,
@@ -210,20 +481,34 @@ def main():
         default=128,
         help="Output PNG size in pixels (default: 128)",
     )
+    parser.add_argument(
+        "--database",
+        action="store_true",
+        help="Regenerate Resources/SkillIconDatabase.asset from the manifest",
+    )
+    parser.add_argument(
+        "--referenced-only",
+        action="store_true",
+        help="With --database, only include icons skill assets reference",
+    )
     args = parser.parse_args()
 
+    if not (args.zip or args.svg or args.database):
+        parser.error("one of --zip, --svg or --database is required")
+
     if args.output is None:
-        script_dir = Path(__file__).resolve().parent
-        project_root = script_dir.parent
-        args.output = project_root / "Assets" / "_Project" / "Art" / "UI" / "Icons" / "Skills"
+        args.output = PROJECT_ROOT / ICONS_ROOT
 
     output_root = args.output.resolve()
 
     if args.zip:
         import_from_zip(args.zip.resolve(), output_root, args.size)
-    else:
+    elif args.svg:
         import_from_svg(args.svg.resolve(), output_root, args.size)
 
+    if args.database:
+        generate_database(PROJECT_ROOT, args.referenced_only)
+
 
 if __name__ == "__main__":
     main()
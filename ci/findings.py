@@ -0,0 +1,274 @@
+"""Structured findings shared by the CI checks.
+
+Every check records what it finds on a Report instead of printing annotations
+itself. The Report prints each finding once (GitHub annotation on Actions,
+"[ERROR] file:line: msg" locally), drops exact duplicates, and can write the
+collected findings as JSON or SARIF 2.1.0 for post-processing.
+
+A Report can also carry a Baseline of known findings. Those are counted but
+neither printed nor recorded, so only new findings show up. Findings are
+matched by fingerprint (rule + file + the whitespace-normalized source line,
+or the message when there is no line), which survives lines moving around.
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import sys
+from collections import Counter
+
+GITHUB_ACTIONS = os.environ.get("GITHUB_ACTIONS") == "true"
+
+# When set, a check run as a script writes its findings to this JSON path on
+# exit so run_all.py can collect them from an isolated subprocess.
+FINDINGS_ENV = "CI_FINDINGS_OUT"
+# When set, a check run as a script suppresses findings in this baseline
+BASELINE_ENV = "CI_BASELINE"
+
+TOOL_NAME = "unity-ci"
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+
+# Finding level -> local console tag
+LEVEL_TAGS = {"error": "ERROR", "warning": "WARN", "notice": "NOTE"}
+# Finding level -> SARIF result level
+SARIF_LEVELS = {"error": "error", "warning": "warning", "notice": "note"}
+
+
+class Finding:
+    __slots__ = ("level", "file", "line", "rule", "message", "check")
+
+    def __init__(self, level, file, line, rule, message, check=None):
+        self.level = level
+        self.file = file
+        self.line = line
+        self.rule = rule
+        self.message = message
+        self.check = check
+
+    def key(self):
+        return (self.level, self.file, self.line, self.rule, self.message)
+
+    def to_dict(self):
+        return {"level": self.level, "file": self.file, "line": self.line,
+                "rule": self.rule, "message": self.message,
+                "check": self.check}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["level"], data["file"], data.get("line"),
+                   data["rule"], data["message"], data.get("check"))
+
+    def annotation(self):
+        """Format as a GitHub workflow command or a local console line."""
+        if GITHUB_ACTIONS:
+            props = f"file={self.file}"
+            if self.line is not None:
+                props += f",line={self.line}"
+            props += f",title={self.rule}"
+            return f"::{self.level} {props}::{self.message}"
+        tag = LEVEL_TAGS.get(self.level, "WARN")
+        loc = self.file if self.line is None else f"{self.file}:{self.line}"
+        return f"  [{tag}] {loc}: {self.message}"
+
+
+class Baseline:
+    """Fingerprints of accepted findings, with multiplicity.
+
+    Stored as one 16-hex fingerprint per line, sorted, so it diffs well and
+    loads straight into a dict: filtering is one hash lookup per finding.
+    """
+
+    def __init__(self, root, counts=None, path=None):
+        self.root = root
+        self.counts = counts if counts is not None else {}
+        self.path = path
+
+    @classmethod
+    def load(cls, root, path):
+        with open(path, encoding="utf-8") as f:
+            counts = Counter(line.strip() for line in f if line.strip())
+        return cls(root, dict(counts), os.path.abspath(path))
+
+    @staticmethod
+    def save(path, fingerprints):
+        with open(path, "w", encoding="utf-8", newline="\n") as f:
+            f.writelines(fp + "\n" for fp in sorted(fingerprints))
+
+    def __len__(self):
+        return sum(self.counts.values())
+
+
+def read_line(root, file, line, cache, ctx=None):
+    """Whitespace-normalized text of file:line ("" if unavailable).
+
+    With a context the file is read through it, so findings from a git
+    tree context fingerprint the revision's content, not the checkout's.
+    """
+    lines = cache.get(file)
+    if lines is None:
+        path = os.path.join(root, file)
+        if ctx is not None:
+            data = dict(ctx.read_many([path])).get(path)
+            lines = data.decode("utf-8-sig", errors="replace").splitlines() \
+                if data is not None else []
+        else:
+            try:
+                with open(path, "r", encoding="utf-8-sig",
+                          errors="replace") as f:
+                    lines = f.read().splitlines()
+            except OSError:
+                lines = []
+        cache[file] = lines
+    if 0 < line <= len(lines):
+        return " ".join(lines[line - 1].split())
+    return ""
+
+
+def fingerprint(root, finding, cache, ctx=None):
+    """Stable id of a finding: rule + file + source line content.
+
+    The line number itself is left out so unrelated edits above a finding
+    don't make it look new.
+    """
+    if finding.line is None:
+        content = finding.message
+    else:
+        content = read_line(root, finding.file, finding.line, cache, ctx)
+    data = "\0".join((finding.rule, finding.file, content)).encode("utf-8")
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+
+class Report:
+    """Collects findings from one or more checks."""
+
+    def __init__(self, check=None, baseline=None, ctx=None):
+        self.check = check
+        # Context the checks read through; fingerprints read lines from it
+        self.ctx = ctx
+        self.findings = []
+        self._seen = set()
+        self.baseline = baseline
+        # (level, check) -> findings suppressed by the baseline
+        self.suppressed = Counter()
+        self._matched = Counter()
+        self._lines = {}
+
+    def _in_baseline(self, finding):
+        """True (and count it) if the baseline still has room for finding."""
+        fp = fingerprint(self.baseline.root, finding, self._lines, self.ctx)
+        if self._matched[fp] >= self.baseline.counts.get(fp, 0):
+            return False
+        self._matched[fp] += 1
+        self.suppressed[(finding.level, finding.check)] += 1
+        return True
+
+    def add(self, level, file, message, line=None, rule="GENERAL",
+            echo=True):
+        """Record a finding and print its annotation.
+
+        Returns None (and prints nothing) for a duplicate or a baselined
+        finding.
+        """
+        finding = Finding(level, file.replace("\\", "/"), line, rule,
+                          message, self.check)
+        if finding.key() in self._seen:
+            return None
+        self._seen.add(finding.key())
+        if self.baseline and self._in_baseline(finding):
+            return None
+        self.findings.append(finding)
+        if echo:
+            print(finding.annotation())
+        return finding
+
+    def error(self, file, message, line=None, rule="GENERAL"):
+        return self.add("error", file, message, line, rule)
+
+    def warning(self, file, message, line=None, rule="GENERAL"):
+        return self.add("warning", file, message, line, rule)
+
+    def merge(self, findings):
+        """Add already-built findings (e.g. from a subprocess) silently."""
+        for finding in findings:
+            if finding.key() not in self._seen:
+                self._seen.add(finding.key())
+                if self.baseline and self._in_baseline(finding):
+                    continue
+                self.findings.append(finding)
+
+    def absorb(self, other):
+        """Take over the findings and baseline counts of a report that
+        filtered against the same baseline (no second baseline pass)."""
+        for finding in other.findings:
+            if finding.key() not in self._seen:
+                self._seen.add(finding.key())
+                self.findings.append(finding)
+        self.suppressed.update(other.suppressed)
+        self._matched.update(other._matched)
+
+    def count(self, level, check=None):
+        return sum(1 for f in self.findings
+                   if f.level == level and (check is None or f.check == check))
+
+    def fingerprints(self, root):
+        """Fingerprints of every recorded finding, e.g. for a new baseline."""
+        cache = {}
+        return [fingerprint(root, f, cache, self.ctx) for f in self.findings]
+
+    def count_suppressed(self, level=None, check=None):
+        return sum(n for (lvl, chk), n in self.suppressed.items()
+                   if (level is None or lvl == level)
+                   and (check is None or chk == check))
+
+    def to_json(self, path, **meta):
+        data = dict(meta)
+        data["findings"] = [f.to_dict() for f in self.findings]
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump(data, fh, indent=2)
+
+    def to_sarif(self, path):
+        rules = sorted({f.rule for f in self.findings})
+        results = []
+        for f in self.findings:
+            location = {"artifactLocation": {"uri": f.file}}
+            if f.line is not None:
+                location["region"] = {"startLine": f.line}
+            results.append({
+                "ruleId": f.rule,
+                "level": SARIF_LEVELS.get(f.level, "warning"),
+                "message": {"text": f.message},
+                "locations": [{"physicalLocation": location}],
+                "properties": {"check": f.check},
+            })
+
+        sarif = {
+            "$schema": SARIF_SCHEMA,
+            "version": "2.1.0",
+            "runs": [{
+                "tool": {"driver": {
+                    "name": TOOL_NAME,
+                    "rules": [{"id": r} for r in rules],
+                }},
+                "results": results,
+            }],
+        }
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump(sarif, fh, indent=2)
+
+
+def standalone_report():
+    """Report for a check run as a script, exported on exit if requested."""
+    baseline = None
+    baseline_path = os.environ.get(BASELINE_ENV)
+    if baseline_path and os.path.exists(baseline_path):
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        baseline = Baseline.load(root, baseline_path)
+    report = Report(baseline=baseline)
+    path = os.environ.get(FINDINGS_ENV)
+    if path:
+        # sys.last_value is set once an uncaught exception was printed
+        atexit.register(lambda: report.to_json(path, baselined={
+            level: report.count_suppressed(level) for level in LEVEL_TAGS},
+            crashed=hasattr(sys, "last_value")))
+    return report
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""Run checks against a git tree instead of the working tree.
+
+GitTreeContext is a CheckContext whose directory listings come from one
+`git ls-tree -r` of a revision and whose file reads go through a single
+long-lived `git cat-file --batch` process, requested in batches. Meta
+pairing, GUID indexing and the serialized YAML scan then need only the git
+object database: they work on a blobless clone, a clone without LFS
+content, or a bare repository, and never open files one by one.
+
+Differences from a working-tree run:
+  - only tracked files exist; untracked and ignored files (Library/) do not
+  - empty directories do not exist, as in any fresh clone
+  - the tree is immutable, so listings are never refreshed
+
+Run directly to list what a revision's tree holds (smoke test).
+"""
+
+import atexit
+import os
+import subprocess
+import sys
+import threading
+
+from context import CheckContext
+
+# Checks whose file access all goes through the context. The others still
+# read the working tree.
+GIT_TREE_CHECKS = ("check_meta_files", "check_meta_content",
+                   "check_guid_references")
+
+
+class CatFile:
+    """One `git cat-file --batch` process, started on first use.
+
+    Not thread-safe: one read_many() at a time.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self._proc = None
+        atexit.register(self.close)
+
+    def _start(self):
+        if self._proc is None:
+            self._proc = subprocess.Popen(
+                ["git", "-C", self.root, "cat-file", "--batch"],
+                stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        return self._proc
+
+    def _read_object(self, stdout):
+        header = stdout.readline().split()
+        if len(header) < 3 or header[1] == b"missing":
+            return None
+        data = stdout.read(int(header[2]))
+        stdout.read(1)  # trailing newline
+        return data
+
+    def read_many(self, oids):
+        """Yield each object's content (None if missing), in order.
+
+        All requests are written from a feeder thread while results are read
+        here, so neither side of the pipe fills up and blocks the other.
+        """
+        oids = list(oids)
+        if not oids:
+            return
+        proc = self._start()
+
+        def feed():
+            proc.stdin.write(b"".join(oid.encode("ascii") + b"\n"
+                                      for oid in oids))
+            proc.stdin.flush()
+
+        feeder = threading.Thread(target=feed, daemon=True)
+        feeder.start()
+        done = 0
+        try:
+            for _ in oids:
+                data = self._read_object(proc.stdout)
+                done += 1
+                yield data
+        finally:
+            # Keep the stream in sync if the caller stopped early
+            for _ in range(len(oids) - done):
+                self._read_object(proc.stdout)
+            feeder.join()
+
+    def close(self):
+        if self._proc is not None:
+            self._proc.stdin.close()
+            self._proc.wait()
+            self._proc = None
+
+
+def list_tree(root, rev):
+    """Return {project-relative path: blob oid} for every file in rev."""
+    output = subprocess.run(
+        ["git", "-C", root, "ls-tree", "-r", "-z", "--full-tree", rev],
+        stdout=subprocess.PIPE, check=True).stdout
+    blobs = {}
+    for record in output.split(b"\0"):
+        if not record:
+            continue
+        info, _, path = record.partition(b"\t")
+        _, obj_type, oid = info.split()
+        # Submodules ("commit") have no content here
+        if obj_type == b"blob":
+            blobs[path.decode("utf-8", errors="surrogateescape")] = \
+                oid.decode("ascii")
+    return blobs
+
+
+class GitTreeContext(CheckContext):
+    """CheckContext backed by the objects of one git revision."""
+
+    batched_reads = True
+
+    def __init__(self, root, rev="HEAD"):
+        super().__init__(root)
+        self.rev = rev
+        # Absolute path -> blob oid, and directory -> (dirnames, filenames)
+        self.blobs = {}
+        self._tree = {root: ([], [])}
+        for rel_path, oid in list_tree(root, rev).items():
+            path = os.path.join(root, *rel_path.split("/"))
+            self.blobs[path] = oid
+            parent, name = os.path.split(path)
+            if parent not in self._tree:
+                self._add_dir(parent)
+            self._tree[parent][1].append(name)
+        self._cat_file = CatFile(root)
+
+    def _add_dir(self, path):
+        """Create the listing for path, linking it (and ancestors) upwards."""
+        self._tree[path] = ([], [])
+        parent, name = os.path.split(path)
+        if parent not in self._tree:
+            self._add_dir(parent)
+        self._tree[parent][0].append(name)
+
+    def listdir(self, path):
+        return self._tree.get(path, ([], []))
+
+    def isdir(self, path):
+        return path in self._tree
+
+    def isfile(self, path):
+        return path in self.blobs
+
+    def read_many(self, paths):
+        """Yield (path, bytes or None) with one batched cat-file request."""
+        paths = list(paths)
+        contents = self._cat_file.read_many(
+            self.blobs[p] for p in paths if p in self.blobs)
+        try:
+            for path in paths:
+                yield path, next(contents) if path in self.blobs else None
+        finally:
+            contents.close()
+
+    def refresh(self, paths):
+        pass
+
+    def close(self):
+        self._cat_file.close()
+
+
+def main():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    root = os.path.dirname(script_dir)
+    rev = sys.argv[1] if len(sys.argv) > 1 else "HEAD"
+
+    print("=" * 60)
+    print(f"Git Tree: {rev}")
+    print("=" * 60)
+
+    try:
+        ctx = GitTreeContext(root, rev)
+    except (OSError, subprocess.CalledProcessError) as e:
+        print(f"ERROR: Cannot read tree {rev}: {e}")
+        return 1
+    metas = [p for p in ctx.blobs if p.endswith(".meta")]
+    total = sum(len(data or b"") for _, data in ctx.read_many(metas))
+    print(f"  {len(ctx.blobs)} files, {len(ctx._tree)} directories")
+    print(f"  Read {len(metas)} .meta blobs ({total // 1024} KB) in one batch")
+    ctx.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
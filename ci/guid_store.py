@@ -0,0 +1,154 @@
+"""Compact sorted set of Unity GUIDs.
+
+A Python set of 32-char hex strings costs ~100 bytes per GUID; with
+Library/PackageCache indexed that is hundreds of thousands of objects.
+GuidSet keeps each GUID as 16 raw bytes in one sorted buffer (16 bytes per
+GUID, one object in total) and answers membership by binary search.
+
+Saved sets are a 16-byte header followed by the records, and load() maps
+the file instead of reading it, so a cached index costs no parse time and
+only the pages a lookup touches. missing() answers "which of these GUIDs
+are unknown" in one pass: a vectorized set difference when NumPy is
+installed, one binary search per distinct GUID otherwise.
+"""
+
+import bisect
+import heapq
+import mmap
+import os
+import struct
+
+RECORD_SIZE = 16
+MAGIC = b"GUIDSET1"
+# MAGIC + record count, padded so records start 16-byte aligned
+HEADER = struct.Struct("<8sQ")
+
+
+class _Records:
+    """Sequence view of the 16-byte records in a buffer, for bisect."""
+
+    __slots__ = ("buf", "offset", "count")
+
+    def __init__(self, buf, offset, count):
+        self.buf = buf
+        self.offset = offset
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        start = self.offset + i * RECORD_SIZE
+        return bytes(self.buf[start:start + RECORD_SIZE])
+
+    def __iter__(self):
+        for i in range(self.count):
+            yield self[i]
+
+
+class GuidSet:
+    """Immutable sorted set of GUIDs; accepts and yields 32-char hex."""
+
+    def __init__(self, buf=b"", offset=0, count=None):
+        self._buf = buf
+        self._offset = offset
+        if count is None:
+            count = (len(buf) - offset) // RECORD_SIZE
+        self._records = _Records(buf, offset, count)
+
+    @classmethod
+    def from_hex(cls, guids):
+        """Build from hex GUID strings; invalid ones are skipped."""
+        records = set()
+        for guid in guids:
+            try:
+                raw = bytes.fromhex(guid)
+            except (TypeError, ValueError):
+                continue
+            if len(raw) == RECORD_SIZE:
+                records.add(raw)
+        return cls(b"".join(sorted(records)))
+
+    @classmethod
+    def load(cls, path):
+        """Map a file written by save(); raises OSError/ValueError if bad."""
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < HEADER.size:
+                raise ValueError(f"{path}: truncated GUID set")
+            if size == HEADER.size:
+                buf = f.read()
+            else:
+                buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count = HEADER.unpack(buf[:HEADER.size])
+        if magic != MAGIC or size != HEADER.size + count * RECORD_SIZE:
+            raise ValueError(f"{path}: not a GUID set")
+        return cls(buf, HEADER.size, count)
+
+    def save(self, path):
+        """Write atomically: header, then the sorted records."""
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, len(self)))
+            start = self._offset
+            f.write(self._buf[start:start + len(self) * RECORD_SIZE])
+        os.replace(tmp_path, path)
+
+    def __len__(self):
+        return len(self._records)
+
+    def __iter__(self):
+        for raw in self._records:
+            yield raw.hex()
+
+    def _contains_raw(self, raw):
+        i = bisect.bisect_left(self._records, raw)
+        return i < len(self._records) and self._records[i] == raw
+
+    def __contains__(self, guid):
+        try:
+            raw = bytes.fromhex(guid)
+        except (TypeError, ValueError):
+            return False
+        return len(raw) == RECORD_SIZE and self._contains_raw(raw)
+
+    def __or__(self, other):
+        """Union of two sets, merged in sorted order without rehashing."""
+        merged = []
+        last = None
+        for raw in heapq.merge(self._records, other._records):
+            if raw != last:
+                merged.append(raw)
+                last = raw
+        return GuidSet(b"".join(merged))
+
+    def missing(self, guids):
+        """Return the set of hex GUIDs from guids that are not in this set."""
+        wanted = set(guids)
+        if not wanted or not len(self):
+            return wanted
+        try:
+            import numpy as np
+        except ImportError:
+            return {g for g in wanted if g not in self}
+
+        queries = []
+        raw = []
+        invalid = set()
+        for guid in wanted:
+            try:
+                value = bytes.fromhex(guid)
+            except (TypeError, ValueError):
+                value = b""
+            if len(value) == RECORD_SIZE:
+                queries.append(guid)
+                raw.append(value)
+            else:
+                invalid.add(guid)
+        # "S16" compares as fixed-width byte strings, which orders like the
+        # buffer; distinct 16-byte values stay distinct
+        store = np.frombuffer(self._buf, dtype="S16", count=len(self),
+                              offset=self._offset)
+        found = np.isin(np.array(raw, dtype="S16"), store)
+        return {guid for guid, hit in zip(queries, found.tolist())
+                if not hit} | invalid
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""Index image dimensions and formats by reading file headers only.
+
+PNG width/height/bit depth sit at fixed offsets in the IHDR chunk, and a
+JPEG's sit in its SOF segment, so a few dozen bytes per file are enough; no
+pixel data is decoded. Results are cached in Library/CICache keyed by each
+file's (mtime, size), so after the first run only new or edited images are
+opened at all.
+
+Run directly for size reports: largest textures, non-power-of-two sprites,
+and skill icons that are not at the expected icon size.
+"""
+
+import argparse
+import json
+import os
+import struct
+import sys
+from collections import namedtuple
+
+from context import CheckContext, cache_path
+
+IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg"}
+
+CACHE_NAME = "image-index.json"
+CACHE_VERSION = 1
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# SOF0-SOF15 carry the frame header; C4 (DHT), C8 (JPG) and CC (DAC) don't
+JPEG_SOF_MARKERS = set(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+# Markers without a length field
+JPEG_STANDALONE_MARKERS = {0x01, 0xD8} | set(range(0xD0, 0xD8))
+
+ICON_DIR = "Assets/_Project/Art/UI/Icons/Skills/"
+ICON_SIZE = 128
+SPRITE_DIR = "Assets/_Project/Art/"
+
+# depth: bits per channel; channels: 1 grey .. 4 RGBA (PNG color type mapped)
+ImageInfo = namedtuple("ImageInfo", "format width height depth channels")
+
+PNG_CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+
+
+def read_png_header(f):
+    head = f.read(26)
+    if len(head) < 26 or not head.startswith(PNG_SIGNATURE):
+        return None
+    if head[12:16] != b"IHDR":
+        return None
+    width, height, depth, color_type = struct.unpack(">IIBB", head[16:26])
+    return ImageInfo("png", width, height, depth,
+                     PNG_CHANNELS.get(color_type, 4))
+
+
+def read_jpeg_header(f):
+    if f.read(2) != b"\xff\xd8":
+        return None
+    while True:
+        byte = f.read(1)
+        if not byte:
+            return None
+        if byte != b"\xff":
+            continue
+        marker = f.read(1)
+        # Any number of 0xFF fill bytes may precede a marker
+        while marker == b"\xff":
+            marker = f.read(1)
+        if not marker:
+            return None
+        code = marker[0]
+        if code in JPEG_STANDALONE_MARKERS:
+            continue
+        length_bytes = f.read(2)
+        if len(length_bytes) < 2:
+            return None
+        length = struct.unpack(">H", length_bytes)[0]
+        if code in JPEG_SOF_MARKERS:
+            frame = f.read(6)
+            if len(frame) < 6:
+                return None
+            depth, height, width, channels = struct.unpack(">BHHB", frame)
+            return ImageInfo("jpeg", width, height, depth, channels)
+        if code == 0xDA:
+            # Start of scan without a frame header: not a usable JPEG
+            return None
+        f.seek(length - 2, os.SEEK_CUR)
+
+
+def read_image_header(path):
+    """Return ImageInfo for a PNG or JPEG from its header, or None."""
+    ext = os.path.splitext(path)[1].lower()
+    try:
+        with open(path, "rb") as f:
+            if ext == ".png":
+                return read_png_header(f)
+            return read_jpeg_header(f)
+    except (OSError, struct.error):
+        return None
+
+
+def load_cache(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get("version") != CACHE_VERSION:
+        return {}
+    return data.get("images", {})
+
+
+def save_cache(path, entries):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"version": CACHE_VERSION, "images": entries}, f,
+                  separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+def iter_images(assets_dir, ctx):
+    for dirpath, _, filenames in ctx.walk(assets_dir):
+        for fname in filenames:
+            if os.path.splitext(fname)[1].lower() in IMAGE_EXTENSIONS:
+                yield os.path.join(dirpath, fname)
+
+
+def build_image_index(root, ctx=None):
+    """Return {project-relative path: ImageInfo} for every image in Assets/.
+
+    Cached entries are reused while the file's mtime and size are unchanged;
+    the cache file is rewritten only when something was added or dropped.
+    """
+    ctx = ctx or CheckContext(root)
+    cache_file = cache_path(root, CACHE_NAME)
+    cached = load_cache(cache_file)
+    entries = {}
+    index = {}
+    dirty = False
+
+    for path in iter_images(os.path.join(root, "Assets"), ctx):
+        rel_path = os.path.relpath(path, root).replace(os.sep, "/")
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        stamp = [st.st_mtime_ns, st.st_size]
+
+        entry = cached.get(rel_path)
+        if entry is None or entry[:2] != stamp:
+            info = read_image_header(path)
+            entry = stamp + (list(info) if info else [])
+            dirty = True
+        entries[rel_path] = entry
+        if len(entry) > 2:
+            index[rel_path] = ImageInfo(*entry[2:])
+
+    if dirty or len(entries) != len(cached):
+        try:
+            save_cache(cache_file, entries)
+        except OSError:
+            pass
+    return index
+
+
+def load_image_index(root, ctx):
+    """The image index, built at most once per CheckContext."""
+    return ctx.memo("image_index", lambda: build_image_index(root, ctx))
+
+
+def is_power_of_two(n):
+    return n > 0 and n & (n - 1) == 0
+
+
+def print_largest(index, top):
+    largest = sorted(index.items(), key=lambda kv: kv[1].width * kv[1].height,
+                     reverse=True)[:top]
+    print(f"\nLargest textures (top {len(largest)}):")
+    for rel_path, info in largest:
+        print(f"  {info.width:>5d} x {info.height:<5d} {info.format:4s}  "
+              f"{rel_path}")
+
+
+def print_non_pot(index, top):
+    non_pot = sorted(
+        (rel_path, info) for rel_path, info in index.items()
+        if rel_path.startswith(SPRITE_DIR)
+        and not (is_power_of_two(info.width) and is_power_of_two(info.height)))
+    print(f"\nNon-power-of-two images under {SPRITE_DIR} ({len(non_pot)}):")
+    for rel_path, info in non_pot[:top]:
+        print(f"  {info.width:>5d} x {info.height:<5d} {rel_path}")
+    if len(non_pot) > top:
+        print(f"  ... and {len(non_pot) - top} more")
+
+
+def print_off_size_icons(index, top):
+    icons = [(rel_path, info) for rel_path, info in index.items()
+             if rel_path.startswith(ICON_DIR)]
+    off_size = sorted((rel_path, info) for rel_path, info in icons
+                      if (info.width, info.height) != (ICON_SIZE, ICON_SIZE))
+    print(f"\nSkill icons not at {ICON_SIZE}x{ICON_SIZE} "
+          f"({len(off_size)} of {len(icons)}):")
+    for rel_path, info in off_size[:top]:
+        print(f"  {info.width:>5d} x {info.height:<5d} {rel_path}")
+    if len(off_size) > top:
+        print(f"  ... and {len(off_size) - top} more")
+    return len(off_size)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Report image dimensions from header-only reads")
+    parser.add_argument("--top", type=int, default=20,
+                        help="Rows to show per report (default: 20)")
+    args = parser.parse_args()
+
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    root = os.path.dirname(script_dir)
+
+    if not os.path.isdir(os.path.join(root, "Assets")):
+        print(f"ERROR: Cannot find Assets/ directory from {root}")
+        return 1
+
+    print("=" * 60)
+    print("Image Index")
+    print("=" * 60)
+
+    index = build_image_index(root)
+    print(f"  Indexed {len(index)} images")
+
+    print_largest(index, args.top)
+    print_non_pot(index, args.top)
+    print_off_size_icons(index, args.top)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
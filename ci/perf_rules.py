@@ -0,0 +1,155 @@
+"""Unity performance lint rules for hot paths in C# scripts.
+
+A method is hot when call_graph finds it reachable from a Unity callback,
+in its own file or across scripts, e.g. PlayerController.Update() ->
+CombatController.StartAttack() -> SpawnHitbox(). Each hot method inherits
+the highest call frequency of the callbacks reaching it:
+
+    per frame         Update, LateUpdate, OnGUI
+    per physics step  FixedUpdate, On*Stay(2D)
+    per event         On*Enter/Exit(2D), handlers subscribed with +=
+
+Rules flag per-call allocations and slow lookups in hot methods, and
+uncached yield instructions inside coroutine loops (which repeat however
+the coroutine was started). Findings carry the frequency rank so callers
+can list the most frequent first.
+"""
+
+import re
+from collections import namedtuple
+
+from call_graph import (FREQUENCY_LABELS, PER_EVENT, PER_PHYSICS_STEP,
+                        build_hot_methods, hot_methods_in, summarize)
+from symbol_index import parse_methods, strip_literals
+
+# (rule, minimum rank, pattern, message); evaluated on stripped code, where
+# string literals are "#n" placeholders ($"#n" when interpolated). Lookups
+# and strings in event handlers are usually fine (other.GetComponent<T>()
+# on a trigger, UI text on change), so those rules need a per-step rank.
+HOT_PATH_RULES = [
+    ("PERF_UPDATE", PER_PHYSICS_STEP, re.compile(r"GetComponent\s*<"),
+     "GetComponent<T>() on a hot path — cache in Awake/Start instead"),
+    ("PERF_UPDATE", PER_PHYSICS_STEP, re.compile(
+        r"(Find\s*\(|FindGameObjectWithTag|FindWithTag|FindAnyObjectByType"
+        r"|FindObjectsByType)"),
+     "Find() call on a hot path — cache reference in Awake/Start"),
+    ("PERF_ALLOC", PER_EVENT, re.compile(
+        r"\bnew\s+(?:List|Dictionary|HashSet|Queue|Stack|LinkedList"
+        r"|SortedList|SortedDictionary)\s*<|\bnew\s+[\w.]+\s*\[\s*[^\]\s]"),
+     "Allocates a new collection every call — reuse a cached one"),
+    ("PERF_LINQ", PER_EVENT, re.compile(
+        r"(?<!Mathf)(?<!Math)\.\s*(?:Where|Select|SelectMany|Any|All|First"
+        r"|FirstOrDefault|Last|LastOrDefault|Single|OrderBy|OrderByDescending"
+        r"|ThenBy|GroupBy|Distinct|ToList|ToArray|ToDictionary|Count|Sum|Min"
+        r"|Max|Average|Aggregate|Skip|Take)\s*\("),
+     "LINQ allocates enumerators and closures — use a plain loop"),
+    ("PERF_STRING", PER_PHYSICS_STEP, re.compile(
+        r'\$"#\d+"|"#\d+"\s*\+(?![+=])|(?<![+])\+=?\s*\$?"#\d+"'),
+     "String concatenation/interpolation allocates — cache or use a "
+     "StringBuilder"),
+    ("PERF_CAMERA_MAIN", PER_EVENT, re.compile(r"\bCamera\.main\b"),
+     "Camera.main looks up the camera by tag — cache it in Awake/Start"),
+    ("PERF_SEND_MESSAGE", PER_EVENT, re.compile(
+        r"\b(?:SendMessage|SendMessageUpwards|BroadcastMessage)\s*\("),
+     "SendMessage uses reflection — call the method or use an event"),
+    ("PERF_DEBUG_LOG", PER_PHYSICS_STEP,
+     re.compile(r"\bDebug\.Log(?:Warning|Format)?\s*\("),
+     "Debug.Log on a hot path — remove or guard with a debug flag"),
+]
+
+# LINQ rules only make sense when the file imports it
+LINQ_IMPORT = re.compile(r"^\s*using\s+System\.Linq\s*;", re.M)
+# A Debug.Log behind "if (debugLogging)" and the like is opt-in; let it be.
+# Strings built inside a log call are the log rule's concern.
+LOG_GUARD = re.compile(r"\bif\s*\([^;]*?(?i:debug|log|verbose)")
+LOG_CALL = re.compile(r"\bDebug\.Log")
+
+WAIT_ALLOC = re.compile(
+    r"\byield\s+return\s+new\s+(?:WaitForSeconds|WaitForSecondsRealtime"
+    r"|WaitForFixedUpdate|WaitForEndOfFrame)\s*\(")
+LOOP_KEYWORD = re.compile(r"\b(?:while|for|foreach|do)\b")
+
+PerfFinding = namedtuple("PerfFinding", "line rule message rank")
+
+
+def file_hot_methods(source):
+    """Hot methods of one script on its own, for callers without a graph."""
+    return hot_methods_in(build_hot_methods({"": summarize(source)}), "")
+
+
+def loop_offsets(body):
+    """Return (start, end) ranges of loop bodies within a method body."""
+    ranges = []
+    stack = []
+    start = 0
+    for match in re.finditer(r"[{};]", body):
+        segment = body[start:match.start()]
+        start = match.end()
+        if match.group(0) == "{":
+            stack.append((LOOP_KEYWORD.search(segment) is not None,
+                          match.end()))
+        elif match.group(0) == "}":
+            if stack:
+                is_loop, begin = stack.pop()
+                if is_loop:
+                    ranges.append((begin, match.start()))
+        elif LOOP_KEYWORD.search(segment):
+            # Brace-less loop: "while (x) yield return ...;"
+            ranges.append((match.start() - len(segment), match.start()))
+    return ranges
+
+
+def check_performance(source, hot=None):
+    """Return PerfFindings for C# source, most frequent first.
+
+    hot maps (class, method) to (rank, entry) for this file, as given by
+    call_graph.hot_methods_in(); without it only calls within the file are
+    followed.
+    """
+    if hot is None:
+        hot = file_hot_methods(source)
+    code, _ = strip_literals(source)
+    methods = parse_methods(code)
+    uses_linq = LINQ_IMPORT.search(source) is not None
+    findings = set()
+
+    def line_of(offset):
+        return code.count("\n", 0, offset) + 1
+
+    for method in methods:
+        body = code[method.start:method.end]
+
+        key = (method.class_name, method.name)
+        if key in hot:
+            rank, entry = hot[key]
+            where = FREQUENCY_LABELS[rank]
+            if entry != f"{method.class_name}.{method.name}":
+                where += f", via {entry}()"
+            for rule, min_rank, pattern, message in HOT_PATH_RULES:
+                if rank < min_rank or (rule == "PERF_LINQ" and not uses_linq):
+                    continue
+                for match in pattern.finditer(body):
+                    offset = method.start + match.start()
+                    if rule in ("PERF_DEBUG_LOG", "PERF_STRING"):
+                        statement = code[max(code.rfind(";", 0, offset),
+                                             code.rfind("}", 0, offset)):offset]
+                        if rule == "PERF_DEBUG_LOG" and \
+                                LOG_GUARD.search(statement):
+                            continue
+                        if rule == "PERF_STRING" and LOG_CALL.search(statement):
+                            continue
+                    findings.add(PerfFinding(
+                        line_of(offset), rule,
+                        f"{message} ({method.name}, {where})", rank))
+
+        if method.returns == "IEnumerator":
+            loops = loop_offsets(body)
+            for match in WAIT_ALLOC.finditer(body):
+                if any(begin <= match.start() < end for begin, end in loops):
+                    findings.add(PerfFinding(
+                        line_of(method.start + match.start()),
+                        "PERF_WAIT_ALLOC",
+                        "new yield instruction every loop iteration — cache "
+                        f"it in a field ({method.name})", PER_EVENT))
+
+    return sorted(findings, key=lambda f: (-f.rank, f.line, f.rule))
@@ -1,27 +1,417 @@
 #!/usr/bin/env python3
-"""Run all CI checks and report aggregate results."""
+"""Run all CI checks and report aggregate results.
 
+Checks are imported and run in this interpreter with one shared
+CheckContext, so directory listings, the GUID index and the parsed TagManager
+are built once. --isolated runs each check in its own subprocess instead
+(also used automatically when a check cannot be imported). Findings from
+either mode land on one Report; use --json / --sarif to write them out.
+
+--git-tree [REV] reads a git revision's objects instead of the working tree
+(see git_tree.py), for checkouts without file contents. Only the checks in
+git_tree.GIT_TREE_CHECKS can run that way; the others are skipped.
+
+Each check's duration is kept in a small history (Library/CICache). With
+--jobs N the checks run as parallel subprocesses, longest first by that
+history, so the slowest one starts immediately. Each check's timeout is its
+p95 duration times TIMEOUT_FACTOR rather than one constant; in-process
+checks run on a worker thread held to the same budget. A thread cannot be
+stopped, so after an in-process timeout the remaining checks run as
+subprocesses, clear of the abandoned check's shared state.
+The summary ends with the critical path: the checks on the worker that
+finished last, which bound the total time.
+
+Findings recorded in the baseline file (ci/findings-baseline.txt by default)
+are suppressed, so only new ones are printed and counted; a check that fails
+only on baselined errors passes, unless it crashed or timed out.
+--update-baseline rewrites the file from the current findings.
+"""
+
+import argparse
+import importlib
+import json
+import math
 import os
 import subprocess
 import sys
+import tempfile
+import threading
 import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
+from context import CheckContext, cache_path
+from findings import (BASELINE_ENV, FINDINGS_ENV, GITHUB_ACTIONS, Baseline,
+                      Finding, Report)
+from git_tree import GIT_TREE_CHECKS, GitTreeContext
 
+# (display name, module, entry point)
 CHECKS = [
-    ("Meta File Integrity", "check_meta_files.py"),
-    ("GUID References", "check_guid_references.py"),
-    ("Layer/Tag Consistency", "check_layer_consistency.py"),
-    ("Build Scene Validation", "check_scene_build_settings.py"),
-    ("Code Style", "check_code_style.py"),
+    ("Meta File Integrity", "check_meta_files", "check_meta_files"),
+    ("Meta File Content", "check_meta_content", "check_meta_content"),
+    ("GUID References", "check_guid_references", "check_guid_references"),
+    ("Layer/Tag Consistency", "check_layer_consistency",
+     "check_layer_consistency"),
+    ("Build Scene Validation", "check_scene_build_settings",
+     "check_scene_build_settings"),
+    ("Code Style", "check_code_style", "check_code_style"),
+    ("Texture Import Settings", "check_texture_import",
+     "check_texture_import"),
+    ("Duplicate Images", "check_duplicate_images", "check_duplicate_images"),
+    ("Animation Clips", "check_animation_clips", "check_animation_clips"),
+    ("Material Variants", "check_material_variants",
+     "check_material_variants"),
+    ("Prefab Overrides", "check_prefab_overrides", "check_prefab_overrides"),
+    ("Resources Footprint", "check_resources", "check_resources"),
+    ("Script References", "check_script_references",
+     "check_script_references"),
 ]
 
-GITHUB_ACTIONS = os.environ.get("GITHUB_ACTIONS") == "true"
+# Timeout for a check without enough history
+SUBPROCESS_TIMEOUT = 120
+# Adaptive timeout: p95 of recent durations times this, within the bounds
+TIMEOUT_FACTOR = 3
+MIN_TIMEOUT = 30
+MAX_TIMEOUT = 600
+MIN_SAMPLES = 3
+
+HISTORY_NAME = "check-durations.json"
+# Durations kept per check and run mode
+HISTORY_SIZE = 20
+
+# Exit code of a check that raised, timed out or could not be started.
+# Subprocesses killed by a signal report negative codes as well; the
+# baseline never turns a negative code into a pass.
+CRASHED = -1
+# Exit code of an in-process check abandoned past its time budget
+TIMED_OUT = -2
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                "findings-baseline.txt")
+
+
+def run_in_process(ctx, name, module_name, func_name, report, paths=None,
+                   timeout=None):
+    """Import a check module and call its entry point with the shared context.
+
+    paths limits the check to those files/directories (watch mode). With a
+    timeout the check runs on a worker thread into its own Report, merged
+    into report when it finishes; past the budget it is abandoned and
+    TIMED_OUT returned. Returns the exit code, or None if the check could
+    not be loaded.
+    """
+    try:
+        entry = getattr(importlib.import_module(module_name), func_name)
+    except (ImportError, AttributeError) as e:
+        print(f"  Cannot load {module_name}.{func_name} in-process ({e})")
+        return None
+
+    if timeout is not None:
+        own = Report(check=name, baseline=report.baseline, ctx=report.ctx)
+        outcome = []
+
+        def work():
+            outcome.append(run_in_process(ctx, name, module_name, func_name,
+                                          own, paths))
+
+        thread = threading.Thread(target=work, name=f"check-{module_name}",
+                                  daemon=True)
+        thread.start()
+        thread.join(timeout)
+        if thread.is_alive():
+            print(f"  -> TIMEOUT ({timeout}s)")
+            return TIMED_OUT
+        report.absorb(own)
+        return outcome[0]
+
+    report.check = name
+    try:
+        if paths is None:
+            return entry(ctx.root, report, ctx)
+        return entry(ctx.root, report, ctx, paths=paths)
+    except Exception:
+        traceback.print_exc()
+        return CRASHED
+    finally:
+        report.check = None
+
+
+def run_subprocess(script_dir, module_name, baseline=None,
+                   timeout=SUBPROCESS_TIMEOUT, capture=False):
+    """Run a check script in its own interpreter.
+
+    Returns (exit code, captured output or None, exported findings data or
+    None); the code is None if the script does not exist. Safe to call from
+    worker threads: nothing here touches shared state.
+    """
+    script_path = os.path.join(script_dir, module_name + ".py")
+    if not os.path.exists(script_path):
+        return None, f"SKIP: {module_name}.py not found\n", None
+
+    fd, findings_path = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    env = dict(os.environ, **{FINDINGS_ENV: findings_path})
+    if baseline is not None:
+        env[BASELINE_ENV] = baseline.path
+    output = None
+    try:
+        result = subprocess.run(
+            [sys.executable, script_path], env=env, timeout=timeout,
+            stdout=subprocess.PIPE if capture else None,
+            stderr=subprocess.STDOUT if capture else None,
+            text=capture, errors="replace" if capture else None)
+        code = result.returncode
+        output = result.stdout
+    except subprocess.TimeoutExpired as e:
+        partial = e.stdout or ""
+        if isinstance(partial, bytes):
+            partial = partial.decode("utf-8", errors="replace")
+        output = partial + f"  -> TIMEOUT ({timeout}s)\n"
+        code = CRASHED
+    except Exception as e:
+        output = f"  -> ERROR: {e}\n"
+        code = CRASHED
+
+    data = None
+    try:
+        with open(findings_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        pass
+    finally:
+        os.remove(findings_path)
+    if data and data.get("crashed"):
+        code = CRASHED
+
+    if not capture and output:
+        print(output, end="")
+        output = None
+    return code, output, data
+
+
+def merge_findings(report, name, data):
+    """Add the findings a check subprocess exported to report."""
+    if not data:
+        return
+    try:
+        for item in data.get("findings", []):
+            item["check"] = name
+        report.merge(Finding.from_dict(item) for item in data["findings"])
+        for level, n in data.get("baselined", {}).items():
+            report.suppressed[(level, name)] += n
+    except (KeyError, TypeError):
+        pass
+
+
+def run_in_subprocess(script_dir, name, module_name, report,
+                      timeout=SUBPROCESS_TIMEOUT):
+    """Run a check script in its own interpreter and merge its findings.
+
+    Returns the exit code, or None if the script does not exist.
+    """
+    code, _, data = run_subprocess(script_dir, module_name, report.baseline,
+                                   timeout)
+    merge_findings(report, name, data)
+    return code
+
+
+def load_history(root):
+    """{run mode: {check name: [recent durations]}}."""
+    try:
+        with open(cache_path(root, HISTORY_NAME), encoding="utf-8") as f:
+            history = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return history if isinstance(history, dict) else {}
+
+
+def save_history(root, history):
+    path = cache_path(root, HISTORY_NAME)
+    tmp_path = path + ".tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(history, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def adaptive_timeout(durations):
+    """p95 x TIMEOUT_FACTOR, or SUBPROCESS_TIMEOUT with too little history."""
+    if len(durations) < MIN_SAMPLES:
+        return SUBPROCESS_TIMEOUT
+    budget = math.ceil(percentile(durations, 95) * TIMEOUT_FACTOR)
+    return min(MAX_TIMEOUT, max(MIN_TIMEOUT, budget))
+
+
+def longest_first(checks, durations):
+    """Order checks by expected duration, longest (or never timed) first."""
+    def expected(check):
+        samples = durations.get(check[0])
+        return percentile(samples, 50) if samples else math.inf
+    return sorted(checks, key=expected, reverse=True)
+
+
+def critical_path(spans):
+    """The spans of the worker that finished last, in run order.
+
+    spans: [(name, lane, start, end)] with times relative to the run start.
+    """
+    if not spans:
+        return []
+    last_lane = max(spans, key=lambda s: s[3])[1]
+    return sorted((s for s in spans if s[1] == last_lane),
+                  key=lambda s: s[2])
+
+
+def run_parallel(script_dir, checks, report, durations, jobs, run_start):
+    """Run checks as subprocesses on jobs workers, longest first.
+
+    Output is captured per check and printed as each one finishes. Returns
+    ({name: (code, elapsed)}, spans).
+    """
+    def task(module_name, timeout):
+        start = time.time() - run_start
+        code, output, data = run_subprocess(
+            script_dir, module_name, report.baseline, timeout, capture=True)
+        end = time.time() - run_start
+        return code, output, data, threading.current_thread().name, start, end
+
+    outcomes = {}
+    spans = []
+    with ThreadPoolExecutor(max_workers=jobs,
+                            thread_name_prefix="worker") as pool:
+        # The pool starts tasks in submission order
+        futures = {}
+        for name, module_name, _ in longest_first(checks, durations):
+            timeout = adaptive_timeout(durations.get(name, []))
+            futures[pool.submit(task, module_name, timeout)] = name
+
+        for future in as_completed(futures):
+            name = futures[future]
+            code, output, data, lane, start, end = future.result()
+            print("=" * 60)
+            print(name)
+            print("=" * 60)
+            print(output or "", end="")
+            merge_findings(report, name, data)
+            elapsed = end - start
+            if code is not None:
+                print(f"  -> {'FAIL' if code else 'PASS'} ({elapsed:.1f}s)")
+                spans.append((name, lane, start, end))
+            print()
+            outcomes[name] = (code, elapsed)
+    return outcomes, spans
+
+
+def watch_loop(ctx, interval, baseline=None):
+    """Poll for changes and re-run only the checks (and files) they affect."""
+    from watch import WATCH_DIRS, diff, route, snapshot
+
+    print(f"Watching {', '.join(WATCH_DIRS)} (Ctrl+C to stop)...")
+    state = snapshot(ctx.root)
+
+    try:
+        while True:
+            time.sleep(interval)
+            new_state = snapshot(ctx.root)
+            added, removed, modified = diff(state, new_state)
+            state = new_state
+            if not (added or removed or modified):
+                continue
+
+            start = time.time()
+            scopes = route(ctx.root, ctx, added, removed, modified)
+            report = Report(baseline=baseline, ctx=ctx)
+            print()
+            print(f"{len(added) + len(removed) + len(modified)} change(s): "
+                  f"{len(added)} added, {len(removed)} removed, "
+                  f"{len(modified)} modified")
+
+            for name, module_name, func_name in CHECKS:
+                if name not in scopes:
+                    continue
+                paths = scopes[name]
+                print("-" * 60)
+                print(f"{name} ({'full' if paths is None else f'{len(paths)} path(s)'})")
+                print("-" * 60)
+                run_in_process(ctx, name, module_name, func_name, report,
+                               None if paths is None else sorted(paths))
+
+            if not scopes:
+                print("  No checks affected")
+            print(f"Done in {time.time() - start:.2f}s: "
+                  f"{report.count('error')} error(s), "
+                  f"{report.count('warning')} warning(s)")
+    except KeyboardInterrupt:
+        print("\nStopped watching")
+    return 0
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Run all Unity CI checks")
+    parser.add_argument("--json", default=None,
+                        help="Write all findings to this JSON file")
+    parser.add_argument("--sarif", default=None,
+                        help="Write all findings to this SARIF 2.1.0 file")
+    parser.add_argument("--isolated", action="store_true",
+                        help="Run each check in its own subprocess")
+    parser.add_argument("--jobs", "-j", type=int, default=1,
+                        help="Run up to this many checks at once, as "
+                             "subprocesses (implies --isolated)")
+    parser.add_argument("--watch", action="store_true",
+                        help="After the full run, keep indexes in memory and "
+                             "re-run affected checks when files change")
+    parser.add_argument("--interval", type=float, default=1.0,
+                        help="Watch poll interval in seconds (default: 1.0)")
+    parser.add_argument("--git-tree", nargs="?", const="HEAD", default=None,
+                        metavar="REV",
+                        help="Check the files of a git revision (default "
+                             "HEAD) through git objects, not the working tree")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE,
+                        help="Suppress findings recorded in this file "
+                             "(default: ci/findings-baseline.txt, if present)")
+    parser.add_argument("--no-baseline", action="store_true",
+                        help="Report every finding, ignoring the baseline")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Record all current findings as the baseline")
+    args = parser.parse_args()
+
     script_dir = os.path.dirname(os.path.abspath(__file__))
-    python = sys.executable
-    results = []
+    root = os.path.dirname(script_dir)
+    if args.jobs > 1:
+        args.isolated = True
+    if args.git_tree:
+        if args.isolated or args.watch:
+            parser.error("--git-tree cannot be combined with --isolated, "
+                         "--jobs or --watch")
+        try:
+            ctx = GitTreeContext(root, args.git_tree)
+        except (OSError, subprocess.CalledProcessError) as e:
+            print(f"ERROR: Cannot read git tree {args.git_tree}: {e}")
+            return 1
+    else:
+        ctx = CheckContext(root)
+    baseline = None
+    if not (args.no_baseline or args.update_baseline) \
+            and os.path.exists(args.baseline):
+        baseline = Baseline.load(root, args.baseline)
+        print(f"Baseline: {len(baseline)} known finding(s) from "
+              f"{os.path.relpath(args.baseline, root)}")
+    report = Report(baseline=baseline, ctx=ctx)
+
+    # In-process runs share indexes, so their durations are not comparable
+    # with subprocess runs; keep them apart
+    mode = ("git-tree" if args.git_tree
+            else "isolated" if args.isolated else "in-process")
+    history = load_history(root)
+    durations = history.setdefault(mode, {})
 
     print("=" * 60)
     print("Unity CI — Asset Validation Suite")
@@ -29,36 +419,56 @@ def main():
     print()
 
     overall_start = time.time()
+    outcomes = {}
+    spans = []
 
-    for name, script in CHECKS:
-        script_path = os.path.join(script_dir, script)
+    if args.jobs > 1:
+        outcomes, spans = run_parallel(script_dir, CHECKS, report, durations,
+                                       args.jobs, overall_start)
 
-        if not os.path.exists(script_path):
-            print(f"SKIP: {name} — {script} not found")
-            results.append((name, None))
+    for name, module_name, func_name in CHECKS:
+        if name in outcomes:
             continue
+        print("=" * 60)
+        print(name)
+        print("=" * 60)
 
         start = time.time()
-        try:
-            result = subprocess.run(
-                [python, script_path],
-                capture_output=False,
-                timeout=120,
-            )
-            elapsed = time.time() - start
-            results.append((name, result.returncode))
-            print(f"  -> {'FAIL' if result.returncode else 'PASS'} ({elapsed:.1f}s)")
-        except subprocess.TimeoutExpired:
-            elapsed = time.time() - start
-            print(f"  -> TIMEOUT ({elapsed:.1f}s)")
-            results.append((name, 1))
-        except Exception as e:
-            print(f"  -> ERROR: {e}")
-            results.append((name, 1))
-
+        code = None
+        if args.git_tree and module_name not in GIT_TREE_CHECKS:
+            print("SKIP: reads the working tree")
+            outcomes[name] = (None, 0.0)
+            print()
+            continue
+        timeout = adaptive_timeout(durations.get(name, []))
+        if not args.isolated:
+            code = run_in_process(ctx, name, module_name, func_name, report,
+                                  timeout=timeout)
+            if code == TIMED_OUT and not args.git_tree:
+                # A git tree can only be read in-process
+                print("  Running the remaining checks as subprocesses")
+                args.isolated = True
+        if code is None:
+            code = run_in_subprocess(script_dir, name, module_name, report,
+                                     timeout)
+        elapsed = time.time() - start
+        outcomes[name] = (code, elapsed)
+        if code is not None:
+            spans.append((name, "main", start - overall_start,
+                          start + elapsed - overall_start))
+            print(f"  -> {'FAIL' if code else 'PASS'} ({elapsed:.1f}s)")
         print()
 
     overall_elapsed = time.time() - overall_start
+    ctx.close()
+
+    results = [(name, *outcomes[name]) for name, _, _ in CHECKS]
+    for name, code, elapsed in results:
+        if code is not None:
+            samples = durations.setdefault(name, [])
+            samples.append(round(elapsed, 3))
+            del samples[:-HISTORY_SIZE]
+    save_history(root, history)
 
     # Summary
     print("=" * 60)
@@ -66,7 +476,14 @@ def main():
     print("=" * 60)
 
     failed = 0
-    for name, code in results:
+    for i, (name, code, elapsed) in enumerate(results):
+        if code is not None and code > 0 \
+                and not report.count("error", name) \
+                and report.count_suppressed("error", name):
+            # Every error it found is in the baseline (a crashed check may
+            # have stopped before reporting the rest, so it keeps failing)
+            code = 0
+            results[i] = (name, code, elapsed)
         if code is None:
             status = "SKIP"
         elif code == 0:
@@ -74,18 +491,61 @@ def main():
         else:
             status = "FAIL"
             failed += 1
-        print(f"  {status:4s}  {name}")
+        suppressed = report.count_suppressed(check=name)
+        print(f"  {status:4s}  {name:24s} "
+              f"{report.count('error', name):4d} error(s) "
+              f"{report.count('warning', name):4d} warning(s)"
+              + (f" ({suppressed} baselined)" if suppressed else "")
+              + (" (timed out)" if code == TIMED_OUT else
+                 " (crashed)" if code is not None and code < 0 else ""))
 
     print()
     print(f"Total: {len(results)} checks, "
-          f"{sum(1 for _, c in results if c == 0)} passed, "
+          f"{sum(1 for _, c, _ in results if c == 0)} passed, "
           f"{failed} failed, "
-          f"{sum(1 for _, c in results if c is None)} skipped "
+          f"{sum(1 for _, c, _ in results if c is None)} skipped "
           f"({overall_elapsed:.1f}s)")
 
+    path = critical_path(spans)
+    if path:
+        lanes = len({lane for _, lane, _, _ in spans})
+        print()
+        print(f"Critical path ({path[-1][3]:.1f}s of {overall_elapsed:.1f}s, "
+              f"{lanes} worker(s)):")
+        for name, _, start, end in path:
+            print(f"  {start:6.1f}s  {name:24s} {end - start:6.1f}s")
+        if lanes > 1:
+            name, _, start, end = max(spans, key=lambda s: s[3] - s[2])
+            print(f"  Longest single check: {name} ({end - start:.1f}s); "
+                  "more jobs cannot finish sooner")
+
+    if args.update_baseline:
+        fingerprints = report.fingerprints(root)
+        Baseline.save(args.baseline, fingerprints)
+        print(f"Baseline of {len(fingerprints)} finding(s) written to "
+              f"{os.path.relpath(args.baseline, root)}")
+
+    meta = {
+        "elapsed": round(overall_elapsed, 2),
+        "baselined": report.count_suppressed(),
+        "checks": [{"name": name, "exit_code": code,
+                    "elapsed": round(elapsed, 2)}
+                   for name, code, elapsed in results],
+    }
+    if args.json:
+        report.to_json(args.json, **meta)
+        print(f"Findings written to {args.json}")
+    if args.sarif:
+        report.to_sarif(args.sarif)
+        print(f"SARIF written to {args.sarif}")
+
     if GITHUB_ACTIONS and failed:
         print(f"\n::error::CI failed: {failed} check(s) did not pass")
 
+    if args.watch:
+        print()
+        return watch_loop(ctx, args.interval, baseline)
+
     return 1 if failed > 0 else 0
 
 
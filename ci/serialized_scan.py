@@ -0,0 +1,157 @@
+"""One shared read of Unity's serialized YAML assets.
+
+Several checks look at the same scenes, prefabs and assets: the GUID check
+wants every `guid:` reference, the layer/tag check wants `m_Layer`,
+`m_TagString` and `m_SortingLayerID`, the script reference check wants each
+MonoBehaviour's `m_Script` and serialized field names. Each file is read
+once with a single regex that captures all of them, the files are spread
+over a thread pool (or streamed from one batched read on a git tree
+context), and the results are memoized on the CheckContext for whichever
+check asks next.
+"""
+
+import os
+import re
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+# Trees whose serialized data we own and validate
+SERIALIZED_ROOTS = (os.path.join("Assets", "_Project"),
+                    os.path.join("Assets", "Scenes"))
+
+SERIALIZED_EXTENSIONS = {".prefab", ".unity", ".anim", ".asset", ".controller",
+                         ".overrideController", ".mat", ".playable",
+                         ".signal", ".spriteatlasv2", ".lighting"}
+
+SERIALIZED_PATTERN = re.compile(
+    r"^  m_Script: \{fileID: 11500000, guid: (?P<script>[0-9a-f]{32})"
+    r"|guid:\s*(?P<guid>[0-9a-f]{32})"
+    r"|^[ \t]*(?P<field>m_Layer|m_TagString|m_SortingLayerID):[ \t]*"
+    r"(?P<value>[^\r\n]*)", re.M)
+# Top-level keys of a MonoBehaviour block, i.e. its serialized fields
+BLOCK_KEY_PATTERN = re.compile(r"^  (\w+):", re.M)
+# m_Script is followed by these built-in keys, not script fields
+BUILTIN_BLOCK_KEYS = {"m_Name", "m_EditorClassIdentifier"}
+
+SCAN_WORKERS = min(8, os.cpu_count() or 1)
+
+# guids: [(line, guid)]; fields: [(line, name, raw value)];
+# scripts: [(line, script guid, [(line, serialized field name)])]
+SerializedScan = namedtuple("SerializedScan", "guids fields scripts")
+EMPTY_SCAN = SerializedScan((), (), ())
+
+
+def scan_serialized_file(filepath):
+    """Read one YAML asset and return its SerializedScan."""
+    try:
+        with open(filepath, "r", encoding="utf-8", errors="replace") as f:
+            content = f.read()
+    except OSError:
+        return EMPTY_SCAN
+    return scan_serialized_content(content)
+
+
+def scan_serialized_content(content):
+    """SerializedScan of one YAML asset's text."""
+    guids = []
+    fields = []
+    scripts = []
+    line_num = 1
+    pos = 0
+    for match in SERIALIZED_PATTERN.finditer(content):
+        line_num += content.count("\n", pos, match.start())
+        pos = match.start()
+        kind = match.lastgroup
+        if kind == "guid":
+            guids.append((line_num, match.group("guid")))
+        elif kind == "script":
+            guid = match.group("script")
+            guids.append((line_num, guid))
+            scripts.append((line_num, guid,
+                            read_block_keys(content, match.end(), line_num)))
+        else:
+            fields.append((line_num, match.group("field"),
+                           match.group("value").strip()))
+    return SerializedScan(guids, fields, scripts)
+
+
+def read_block_keys(content, start, line_num):
+    """Return [(line, key)] for the top-level keys from start to block end."""
+    end = content.find("\n--- ", start)
+    if end < 0:
+        end = len(content)
+    keys = []
+    pos = start
+    for match in BLOCK_KEY_PATTERN.finditer(content, start, end):
+        line_num += content.count("\n", pos, match.start())
+        pos = match.start()
+        if match.group(1) not in BUILTIN_BLOCK_KEYS:
+            keys.append((line_num, match.group(1)))
+    return keys
+
+
+def iter_serialized(root, ctx):
+    """Yield every serialized asset under SERIALIZED_ROOTS."""
+    for name in SERIALIZED_ROOTS:
+        top = os.path.join(root, name)
+        if not ctx.isdir(top):
+            continue
+        for dirpath, _, filenames in ctx.walk(top):
+            for fname in filenames:
+                if os.path.splitext(fname)[1].lower() in SERIALIZED_EXTENSIONS:
+                    yield os.path.join(dirpath, fname)
+
+
+def scan_files(scans, paths, ctx=None):
+    """Scan paths in parallel and store the results in scans.
+
+    A context with batched reads (a git tree) streams the contents instead.
+    """
+    paths = list(paths)
+    if ctx is not None and ctx.batched_reads:
+        for path, data in ctx.read_many(paths):
+            scans[path] = EMPTY_SCAN if data is None else \
+                scan_serialized_content(data.decode("utf-8", errors="replace"))
+        return
+    if len(paths) < 2 * SCAN_WORKERS:
+        for path in paths:
+            scans[path] = scan_serialized_file(path)
+        return
+    with ThreadPoolExecutor(max_workers=SCAN_WORKERS) as pool:
+        for path, scan in zip(paths, pool.map(scan_serialized_file, paths,
+                                              chunksize=32)):
+            scans[path] = scan
+
+
+def load_serialized_scans(root, ctx):
+    """Return {path: SerializedScan} for everything under SERIALIZED_ROOTS.
+
+    Built once per CheckContext; watch mode keeps it current with
+    patch_serialized_scans() instead of rebuilding.
+    """
+    def build():
+        scans = {}
+        scan_files(scans, iter_serialized(root, ctx), ctx)
+        return scans
+
+    return ctx.memo("serialized_scans", build)
+
+
+def get_scan(scans, path):
+    """The memoized scan of path, reading it now if it was not indexed."""
+    scan = scans.get(path)
+    if scan is None:
+        scan = scans[path] = scan_serialized_file(path)
+    return scan
+
+
+def patch_serialized_scans(ctx, changed, removed):
+    """Re-read changed serialized files and drop removed ones in place."""
+    scans = ctx.peek("serialized_scans")
+    if scans is None:
+        return
+    scan_files(scans, (p for p in changed
+                       if os.path.splitext(p)[1].lower() in SERIALIZED_EXTENSIONS
+                       and os.path.isfile(p)))
+    for path in removed:
+        scans.pop(path, None)
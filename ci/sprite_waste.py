@@ -0,0 +1,429 @@
+#!/usr/bin/env python3
+"""Measure transparent padding in sprite sheets.
+
+Sheets like Monsters Creatures Fantasy/Sprites/*/Attack1.png are long strips
+of fixed-size frames, most of each frame transparent. The padding still
+costs texture memory, and with a Full Rect mesh every transparent pixel is
+drawn (fill rate). For each sheet in Multiple sprite mode this loads the
+alpha channel once and computes the opaque bounding box inside every sprite
+rect from the .meta, then reports:
+
+  padding  transparent area inside the rects (what tighter rects would trim)
+  unused   sheet area no rect covers
+  wasted   everything outside the opaque boxes, as a share of the sheet and
+           in bytes at the texture's import settings (see check_texture_import)
+
+Recommendations per sheet: tighter rects, a Tight mesh, dropping empty
+frames, or atlas packing when the trimmed frames would fit a texture at
+most half the size.
+
+Bounding boxes use NumPy when installed (one array per sheet, sliced per
+rect) and Pillow's getbbox() otherwise; Pillow itself is required. Sheets
+are analyzed on a process pool, and results are cached in Library/CICache
+by the (mtime, size) of both the image and its .meta.
+
+Usage:
+    python ci/sprite_waste.py                              # All of Assets/
+    python ci/sprite_waste.py "Assets/Monsters Creatures Fantasy"
+    python ci/sprite_waste.py --sort wasted_kb --top 50
+    python ci/sprite_waste.py --csv sprite-waste.csv       # One row per sheet
+    python ci/sprite_waste.py --csv frames.csv --frames    # One row per frame
+"""
+
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from check_texture_import import estimate_bytes, read_texture_settings
+from context import CheckContext, cache_path
+from image_index import IMAGE_EXTENSIONS
+
+CACHE_NAME = "sprite-waste.json"
+CACHE_VERSION = 1
+
+SPRITE_MODE_MULTIPLE = "2"
+MESH_FULL_RECT = "0"
+
+# Alpha above this counts as opaque (antialiased fringes of 1-2 are noise)
+ALPHA_THRESHOLD = 2
+# Recommend tighter rects / a Tight mesh above this share of padding
+PADDING_THRESHOLD = 0.30
+# Share of a packed atlas actually filled by sprites (packing overhead)
+PACK_EFFICIENCY = 0.85
+
+ANALYZE_WORKERS = min(8, os.cpu_count() or 1)
+MIN_POOL_JOBS = 16
+
+SPRITE_MODE_PATTERN = re.compile(r"^  spriteMode: (\d+)", re.M)
+MESH_TYPE_PATTERN = re.compile(r"^  spriteMeshType: (\d+)", re.M)
+RECT_PATTERN = re.compile(
+    r"^      name: (?P<name>.*?)\r?\n"
+    r"      rect:\r?\n"
+    r"        serializedVersion: \d+\r?\n"
+    r"        x: (?P<x>[-\d.e]+)\r?\n"
+    r"        y: (?P<y>[-\d.e]+)\r?\n"
+    r"        width: (?P<width>[-\d.e]+)\r?\n"
+    r"        height: (?P<height>[-\d.e]+)", re.M)
+
+SORT_KEYS = {
+    "waste": lambda s: -s["wasted_pct"],
+    "wasted_kb": lambda s: -s["wasted_kb"],
+    "padding": lambda s: -s["padding_pct"],
+    "frames": lambda s: -s["frames"],
+    "path": lambda s: s["path"],
+}
+SHEET_COLUMNS = ["path", "width", "height", "frames", "empty_frames",
+                 "padding_pct", "unused_pct", "wasted_pct", "wasted_kb",
+                 "mesh", "recommendations"]
+FRAME_COLUMNS = ["path", "frame", "x", "y", "width", "height",
+                 "trim_x", "trim_y", "trim_width", "trim_height",
+                 "padding_pct"]
+
+
+def read_sprite_rects(meta_path):
+    """Return (rects, mesh type) of a Multiple-mode sprite .meta, or None.
+
+    rects: [(name, x, y, width, height)] in Unity's coordinates (origin at
+    the bottom-left of the texture).
+    """
+    try:
+        with open(meta_path, encoding="utf-8", errors="replace") as f:
+            text = f.read()
+    except OSError:
+        return None
+    mode = SPRITE_MODE_PATTERN.search(text)
+    if not mode or mode.group(1) != SPRITE_MODE_MULTIPLE:
+        return None
+    sheet = text.find("\n  spriteSheet:")
+    if sheet < 0:
+        return None
+    rects = [(m.group("name"),
+              *(int(round(float(m.group(k))))
+                for k in ("x", "y", "width", "height")))
+             for m in RECT_PATTERN.finditer(text, sheet)]
+    mesh = MESH_TYPE_PATTERN.search(text)
+    return rects, mesh.group(1) if mesh else None
+
+
+def opaque_bboxes(alpha, rects):
+    """Opaque bounding box of each rect as (left, top, right, bottom) in image
+    rows/columns (half-open), or None for a fully transparent rect.
+
+    alpha is the Pillow "L" alpha channel; rects are (left, top, right,
+    bottom) boxes already clipped to the image.
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        mask = alpha.point(lambda v: 255 if v > ALPHA_THRESHOLD else 0)
+        boxes = []
+        for left, top, right, bottom in rects:
+            box = mask.crop((left, top, right, bottom)).getbbox()
+            boxes.append(None if box is None else
+                         (left + box[0], top + box[1],
+                          left + box[2], top + box[3]))
+        return boxes
+
+    opaque = np.asarray(alpha) > ALPHA_THRESHOLD
+    boxes = []
+    for left, top, right, bottom in rects:
+        frame = opaque[top:bottom, left:right]
+        rows = np.flatnonzero(frame.any(axis=1))
+        if not rows.size:
+            boxes.append(None)
+            continue
+        cols = np.flatnonzero(frame.any(axis=0))
+        boxes.append((left + int(cols[0]), top + int(rows[0]),
+                      left + int(cols[-1]) + 1, top + int(rows[-1]) + 1))
+    return boxes
+
+
+def analyze_sheet(path):
+    """Return the raw analysis of one sheet, or None if it doesn't apply.
+
+    Runs in a worker process. Frame boxes are converted back to Unity's
+    bottom-left coordinates so they can be pasted into the .meta.
+    """
+    from PIL import Image
+
+    parsed = read_sprite_rects(path + ".meta")
+    if not parsed or not parsed[0]:
+        return None
+    rects, mesh = parsed
+    try:
+        with Image.open(path) as img:
+            img.load()
+            width, height = img.size
+            if "A" in img.getbands():
+                alpha = img.getchannel("A")
+            elif "transparency" in img.info:
+                alpha = img.convert("RGBA").getchannel("A")
+            else:
+                alpha = Image.new("L", img.size, 255)
+    except (OSError, ValueError, Image.DecompressionBombError):
+        return None
+
+    boxes = []
+    for _, x, y, w, h in rects:
+        # Unity's y counts up from the bottom row; images count down
+        left, right = max(0, x), min(width, x + w)
+        top, bottom = max(0, height - y - h), min(height, height - y)
+        boxes.append((left, top, max(left, right), max(top, bottom)))
+
+    frames = []
+    for (name, *rect), trim in zip(rects, opaque_bboxes(alpha, boxes)):
+        if trim is not None:
+            trim = (trim[0], height - trim[3],
+                    trim[2] - trim[0], trim[3] - trim[1])
+        frames.append([name, *rect, *(trim or (0, 0, 0, 0))])
+    return {"width": width, "height": height, "mesh": mesh,
+            "frames": frames}
+
+
+def summarize(rel_path, raw, settings):
+    """Per-sheet waste figures and recommendations from analyze_sheet()."""
+    width, height = raw["width"], raw["height"]
+    area = width * height
+    rect_area = trim_area = 0
+    empty = 0
+    max_trim_w = max_trim_h = 0
+    for _, _, _, w, h, _, _, tw, th in raw["frames"]:
+        rect_area += w * h
+        trim_area += tw * th
+        empty += tw * th == 0
+        max_trim_w, max_trim_h = max(max_trim_w, tw), max(max_trim_h, th)
+    rect_area = min(rect_area, area)
+
+    padding = (rect_area - trim_area) / rect_area if rect_area else 0.0
+    unused = (area - rect_area) / area if area else 0.0
+    wasted = (area - trim_area) / area if area else 0.0
+    memory = estimate_bytes(settings, settings["max_size"], (width, height)) \
+        if settings else area * 4
+
+    recommendations = []
+    if empty:
+        recommendations.append(f"remove {empty} empty frame(s)")
+    if padding >= PADDING_THRESHOLD:
+        recommendations.append("tighten rects")
+        if raw["mesh"] == MESH_FULL_RECT:
+            recommendations.append("use Tight mesh type")
+    packed = packed_size(trim_area, max_trim_w, max_trim_h)
+    if packed and packed[0] * packed[1] * 2 <= area:
+        recommendations.append(f"pack into {packed[0]}x{packed[1]} atlas")
+
+    return {
+        "path": rel_path, "width": width, "height": height,
+        "frames": len(raw["frames"]), "empty_frames": empty,
+        "padding_pct": round(padding * 100, 1),
+        "unused_pct": round(unused * 100, 1),
+        "wasted_pct": round(wasted * 100, 1),
+        "wasted_kb": round(memory * wasted / 1024, 1),
+        "mesh": "full" if raw["mesh"] == MESH_FULL_RECT else "tight",
+        "recommendations": "; ".join(recommendations),
+    }
+
+
+def packed_size(area, min_width, min_height):
+    """Smallest power-of-two texture that could hold area of trimmed
+    sprites (allowing for packing overhead), or None if nothing is opaque.
+    """
+    if not area:
+        return None
+    needed = area / PACK_EFFICIENCY
+    width = height = 1
+    while width < min_width:
+        width *= 2
+    while height < min_height:
+        height *= 2
+    # Grow the shorter side first to stay close to square
+    while width * height < needed:
+        if width <= height:
+            width *= 2
+        else:
+            height *= 2
+    return width, height
+
+
+def iter_sheets(root, dirs, ctx):
+    """Yield image files under dirs that have a .meta next to them."""
+    for top in dirs:
+        for dirpath, _, filenames in ctx.walk(top):
+            names = set(filenames)
+            for fname in filenames:
+                if (os.path.splitext(fname)[1].lower() in IMAGE_EXTENSIONS
+                        and fname + ".meta" in names):
+                    yield os.path.join(dirpath, fname)
+
+
+def load_cache(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get("version") != CACHE_VERSION:
+        return {}
+    return data.get("sheets", {})
+
+
+def save_cache(path, entries):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"version": CACHE_VERSION, "sheets": entries}, f,
+                  separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+def file_stamp(path):
+    st = os.stat(path)
+    return [st.st_mtime_ns, st.st_size]
+
+
+def analyze_many(paths):
+    """analyze_sheet() over paths, on a process pool when there are enough."""
+    if len(paths) < MIN_POOL_JOBS or ANALYZE_WORKERS < 2:
+        return [analyze_sheet(p) for p in paths]
+    with ProcessPoolExecutor(max_workers=ANALYZE_WORKERS) as pool:
+        return list(pool.map(analyze_sheet, paths, chunksize=16))
+
+
+def analyze_all(root, dirs, ctx=None):
+    """Return {project-relative path: analyze_sheet() result} for dirs.
+
+    Only sheets whose image or .meta changed since the cached run are
+    decoded, spread over a process pool.
+    """
+    ctx = ctx or CheckContext(root)
+    cache_file = cache_path(root, CACHE_NAME)
+    cached = load_cache(cache_file)
+    entries = {}
+    todo = []
+
+    for path in iter_sheets(root, dirs, ctx):
+        rel_path = os.path.relpath(path, root).replace(os.sep, "/")
+        try:
+            stamp = file_stamp(path) + file_stamp(path + ".meta")
+        except OSError:
+            continue
+        entry = cached.get(rel_path)
+        if entry is not None and entry["stamp"] == stamp:
+            entries[rel_path] = entry
+        else:
+            entries[rel_path] = {"stamp": stamp, "sheet": None}
+            todo.append((rel_path, path))
+
+    results = analyze_many([path for _, path in todo])
+    for (rel_path, _), raw in zip(todo, results):
+        entries[rel_path]["sheet"] = raw
+
+    # Keep cached sheets outside dirs so a scoped run doesn't evict them
+    merged = dict(cached)
+    merged.update(entries)
+    if todo or len(merged) != len(cached):
+        try:
+            save_cache(cache_file, merged)
+        except OSError:
+            pass
+    return {rel_path: entry["sheet"] for rel_path, entry in entries.items()
+            if entry["sheet"]}
+
+
+def write_csv(path, rows, columns):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def frame_rows(rel_path, raw):
+    rows = []
+    for name, x, y, w, h, tx, ty, tw, th in raw["frames"]:
+        rows.append({
+            "path": rel_path, "frame": name, "x": x, "y": y,
+            "width": w, "height": h, "trim_x": tx, "trim_y": ty,
+            "trim_width": tw, "trim_height": th,
+            "padding_pct": round((1 - tw * th / (w * h)) * 100, 1)
+            if w * h else 0.0,
+        })
+    return rows
+
+
+def print_sheets(sheets, top):
+    print(f"\n{'Wasted':>7s} {'KB':>9s} {'Pad':>6s} {'Frames':>6s}  Sheet")
+    for s in sheets[:top]:
+        print(f"{s['wasted_pct']:6.1f}% {s['wasted_kb']:9,.0f} "
+              f"{s['padding_pct']:5.1f}% {s['frames']:6d}  {s['path']}")
+        if s["recommendations"]:
+            print(f"{'':33s}-> {s['recommendations']}")
+    if len(sheets) > top:
+        print(f"  ... and {len(sheets) - top} more")
+
+
+def main():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    root = os.path.dirname(script_dir)
+
+    parser = argparse.ArgumentParser(
+        description="Report transparent padding in sprite sheets")
+    parser.add_argument("dirs", nargs="*", default=["Assets"],
+                        help="Folders to scan, relative to the project "
+                             "(default: Assets)")
+    parser.add_argument("--sort", choices=sorted(SORT_KEYS), default="waste",
+                        help="Order of the report (default: waste)")
+    parser.add_argument("--top", type=int, default=20,
+                        help="Sheets to print (default: 20)")
+    parser.add_argument("--csv", default=None,
+                        help="Write the full report as CSV to this path")
+    parser.add_argument("--frames", action="store_true",
+                        help="With --csv, write one row per frame with its "
+                             "trimmed rect instead of one per sheet")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Sprite Sheet Waste")
+    print("=" * 60)
+
+    try:
+        import PIL  # noqa: F401
+    except ImportError:
+        print("ERROR: Pillow is required (pip install pillow)")
+        return 1
+
+    dirs = [os.path.join(root, d) for d in args.dirs]
+    missing = [d for d in args.dirs if not os.path.isdir(os.path.join(root, d))]
+    if missing:
+        print(f"ERROR: Not a directory: {', '.join(missing)}")
+        return 1
+
+    raw_sheets = analyze_all(root, dirs)
+    sheets = [summarize(rel_path, raw, read_texture_settings(
+                  os.path.join(root, rel_path) + ".meta"))
+              for rel_path, raw in raw_sheets.items()]
+    sheets.sort(key=lambda s: (SORT_KEYS[args.sort](s), s["path"]))
+
+    total_kb = sum(s["wasted_kb"] for s in sheets)
+    flagged = sum(1 for s in sheets if s["recommendations"])
+    print(f"  Analyzed {len(sheets)} sprite sheets")
+    print_sheets(sheets, args.top)
+    print(f"\n{flagged} sheet(s) with recommendations, "
+          f"{total_kb / 1024:,.1f} MB of texture memory outside opaque "
+          f"frame bounds")
+
+    if args.csv:
+        if args.frames:
+            rows = [row for s in sheets
+                    for row in frame_rows(s["path"], raw_sheets[s["path"]])]
+            write_csv(args.csv, rows, FRAME_COLUMNS)
+        else:
+            write_csv(args.csv, sheets, SHEET_COLUMNS)
+        print(f"  Wrote {len(rows) if args.frames else len(sheets)} rows "
+              f"to {args.csv}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""Index the classes declared in the project's C# scripts.
+
+Scenes and prefabs reference scripts by the GUID of their .cs.meta, so the
+index is keyed by that GUID and records, per script: the classes it declares
+with their base class and the fields Unity serializes ([SerializeField] or
+public, plus [FormerlySerializedAs] aliases), and the type names the code
+attaches at runtime (AddComponent<T>, typeof(T)).
+
+Parsing is a light scan over the source with comments and string literals
+blanked out, tracking braces to tell class bodies from method bodies; no C#
+compiler is involved. Results are cached in Library/CICache keyed by each
+script's (mtime, size), so only edited scripts are re-parsed.
+
+Run directly to print the index.
+"""
+
+import json
+import os
+import re
+import sys
+from collections import namedtuple
+
+from check_guid_references import read_meta_header
+from context import CheckContext, cache_path
+
+SCRIPTS_ROOT = os.path.join("Assets", "_Project")
+
+CACHE_NAME = "symbol-index.json"
+CACHE_VERSION = 2
+
+# fields: serialized field names; aliases: FormerlySerializedAs names
+ClassInfo = namedtuple("ClassInfo", "name base abstract line fields aliases")
+# path is project-relative; type_refs are names attached via code
+ScriptSymbols = namedtuple("ScriptSymbols", "path guid classes type_refs")
+# start/end: offsets of the body within the stripped code
+Method = namedtuple("Method", "name class_name returns line start end")
+
+# Comments, preprocessor directives and string/char literals; strings keep
+# a placeholder so attribute arguments can still be read back
+LITERAL_PATTERN = re.compile(
+    r'//[^\n]*|/\*.*?\*/|^[ \t]*#[^\n]*'
+    r'|@"(?:[^"]|"")*"|\$?"(?:\\.|[^"\\\n])*"'
+    r"|'(?:\\.|[^'\\\n])+'", re.S | re.M)
+
+CLASS_DECL = re.compile(
+    r"\b(?P<mods>(?:\w+\s+)*)(?:class|struct)\s+(?P<name>\w+)"
+    r"(?:\s*<[^{:]*>)?\s*(?::\s*(?P<base>[\w.]+))?")
+NON_CLASS_SCOPE = re.compile(r"\b(?:enum|interface)\s+\w+")
+ATTRIBUTE_PATTERN = re.compile(r"^\s*\[([^\]]*)\]")
+FIELD_DECL = re.compile(
+    r"^(?P<mods>(?:(?:public|private|protected|internal|static|readonly|"
+    r"const|new|volatile)\s+)*)"
+    r"(?P<type>[\w.]+(?:\s*<[^;=]*>)?(?:\s*\[[\s,]*\])*\??)\s+"
+    r"(?P<names>\w+(?:\s*,\s*\w+)*)\s*$")
+PROPERTY_DECL = re.compile(r"(\w+)\s*$")
+METHOD_DECL = re.compile(
+    r"(?P<returns>[\w.]+(?:\s*<[^(){};]*>)?(?:\s*\[[\s,]*\])*\??)\s+"
+    r"(?P<name>\w+)\s*(?:<[^(){};]*>)?\s*\([^{};]*\)\s*"
+    r"(?:where\s[^{;]*)?$")
+TYPE_REF_PATTERN = re.compile(
+    r"\bAddComponent\s*<\s*([\w.]+)\s*>|\btypeof\s*\(\s*([\w.]+)\s*\)")
+FORMERLY_PATTERN = re.compile(r"FormerlySerializedAs\s*\(\s*\"#(\d+)\"")
+# Statements that look like calls to METHOD_DECL
+CONTROL_KEYWORDS = {"if", "for", "foreach", "while", "switch", "using",
+                    "lock", "catch", "return", "new", "else", "fixed"}
+
+
+def strip_literals(source):
+    """Blank out comments, directives and literals, keeping newlines.
+
+    Returns (code, strings): string literals become "#<n>" placeholders that
+    index into strings ($"#<n>" for interpolated strings).
+    """
+    strings = []
+
+    def replace(match):
+        text = match.group(0)
+        newlines = "\n" * text.count("\n")
+        if text.startswith("/") or text.lstrip().startswith("#"):
+            return " " + newlines
+        prefix = "$" if "$" in text[:2] else ""
+        strings.append(text.lstrip("@$")[1:-1])
+        return f'{prefix}"#{len(strings) - 1}"' + newlines
+
+    return LITERAL_PATTERN.sub(replace, source), strings
+
+
+def split_attributes(segment):
+    """Split leading [Attribute] groups off a member declaration."""
+    attributes = []
+    while True:
+        match = ATTRIBUTE_PATTERN.match(segment)
+        if not match:
+            return attributes, segment.strip()
+        attributes.append(match.group(1))
+        segment = segment[match.end():]
+
+
+def parse_field(segment, strings):
+    """Return (serialized names, aliases) for a field declaration segment."""
+    attributes, decl = split_attributes(segment)
+    if "=>" in decl:
+        return [], []
+    decl = decl.split("=", 1)[0].strip()
+    if "(" in decl:
+        return [], []
+    match = FIELD_DECL.match(decl)
+    if not match:
+        return [], []
+
+    mods = match.group("mods").split()
+    attrs = " ".join(attributes)
+    if {"static", "const", "readonly"} & set(mods) or "NonSerialized" in attrs:
+        return [], []
+    if "public" not in mods and "SerializeField" not in attrs \
+            and "SerializeReference" not in attrs:
+        return [], []
+
+    names = [n.strip() for n in match.group("names").split(",")]
+    aliases = [strings[int(i)] for i in FORMERLY_PATTERN.findall(attrs)]
+    return names, aliases
+
+
+def parse_backing_field(header):
+    """[field: SerializeField] auto-properties serialize a backing field."""
+    attributes, decl = split_attributes(header)
+    if not any(a.replace(" ", "").startswith("field:SerializeField")
+               for a in attributes):
+        return None
+    match = PROPERTY_DECL.search(decl)
+    return f"<{match.group(1)}>k__BackingField" if match else None
+
+
+def parse_script(source):
+    """Return (classes, type_refs) declared in C# source text."""
+    code, strings = strip_literals(source)
+    classes = []
+    # One entry per open brace: a ClassInfo for class bodies, else None
+    scopes = []
+    start = 0
+
+    for match in re.finditer(r"[{};]", code):
+        segment = code[start:match.start()]
+        start = match.end()
+        char = match.group(0)
+        in_class = bool(scopes) and scopes[-1] is not None
+
+        if char == "}":
+            if scopes:
+                scopes.pop()
+            continue
+
+        if char == "{":
+            decl = CLASS_DECL.search(segment)
+            if decl and not NON_CLASS_SCOPE.search(segment):
+                base = decl.group("base")
+                info = ClassInfo(
+                    decl.group("name"),
+                    base.rsplit(".", 1)[-1] if base else None,
+                    "abstract" in decl.group("mods").split(),
+                    code.count("\n", 0, match.start() - len(segment)
+                               + decl.start()) + 1,
+                    [], [])
+                classes.append(info)
+                scopes.append(info)
+            else:
+                if in_class:
+                    backing = parse_backing_field(segment)
+                    if backing:
+                        scopes[-1].fields.append(backing)
+                scopes.append(None)
+            continue
+
+        if in_class:
+            names, aliases = parse_field(segment, strings)
+            scopes[-1].fields.extend(names)
+            scopes[-1].aliases.extend(aliases)
+
+    type_refs = sorted({a or b for a, b in TYPE_REF_PATTERN.findall(code)})
+    return classes, type_refs
+
+
+def parse_methods(code):
+    """Return the Methods declared in stripped C# code (see strip_literals).
+
+    Expression-bodied methods (=> expr;) get the expression as their body.
+    Local functions and lambdas count as part of the enclosing method.
+    """
+    methods = []
+    # One entry per open brace: ("class", name), ("method", record) or None
+    scopes = []
+    start = 0
+
+    def declare(segment, body_start, decl_offset):
+        _, header = split_attributes(segment)
+        match = METHOD_DECL.search(header)
+        if not match or match.group("name") in CONTROL_KEYWORDS:
+            return None
+        record = [match.group("name"), scopes[-1][1],
+                  match.group("returns"),
+                  code.count("\n", 0, decl_offset) + 1, body_start, None]
+        methods.append(record)
+        return record
+
+    for match in re.finditer(r"[{};]", code):
+        segment = code[start:match.start()]
+        # Offset of the declaration itself, past leading blank lines
+        decl_offset = match.start() - len(segment.lstrip())
+        body_start = match.end()
+        start = match.end()
+        char = match.group(0)
+        in_class = bool(scopes) and scopes[-1] is not None \
+            and scopes[-1][0] == "class"
+
+        if char == "}":
+            if scopes:
+                scope = scopes.pop()
+                if scope is not None and scope[0] == "method":
+                    scope[1][5] = match.start()
+            continue
+
+        if char == "{":
+            decl = CLASS_DECL.search(segment)
+            if decl and not NON_CLASS_SCOPE.search(segment):
+                scopes.append(("class", decl.group("name")))
+            elif in_class:
+                record = declare(segment, body_start, decl_offset)
+                scopes.append(("method", record) if record else None)
+            else:
+                scopes.append(None)
+            continue
+
+        if in_class and "=>" in segment:
+            head, _, body = segment.partition("=>")
+            record = declare(head, match.start() - len(body), decl_offset)
+            if record:
+                record[5] = match.start()
+
+    return [Method(*m) for m in methods if m[5] is not None]
+
+
+def load_cache(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get("version") != CACHE_VERSION:
+        return {}
+    return data.get("scripts", {})
+
+
+def save_cache(path, entries):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"version": CACHE_VERSION, "scripts": entries}, f,
+                  separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+def iter_scripts(scripts_dir, ctx):
+    for dirpath, dirnames, filenames in ctx.walk(scripts_dir):
+        dirnames[:] = [d for d in dirnames if d not in {".git", "obj"}]
+        for fname in filenames:
+            if fname.endswith(".cs"):
+                yield os.path.join(dirpath, fname)
+
+
+def build_symbol_index(root, ctx=None):
+    """Return {script guid: ScriptSymbols} for every .cs under SCRIPTS_ROOT.
+
+    Scripts whose .meta has no readable GUID are left out.
+    """
+    ctx = ctx or CheckContext(root)
+    cache_file = cache_path(root, CACHE_NAME)
+    cached = load_cache(cache_file)
+    entries = {}
+    index = {}
+    dirty = False
+
+    for path in iter_scripts(os.path.join(root, SCRIPTS_ROOT), ctx):
+        rel_path = os.path.relpath(path, root).replace(os.sep, "/")
+        try:
+            st = os.stat(path)
+            meta_st = os.stat(path + ".meta")
+        except OSError:
+            continue
+        stamp = [st.st_mtime_ns, st.st_size, meta_st.st_mtime_ns]
+
+        entry = cached.get(rel_path)
+        if entry is None or entry[:3] != stamp:
+            guid, _ = read_meta_header(path + ".meta")
+            try:
+                with open(path, "r", encoding="utf-8-sig",
+                          errors="replace") as f:
+                    classes, type_refs = parse_script(f.read())
+            except OSError:
+                continue
+            entry = stamp + [guid, [list(c) for c in classes], type_refs]
+            dirty = True
+        entries[rel_path] = entry
+
+        guid, classes, type_refs = entry[3:]
+        if guid:
+            index[guid] = ScriptSymbols(
+                rel_path, guid, [ClassInfo(*c) for c in classes], type_refs)
+
+    if dirty or len(entries) != len(cached):
+        try:
+            save_cache(cache_file, entries)
+        except OSError:
+            pass
+    return index
+
+
+def load_symbol_index(root, ctx):
+    """The symbol index, built at most once per CheckContext."""
+    return ctx.memo("symbol_index", lambda: build_symbol_index(root, ctx))
+
+
+def main_class(symbols):
+    """The class Unity binds to a script: the one named like the file."""
+    stem = os.path.splitext(os.path.basename(symbols.path))[0]
+    for info in symbols.classes:
+        if info.name == stem:
+            return info
+    return None
+
+
+def main():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    root = os.path.dirname(script_dir)
+
+    if not os.path.isdir(os.path.join(root, "Assets")):
+        print(f"ERROR: Cannot find Assets/ directory from {root}")
+        return 1
+
+    print("=" * 60)
+    print("C# Symbol Index")
+    print("=" * 60)
+
+    index = build_symbol_index(root)
+    for symbols in sorted(index.values(), key=lambda s: s.path):
+        print(f"\n{symbols.path}  ({symbols.guid})")
+        for info in symbols.classes:
+            base = f" : {info.base}" if info.base else ""
+            print(f"  class {info.name}{base}  [{', '.join(info.fields)}]")
+    print(f"\nIndexed {len(index)} scripts")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,233 @@
+"""Change detection and check routing for `run_all.py --watch`.
+
+The watcher polls Assets/ and ProjectSettings/ with os.scandir and compares
+(mtime, size) per path against the previous poll. Each change is routed to
+the checks it can affect, scoped to the files or directories involved, so an
+edit re-runs only a sliver of the suite:
+
+    ProjectSettings/TagManager.asset      -> Layer/Tag check
+    ProjectSettings/EditorBuildSettings   -> Build Scene check
+    file added/removed under Assets/      -> Meta check for that directory
+    .meta added/changed/removed           -> Meta content check (cached headers)
+    .meta removed, or its GUID changed    -> GUID check, Resources footprint,
+                                             Animation clips (full)
+    .prefab/.unity/... under _Project     -> GUID check for that file
+    .cs under _Project/Scripts            -> Layer/Tag + Code Style for that file
+    .unity/.prefab/.anim                  -> Layer/Tag for that file
+    .cs, .cs.meta or serialized asset     -> Script References (full, cached)
+    texture or its .meta                  -> Texture import audit for that file
+    image added/changed/removed           -> Duplicate images (full, cached)
+    .anim                                 -> Animation clips for that file
+    texture .meta changed                 -> Animation clips (full: sprite IDs)
+    .mat                                  -> Material variants for that file
+    .shader                               -> Material variants (full)
+    .unity                                -> Prefab overrides for that file
+    .prefab or its .meta                  -> Prefab overrides (full: nesting)
+    .cs, serialized asset, image or its
+    .meta, anything under Resources/      -> Resources footprint (full:
+                                             dependency closure)
+"""
+
+import os
+
+from check_guid_references import SCANNABLE_EXTENSIONS, patch_meta_headers
+from check_texture_import import TEXTURE_EXTENSIONS
+from check_layer_consistency import LAYER_DATA_EXTENSIONS
+from image_index import IMAGE_EXTENSIONS
+from serialized_scan import SERIALIZED_EXTENSIONS, patch_serialized_scans
+
+WATCH_DIRS = ("Assets", "ProjectSettings")
+
+# Directories never worth polling (Unity/IDE state inside Assets is rare,
+# but hidden folders like .git are common in embedded packages)
+SKIP_DIRS = {".git", "obj", "Library", "Temp"}
+
+META_CHECK = "Meta File Integrity"
+META_CONTENT_CHECK = "Meta File Content"
+GUID_CHECK = "GUID References"
+LAYER_CHECK = "Layer/Tag Consistency"
+SCENE_CHECK = "Build Scene Validation"
+STYLE_CHECK = "Code Style"
+TEXTURE_CHECK = "Texture Import Settings"
+DUPLICATE_CHECK = "Duplicate Images"
+ANIM_CHECK = "Animation Clips"
+MATERIAL_CHECK = "Material Variants"
+PREFAB_CHECK = "Prefab Overrides"
+RESOURCES_CHECK = "Resources Footprint"
+SCRIPT_CHECK = "Script References"
+
+# Sentinel scope meaning "run the whole check"
+FULL = None
+
+
+def snapshot(root):
+    """Map every path under WATCH_DIRS to (mtime_ns, size, is_dir)."""
+    state = {}
+    stack = [os.path.join(root, d) for d in WATCH_DIRS]
+    while stack:
+        dirpath = stack.pop()
+        try:
+            with os.scandir(dirpath) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir():
+                            if entry.name in SKIP_DIRS:
+                                continue
+                            state[entry.path] = (0, 0, True)
+                            stack.append(entry.path)
+                        else:
+                            st = entry.stat()
+                            state[entry.path] = (st.st_mtime_ns, st.st_size,
+                                                 False)
+                    except OSError:
+                        pass
+        except OSError:
+            pass
+    return state
+
+
+def diff(old, new):
+    """Return (added, removed, modified) path sets between two snapshots."""
+    added = new.keys() - old.keys()
+    removed = old.keys() - new.keys()
+    modified = {p for p in new.keys() & old.keys() if new[p] != old[p]}
+    return added, removed, modified
+
+
+def memoized_guids(ctx, metas):
+    """{meta path: GUID} for the metas found in the memoized header caches."""
+    guids = {}
+    for key in ctx.memo_keys():
+        if not (isinstance(key, tuple) and key[0] == "meta_headers"):
+            continue
+        headers = ctx.peek(key)
+        for path in metas:
+            if path in headers:
+                guids[path] = headers[path][0]
+    return guids
+
+
+def route(root, ctx, added, removed, modified):
+    """Map changes to {check name: FULL or set of paths to re-check}.
+
+    Also updates the context: stale listings are dropped, and memoized
+    indexes touched by the change are patched or invalidated.
+    """
+    changed = added | removed | modified
+    ctx.refresh(added | removed)
+
+    # Re-read only the .meta headers that changed; the GUID index is then
+    # rebuilt from the patched header cache without touching other files
+    metas = {p for p in changed if p.endswith(".meta")}
+    # Rewritten metas whose GUID changed (regenerated, pasted, merged) retire
+    # the old GUID just like a removed meta; unknown old headers count too
+    retired = set()
+    if metas:
+        before = memoized_guids(ctx, metas & modified)
+        patch_meta_headers(ctx, metas - removed, metas & removed)
+        after = memoized_guids(ctx, metas & modified)
+        retired = {p for p in metas & modified
+                   if p not in before or before[p] != after.get(p)}
+    # Scenes/prefabs are re-read once here, for both GUID and layer checks
+    patch_serialized_scans(ctx, changed - removed, removed)
+    if any(os.path.splitext(p)[1].lower() in IMAGE_EXTENSIONS
+           for p in changed):
+        ctx.invalidate("image_index")
+
+    rel = {p: os.path.relpath(p, root).replace("\\", "/") for p in changed}
+    scopes = {}
+
+    def scope(check, path=FULL):
+        if check in scopes and scopes[check] is FULL:
+            return
+        if path is FULL:
+            scopes[check] = FULL
+        else:
+            scopes.setdefault(check, set()).add(path)
+
+    for path in changed:
+        rel_path = rel[path]
+
+        if rel_path == "ProjectSettings/TagManager.asset":
+            ctx.invalidate("tag_manager")
+            scope(LAYER_CHECK)
+            continue
+        if rel_path == "ProjectSettings/EditorBuildSettings.asset":
+            scope(SCENE_CHECK)
+            continue
+        if not rel_path.startswith("Assets/"):
+            continue
+
+        # Existence changes matter to the meta check: re-check the directory
+        # holding the path, plus the path itself if it is a new directory
+        if path in added or path in removed:
+            scope(META_CHECK, os.path.dirname(path))
+            if path in added and os.path.isdir(path):
+                scope(META_CHECK, path)
+
+        if rel_path.endswith(".cs") or rel_path.endswith(".cs.meta"):
+            # Re-parse only scripts whose (mtime, size) or hash changed
+            ctx.invalidate("symbol_index")
+            ctx.invalidate("call_graph")
+            scope(SCRIPT_CHECK)
+            scope(RESOURCES_CHECK)
+
+        if "/Resources/" in rel_path:
+            scope(RESOURCES_CHECK)
+
+        if rel_path.endswith(".meta"):
+            scope(META_CONTENT_CHECK)
+            asset = path[:-5]
+            if (path not in removed and
+                    os.path.splitext(asset)[1].lower() in TEXTURE_EXTENSIONS):
+                settings = ctx.peek("texture_settings")
+                if settings is not None:
+                    settings.pop(path, None)
+                scope(TEXTURE_CHECK, asset)
+                scope(ANIM_CHECK)
+                scope(RESOURCES_CHECK)
+            if path in removed or path in retired:
+                # A GUID disappeared; references anywhere can break. New
+                # metas, or rewrites keeping their GUID, only add GUIDs.
+                scope(GUID_CHECK)
+                scope(RESOURCES_CHECK)
+                scope(ANIM_CHECK)
+            if rel_path.endswith(".unity.meta"):
+                scope(SCENE_CHECK)
+            if rel_path.endswith(".prefab.meta"):
+                ctx.invalidate("prefab_summaries")
+                scope(PREFAB_CHECK)
+            continue
+
+        ext = os.path.splitext(rel_path)[1].lower()
+        if ext == ".unity":
+            scope(SCENE_CHECK)
+        if ext in SCANNABLE_EXTENSIONS and path not in removed:
+            scope(GUID_CHECK, path)
+        if ext in SERIALIZED_EXTENSIONS:
+            scope(SCRIPT_CHECK)
+            scope(RESOURCES_CHECK)
+        if ext in LAYER_DATA_EXTENSIONS and path not in removed:
+            scope(LAYER_CHECK, path)
+        if ext in TEXTURE_EXTENSIONS and path not in removed:
+            scope(TEXTURE_CHECK, path)
+        if ext in IMAGE_EXTENSIONS:
+            scope(DUPLICATE_CHECK)
+            scope(RESOURCES_CHECK)
+        if ext == ".anim" and path not in removed:
+            scope(ANIM_CHECK, path)
+        if ext == ".mat" and path not in removed:
+            scope(MATERIAL_CHECK, path)
+        if ext == ".shader":
+            scope(MATERIAL_CHECK)
+        if ext == ".unity" and path not in removed:
+            scope(PREFAB_CHECK, path)
+        if ext == ".prefab":
+            # Instances elsewhere may nest this prefab
+            ctx.invalidate("prefab_summaries")
+            scope(PREFAB_CHECK)
+        if ext == ".cs" and path not in removed:
+            scope(LAYER_CHECK, path)
+            scope(STYLE_CHECK, path)
+
+    return scopes